@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+import os
+import platform
+import statistics
+import time
+from typing import Any, Callable
+
+from semantic_inflation.benchmarks.synthetic import SyntheticFilingSpec, generate_filing_html
+from semantic_inflation.text.clean_html import html_to_text
+from semantic_inflation.text.dictionaries import load_dictionaries
+from semantic_inflation.text.features import compute_features_from_text
+from semantic_inflation.text.sentence_split import split_sentences
+
+EXTRACTORS = ("bs4", "htmlparser")
+
+
+def _measure(func: Callable[[], object], repeat: int, input_bytes: int | None) -> dict[str, Any]:
+    func()  # warm-up: imports, regex caches, lazy lxml initialisation
+    samples: list[float] = []
+    for _ in range(max(1, repeat)):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    median = statistics.median(samples)
+    payload: dict[str, Any] = {
+        "repeat": len(samples),
+        "min_seconds": min(samples),
+        "median_seconds": median,
+        "mean_seconds": statistics.fmean(samples),
+    }
+    if input_bytes:
+        payload["input_bytes"] = input_bytes
+        payload["mb_per_second"] = (input_bytes / 1_000_000) / median if median > 0 else None
+    return payload
+
+
+def run_benchmarks(
+    spec: SyntheticFilingSpec | None = None,
+    *,
+    repeat: int = 5,
+    dictionary_version: str = "v1",
+) -> dict[str, Any]:
+    spec = spec or SyntheticFilingSpec()
+    html = generate_filing_html(spec)
+    text = html_to_text(html, extractor="bs4")
+    html_bytes = len(html.encode("utf-8"))
+    text_bytes = len(text.encode("utf-8"))
+
+    cases: dict[str, tuple[Callable[[], object], int | None]] = {}
+    for extractor in EXTRACTORS:
+        cases[f"html_to_text[{extractor}]"] = (
+            lambda extractor=extractor: html_to_text(html, extractor=extractor),
+            html_bytes,
+        )
+    cases["split_sentences"] = (lambda: split_sentences(text), text_bytes)
+    cases["load_dictionaries"] = (lambda: load_dictionaries(dictionary_version), None)
+    cases["compute_features_from_text"] = (
+        lambda: compute_features_from_text(text, dictionary_version=dictionary_version),
+        text_bytes,
+    )
+
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "environment": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+        },
+        "spec": spec.to_dict(),
+        "html_bytes": html_bytes,
+        "text_bytes": text_bytes,
+        "results": {
+            name: _measure(func, repeat, input_bytes)
+            for name, (func, input_bytes) in cases.items()
+        },
+    }
+
+
+def compare_to_baseline(
+    current: dict[str, Any],
+    baseline: dict[str, Any],
+    *,
+    tolerance: float = 0.25,
+) -> list[dict[str, Any]]:
+    comparisons: list[dict[str, Any]] = []
+    baseline_results = baseline.get("results", {})
+    if current.get("spec") != baseline.get("spec"):
+        # Timings on a different synthetic filing say nothing about regressions.
+        for name, result in current.get("results", {}).items():
+            comparisons.append(
+                {
+                    "name": name,
+                    "status": "incomparable",
+                    "median_seconds": result["median_seconds"],
+                }
+            )
+        comparisons.append(
+            {
+                "name": "spec",
+                "status": "mismatch",
+                "detail": (
+                    "Synthetic filing spec differs from the baseline; "
+                    "ratios are not comparable."
+                ),
+            }
+        )
+        return comparisons
+    for name, result in current.get("results", {}).items():
+        reference = baseline_results.get(name)
+        if not reference or not reference.get("median_seconds"):
+            comparisons.append({"name": name, "status": "new"})
+            continue
+        ratio = result["median_seconds"] / reference["median_seconds"]
+        if ratio > 1 + tolerance:
+            status = "regression"
+        elif ratio < 1 - tolerance:
+            status = "improved"
+        else:
+            status = "ok"
+        comparisons.append(
+            {
+                "name": name,
+                "status": status,
+                "ratio": ratio,
+                "median_seconds": result["median_seconds"],
+                "baseline_median_seconds": reference["median_seconds"],
+            }
+        )
+    return comparisons
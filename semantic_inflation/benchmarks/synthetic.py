@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass
+import random
+from typing import Any
+
+_ENV_SENTENCES = [
+    "We aim to reduce greenhouse gas emissions by {pct}% by {year}.",
+    "We are committed to achieving net zero carbon emissions across our operations by 2050.",
+    "In {year}, our Scope 1 emissions were {num} metric tons CO2e.",
+    "Our renewable energy share increased to {pct}% in {year}.",
+    "Water withdrawals totaled {num} cubic meters at our manufacturing sites.",
+    "Climate change may increase the frequency of extreme weather events.",
+    "We strive to improve energy efficiency and reduce waste at every facility.",
+    "Scope 2 emissions declined {pct}% compared with the prior year.",
+]
+_FILLER_SENTENCES = [
+    "The Company operates through three reportable segments.",
+    "Net sales increased {pct}% compared with fiscal {year}.",
+    "We may issue additional debt securities from time to time.",
+    "Our results of operations depend on consumer demand, pricing and product mix.",
+    "See Note {pct} to the Consolidated Financial Statements for additional information.",
+    "Liquidity and capital resources are discussed in Item 7 of this report.",
+    "The Board of Directors declared a quarterly dividend of $0.{pct} per share.",
+    "Forward-looking statements are subject to risks, uncertainties and assumptions.",
+]
+_TABLE_LABELS = [
+    "Net sales",
+    "Cost of sales",
+    "Scope 1 emissions (metric tons CO2e)",
+    "Scope 2 emissions (metric tons CO2e)",
+    "Operating income",
+    "Energy consumption (MWh)",
+    "Research and development",
+    "Water use (cubic meters)",
+]
+
+
+@dataclass(frozen=True)
+class SyntheticFilingSpec:
+    paragraphs: int = 400
+    sentences_per_paragraph: int = 5
+    env_share: float = 0.2
+    table_density: float = 0.1
+    table_rows: int = 12
+    ixbrl_density: float = 0.3
+    ixbrl_contexts: int = 200
+    seed: int = 7
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+def _fill(template: str, rng: random.Random) -> str:
+    return template.format(
+        pct=rng.randint(1, 95),
+        year=rng.randint(2010, 2023),
+        num=f"{rng.randint(1_000, 9_999_999):,}",
+    )
+
+
+def _fact(value: str, rng: random.Random, index: int) -> str:
+    return (
+        f'<ix:nonFraction name="us-gaap:Metric{rng.randint(1, 500)}" '
+        f'contextRef="c-{index % 997}" unitRef="usd" decimals="-3" scale="3" '
+        f'format="ixt:num-dot-decimal">{value}</ix:nonFraction>'
+    )
+
+
+def _ixbrl_header(spec: SyntheticFilingSpec) -> str:
+    contexts = "".join(
+        f'<xbrli:context id="c-{i}"><xbrli:entity>'
+        f'<xbrli:identifier scheme="http://www.sec.gov/CIK">0000000000</xbrli:identifier>'
+        f"</xbrli:entity><xbrli:period><xbrli:startDate>2023-01-01</xbrli:startDate>"
+        f"<xbrli:endDate>2023-12-31</xbrli:endDate></xbrli:period></xbrli:context>"
+        for i in range(spec.ixbrl_contexts)
+    )
+    hidden = "".join(
+        f'<ix:nonNumeric name="dei:Hidden{i}" contextRef="c-{i}">hidden {i}</ix:nonNumeric>'
+        for i in range(spec.ixbrl_contexts // 4)
+    )
+    return (
+        '<div style="display:none"><ix:header>'
+        f"<ix:hidden>{hidden}</ix:hidden>"
+        f"<ix:resources>{contexts}</ix:resources>"
+        "</ix:header></div>"
+    )
+
+
+def _table(
+    spec: SyntheticFilingSpec, rng: random.Random, ixbrl: bool, counter: list[int]
+) -> str:
+    rows = ["<tr><th></th><th>2023</th><th>2022</th><th>2021</th></tr>"]
+    for _ in range(spec.table_rows):
+        cells = []
+        for _ in range(3):
+            value = f"{rng.randint(100, 999_999):,}"
+            if ixbrl and rng.random() < spec.ixbrl_density:
+                counter[0] += 1
+                value = _fact(value, rng, counter[0])
+            cells.append(f'<td style="text-align:right">{value}</td>')
+        label = rng.choice(_TABLE_LABELS)
+        rows.append(f"<tr><td>{label}</td>{''.join(cells)}</tr>")
+    return f"<table>{''.join(rows)}</table>"
+
+
+def generate_filing_html(spec: SyntheticFilingSpec | None = None) -> str:
+    """Build a deterministic 10-K-like HTML document for benchmarking.
+
+    Size scales with ``paragraphs``; ``table_density`` is the chance of a table
+    after each paragraph and ``ixbrl_density`` the share of numbers wrapped in
+    inline XBRL facts (``ixbrl_contexts`` controls the hidden header volume).
+    """
+    spec = spec or SyntheticFilingSpec()
+    rng = random.Random(spec.seed)
+    ixbrl = spec.ixbrl_density > 0
+    counter = [0]
+    parts = [
+        "<html><head><style>p {margin: 0}</style><script>var x = 1;</script></head><body>"
+    ]
+    if ixbrl:
+        parts.append(_ixbrl_header(spec))
+    for index in range(spec.paragraphs):
+        if index % 40 == 0:
+            parts.append(f"<h2>Item {index // 40 + 1}.</h2>")
+        sentences = []
+        for _ in range(spec.sentences_per_paragraph):
+            pool = _ENV_SENTENCES if rng.random() < spec.env_share else _FILLER_SENTENCES
+            sentence = _fill(rng.choice(pool), rng)
+            if ixbrl and rng.random() < spec.ixbrl_density:
+                counter[0] += 1
+                sentence = sentence.replace(
+                    str(rng.choice(["2023", "2022"])), _fact("2023", rng, counter[0]), 1
+                )
+            sentences.append(sentence)
+        parts.append(f"<p style=\"font-family:Times\"><span>{' '.join(sentences)}</span></p>")
+        if rng.random() < spec.table_density:
+            parts.append(_table(spec, rng, ixbrl, counter))
+    parts.append("</body></html>")
+    return "".join(parts)
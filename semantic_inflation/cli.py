@@ -2,7 +2,11 @@ import argparse
 import json
 from pathlib import Path
 
+from semantic_inflation.benchmarks.runner import compare_to_baseline, run_benchmarks
+from semantic_inflation.benchmarks.synthetic import SyntheticFilingSpec
 from semantic_inflation.config import load_settings
+from semantic_inflation.net.manifest import MANIFEST_DB_NAME, ManifestStore
+from semantic_inflation.net.standin import StandinOptions, StandinServer
 from semantic_inflation.paths import repo_root
 from semantic_inflation.pipeline import PipelineContext, run_doctor, run_all
 from semantic_inflation.pipeline.echo import download_echo
@@ -14,6 +18,7 @@ from semantic_inflation.pipeline.panel import build_panel
 from semantic_inflation.pipeline.parent_to_cik import build_parent_to_cik
 from semantic_inflation.pipeline.sec import download_sec_filings
 from semantic_inflation.pipeline.sec_index import build_sec_filings_index
+from semantic_inflation.pipeline.sec_stream import stream_sec_filings
 from semantic_inflation.pipeline.usaspending import download_usaspending_awards
 from semantic_inflation.text.clean_html import html_to_text
 from semantic_inflation.text.features import compute_features_from_file
@@ -97,6 +102,38 @@ def _cmd_extract_text(args: argparse.Namespace) -> int:
     return 0
 
 
+def _cmd_bench(args: argparse.Namespace) -> int:
+    settings = load_settings(args.config)
+    spec = SyntheticFilingSpec(
+        paragraphs=args.paragraphs,
+        table_density=args.table_density,
+        ixbrl_density=args.ixbrl_density,
+    )
+    payload = run_benchmarks(
+        spec, repeat=args.repeat, dictionary_version=settings.text.dictionary_version
+    )
+    baseline_path = Path(args.baseline)
+    regressions = []
+    if args.update_baseline:
+        baseline_path.parent.mkdir(parents=True, exist_ok=True)
+        baseline_path.write_text(
+            json.dumps(payload, indent=2, sort_keys=True) + "\n", encoding="utf-8"
+        )
+    elif baseline_path.exists():
+        baseline = json.loads(baseline_path.read_text(encoding="utf-8"))
+        payload["comparison"] = compare_to_baseline(payload, baseline, tolerance=args.tolerance)
+        regressions = [c for c in payload["comparison"] if c["status"] == "regression"]
+
+    if args.output:
+        out_path = Path(args.output)
+        out_path.parent.mkdir(parents=True, exist_ok=True)
+        out_path.write_text(
+            json.dumps(payload, indent=2, sort_keys=True) + "\n", encoding="utf-8"
+        )
+    print(json.dumps(payload, indent=2, sort_keys=True))
+    return 1 if regressions else 0
+
+
 def _cmd_config(args: argparse.Namespace) -> int:
     settings = load_settings(args.config)
     payload = settings.model_dump(mode="json")
@@ -131,6 +168,10 @@ def _cmd_sec_download(args: argparse.Namespace) -> int:
 
 def _cmd_sec_index(args: argparse.Namespace) -> int:
     settings = load_settings(args.config)
+    if args.source:
+        settings.pipeline.sec.index_source = args.source
+    if args.incremental:
+        settings.pipeline.sec.incremental = True
     context = PipelineContext(settings)
     payload = build_sec_filings_index(context, force=args.force)
     print(json.dumps(payload.to_dict(), indent=2, sort_keys=True))
@@ -153,6 +194,51 @@ def _cmd_sec_features(args: argparse.Namespace) -> int:
     return 0
 
 
+def _cmd_sec_stream(args: argparse.Namespace) -> int:
+    settings = load_settings(args.config)
+    context = PipelineContext(settings)
+    download, features = stream_sec_filings(context, force=args.force)
+    payload = {"sec_download": download.to_dict(), "sec_features": features.to_dict()}
+    print(json.dumps(payload, indent=2, sort_keys=True))
+    return 0
+
+
+def _cmd_manifest_export(args: argparse.Namespace) -> int:
+    settings = load_settings(args.config)
+    db_path = settings.paths.raw_dir / "_manifests" / MANIFEST_DB_NAME
+    if not db_path.exists():
+        raise FileNotFoundError(f"Missing download manifest: {db_path}")
+    store = ManifestStore(db_path)
+    try:
+        count = store.export_jsonl(Path(args.output), log=args.log)
+    finally:
+        store.close()
+    print(json.dumps({"rows": count, "output": args.output}, sort_keys=True))
+    return 0
+
+
+def _cmd_standin_serve(args: argparse.Namespace) -> int:
+    options = StandinOptions(
+        latency_seconds=args.latency_ms / 1000,
+        max_requests_per_second=args.max_rps,
+        retry_after_seconds=args.retry_after,
+        failure_rate=args.failure_rate,
+        truncate_rate=args.truncate_rate,
+        record=args.record,
+        seed=args.seed,
+    )
+    server = StandinServer(Path(args.cassette), options, host=args.host, port=args.port)
+    print(json.dumps({"url": server.url, "cassette": args.cassette}, sort_keys=True), flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+        print(json.dumps(server.stats.to_dict(), sort_keys=True))
+    return 0
+
+
 def _cmd_ghgrp_download(args: argparse.Namespace) -> int:
     settings = load_settings(args.config)
     context = PipelineContext(settings)
@@ -255,6 +341,38 @@ def build_parser() -> argparse.ArgumentParser:
     p_extract.add_argument("--output", help="Optional output path for extracted text")
     p_extract.set_defaults(func=_cmd_extract_text)
 
+    p_bench = sub.add_parser(
+        "bench",
+        help="Benchmark text extraction and feature hot paths on a synthetic 10-K",
+        parents=[config_parent],
+    )
+    p_bench.add_argument("--paragraphs", type=int, default=400, help="Synthetic filing size")
+    p_bench.add_argument(
+        "--table-density", type=float, default=0.1, help="Chance of a table after each paragraph"
+    )
+    p_bench.add_argument(
+        "--ixbrl-density", type=float, default=0.3, help="Share of numbers tagged as iXBRL facts"
+    )
+    p_bench.add_argument("--repeat", type=int, default=5, help="Timed runs per benchmark")
+    p_bench.add_argument("--output", help="Optional JSON output path")
+    p_bench.add_argument(
+        "--baseline",
+        default=str(repo_root() / "benchmarks" / "baseline.json"),
+        help="Baseline JSON to compare against",
+    )
+    p_bench.add_argument(
+        "--update-baseline",
+        action="store_true",
+        help="Write this run to the baseline path instead of comparing",
+    )
+    p_bench.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.25,
+        help="Allowed relative slowdown of the median before reporting a regression",
+    )
+    p_bench.set_defaults(func=_cmd_bench)
+
     p_config = sub.add_parser(
         "config",
         help="Print resolved configuration",
@@ -285,6 +403,16 @@ def build_parser() -> argparse.ArgumentParser:
     p_sec_index = sec_sub.add_parser(
         "index", help="Build SEC filings index", parents=[config_parent]
     )
+    p_sec_index.add_argument(
+        "--source",
+        choices=["api", "bulk", "full-index"],
+        help="Override pipeline.sec.index_source for this run",
+    )
+    p_sec_index.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Merge filings newer than the last run into the existing index",
+    )
     p_sec_index.set_defaults(func=_cmd_sec_index)
     p_sec_universe = sec_sub.add_parser(
         "universe", help="Build GHGRP-matched CIK universe", parents=[config_parent]
@@ -294,6 +422,52 @@ def build_parser() -> argparse.ArgumentParser:
         "features", help="Compute SEC features", parents=[config_parent]
     )
     p_sec_features.set_defaults(func=_cmd_sec_features)
+    p_sec_stream = sec_sub.add_parser(
+        "stream",
+        help="Download SEC filings and compute features in one overlapping pass",
+        parents=[config_parent],
+    )
+    p_sec_stream.set_defaults(func=_cmd_sec_stream)
+
+    p_manifest = sub.add_parser(
+        "manifest", help="Download manifest commands", parents=[config_parent]
+    )
+    manifest_sub = p_manifest.add_subparsers(dest="manifest_command", required=True)
+    p_manifest_export = manifest_sub.add_parser(
+        "export", help="Export the download manifest as JSONL", parents=[config_parent]
+    )
+    p_manifest_export.add_argument("--output", required=True, help="JSONL output path")
+    p_manifest_export.add_argument(
+        "--log", help="Only export one log, e.g. sec_filings or echo_downloads"
+    )
+    p_manifest_export.set_defaults(func=_cmd_manifest_export)
+
+    p_standin = sub.add_parser("standin", help="Local record/replay HTTP stand-in")
+    standin_sub = p_standin.add_subparsers(dest="standin_command", required=True)
+    p_standin_serve = standin_sub.add_parser(
+        "serve", help="Serve a cassette directory in place of SEC/EPA/USAspending"
+    )
+    p_standin_serve.add_argument("--cassette", required=True, help="Cassette directory")
+    p_standin_serve.add_argument("--host", default="127.0.0.1")
+    p_standin_serve.add_argument("--port", type=int, default=8765)
+    p_standin_serve.add_argument(
+        "--record", action="store_true", help="Fetch and save misses from the real hosts"
+    )
+    p_standin_serve.add_argument("--latency-ms", type=float, default=0.0)
+    p_standin_serve.add_argument(
+        "--max-rps", type=float, default=None, help="Answer 429 above this request rate"
+    )
+    p_standin_serve.add_argument(
+        "--retry-after", type=float, default=1.0, help="Retry-After seconds on 429/503"
+    )
+    p_standin_serve.add_argument(
+        "--failure-rate", type=float, default=0.0, help="Share of requests answered with 503"
+    )
+    p_standin_serve.add_argument(
+        "--truncate-rate", type=float, default=0.0, help="Share of bodies cut off mid-transfer"
+    )
+    p_standin_serve.add_argument("--seed", type=int, default=0)
+    p_standin_serve.set_defaults(func=_cmd_standin_serve)
 
     p_epa = sub.add_parser("epa", help="EPA ingestion commands", parents=[config_parent])
     epa_sub = p_epa.add_subparsers(dest="epa_command", required=True)
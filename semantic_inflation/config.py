@@ -103,6 +103,17 @@ class RuntimeSettings(BaseModel):
     max_workers: int = 4
     request_timeout_seconds: int = 60
     offline: bool = False
+    # Revalidate cached downloads with conditional requests (ETag/Last-Modified).
+    refresh: bool = False
+    # Requests per second by host, e.g. {"sec.gov": 8, "echo.epa.gov": 4}; each
+    # caps the rate passed by the stage. SEC hosts share one "sec.gov" bucket.
+    host_max_requests_per_second: dict[str, float] = Field(default_factory=dict)
+    # Directory of file-locked token buckets shared by every process (and node,
+    # on a filesystem with coherent flock) that downloads with this config.
+    shared_rate_limit_dir: Path | None = None
+    # Base URL of a local `semantic-inflation standin serve` server; every
+    # download is routed there instead of the real hosts.
+    http_standin_url: str | None = None
 
 
 class PipelineSecSettings(BaseModel):
@@ -110,6 +121,50 @@ class PipelineSecSettings(BaseModel):
     max_filings: int | None = None
     build_index: bool = True
     company_tickers_url: str = "https://www.sec.gov/files/company_tickers.json"
+    stream_features: bool = False
+    stream_queue_size: int = 64
+    submissions_max_age_hours: float | None = None
+    # Where `sec index` reads filing lists: "api" requests data.sec.gov per CIK,
+    # "bulk" reads the matched CIKs' members from the nightly submissions.zip and
+    # "full-index" filters the EDGAR quarterly master.idx files.
+    index_source: str = "api"
+    # Refresh an existing index in place: only filings past each CIK's
+    # high-water mark (filings_index.state.json) are selected and merged.
+    incremental: bool = False
+    # Index URLs checked (HEAD, no body) after each build; None checks them all.
+    url_sample_size: int | None = 25
+    # Hardlink index rows with a local file_path into raw/sec/filings when the
+    # mirror is on the same filesystem. Turn off if mirror files can change in
+    # place; reflinks and kernel copies are still used.
+    hardlink_local_filings: bool = True
+    submissions_zip_path: Path | None = None
+    submissions_zip_url: str = (
+        "https://www.sec.gov/Archives/edgar/daily-index/bulkdata/submissions.zip"
+    )
+
+    @field_validator("index_source")
+    @classmethod
+    def _known_index_source(cls, value: str) -> str:
+        if value not in {"api", "bulk", "full-index"}:
+            raise ValueError("index_source must be 'api', 'bulk' or 'full-index'.")
+        return value
+
+
+class PipelineFeaturesSettings(BaseModel):
+    max_workers: int | None = None
+    scheduler: str = "lpt"
+    guarded: bool = False
+    memory_limit_mb: int | None = 4096
+    timeout_seconds: float = 600.0
+    fallback_extractor: str | None = "htmlparser"
+    telemetry: bool = False
+
+    @field_validator("scheduler")
+    @classmethod
+    def _known_scheduler(cls, value: str) -> str:
+        if value not in {"lpt", "index"}:
+            raise ValueError("scheduler must be 'lpt' or 'index'.")
+        return value
 
 
 class PipelineGhgrpSettings(BaseModel):
@@ -123,6 +178,7 @@ class PipelineGhgrpSettings(BaseModel):
     parent_companies_path: Path = Path("data/raw/epa/ghgrp/ghgrp_parent_companies.xlsb")
     years: list[int] | None = None
     cache_raw: bool = True
+    max_age_hours: float | None = None
 
 
 class PipelineEchoSettings(BaseModel):
@@ -132,6 +188,7 @@ class PipelineEchoSettings(BaseModel):
     frs_downloads_url: str = "https://echo.epa.gov/files/echodownloads/frs_downloads.zip"
     schema_fields: list[str] = Field(default_factory=list)
     cache_raw: bool = True
+    max_age_hours: float | None = None
 
 
 class PipelineUsaspendingSettings(BaseModel):
@@ -178,6 +235,7 @@ class PipelineSettings(BaseModel):
     mode: str = "full"
     sample_frame: str = "ghgrp_matched"
     sec: PipelineSecSettings = Field(default_factory=PipelineSecSettings)
+    features: PipelineFeaturesSettings = Field(default_factory=PipelineFeaturesSettings)
     ghgrp: PipelineGhgrpSettings = Field(default_factory=PipelineGhgrpSettings)
     echo: PipelineEchoSettings = Field(default_factory=PipelineEchoSettings)
     usaspending: PipelineUsaspendingSettings = Field(default_factory=PipelineUsaspendingSettings)
@@ -1,15 +1,42 @@
 from __future__ import annotations
 
+import atexit
+from contextlib import contextmanager
 from dataclasses import dataclass
 from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
 import hashlib
 import json
+import os
 from pathlib import Path
+import threading
 import time
-from typing import Any, Iterable
+from typing import Any, Iterable, Iterator
 
 import httpx
-from tenacity import retry, retry_if_exception, stop_after_attempt, wait_exponential
+from tenacity import (
+    RetryCallState,
+    retry,
+    retry_if_exception,
+    stop_after_attempt,
+    wait_exponential,
+)
+
+from semantic_inflation.net.manifest import (
+    MANIFEST_DB_NAME,
+    ManifestStore,
+    flush_manifest_stores,
+    get_manifest_store,
+)
+from semantic_inflation.net.rate_limit import (
+    AdaptiveRateLimiter,
+    RateLimiter,
+    SHARED_LIMITS_SUPPORTED,
+    SharedRateLimiter,
+)
+from semantic_inflation.net.standin import StandinTransport
+
+_CHUNK_SIZE = 1 << 20
 
 
 @dataclass(frozen=True)
@@ -28,49 +55,430 @@ def sha256_bytes(payload: bytes) -> str:
 
 
 def sha256_file(path: Path) -> str:
-    return hashlib.sha256(path.read_bytes()).hexdigest()
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        for chunk in iter(lambda: handle.read(_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+_LIMITERS: dict[str, RateLimiter] = {}
+_LIMITERS_LOCK = threading.Lock()
+_HOST_LIMITS: dict[str, float] = {}
+_SHARED_DIR: Path | None = None
 
 
-class RateLimiter:
-    def __init__(self, max_rps: float) -> None:
-        self._max_rps = max(max_rps, 0.1)
-        self._min_interval = 1.0 / self._max_rps
-        self._last_time = 0.0
+# SEC's fair-access limit applies per client across all of its hosts.
+_SHARED_BUCKET_DOMAINS = ("sec.gov",)
 
-    def acquire(self) -> None:
-        now = time.monotonic()
-        elapsed = now - self._last_time
-        if elapsed < self._min_interval:
-            time.sleep(self._min_interval - elapsed)
-        self._last_time = time.monotonic()
 
+def _bucket_name(host: str) -> str:
+    for domain in _SHARED_BUCKET_DOMAINS:
+        if host == domain or host.endswith("." + domain):
+            return domain
+    return host
 
-_LIMITERS: dict[float, RateLimiter] = {}
+
+def get_limiter(url: str, max_rps: float) -> RateLimiter:
+    """Return the limiter for the host of ``url``.
+
+    Each host gets its own bucket, so SEC and EPA downloads never throttle one
+    another; the SEC hosts (``www.sec.gov``, ``data.sec.gov``) share a single
+    ``sec.gov`` bucket. A limit configured through :func:`client_pool` for the
+    host or its bucket caps the caller's ``max_rps`` but never raises it. When
+    the pool has a shared directory, the bucket lives in
+    ``<dir>/<bucket>.bucket`` and is shared with every other process pointed at
+    the same directory.
+    """
+    host = httpx.URL(url).host
+    bucket = _bucket_name(host)
+    limits = [_HOST_LIMITS[name] for name in {host, bucket} if name in _HOST_LIMITS]
+    rate = min([max_rps, *limits])
+    shared_dir = _SHARED_DIR if SHARED_LIMITS_SUPPORTED else None
+    key = f"{bucket}@{shared_dir}" if shared_dir else bucket
+    with _LIMITERS_LOCK:
+        limiter = _LIMITERS.get(key)
+        if limiter is None:
+            if shared_dir:
+                limiter = SharedRateLimiter(shared_dir / f"{bucket}.bucket", rate, name=bucket)
+            else:
+                limiter = AdaptiveRateLimiter(rate, name=bucket)
+            _LIMITERS[key] = limiter
+        elif limiter.ceiling != max(rate, 0.1):
+            limiter.set_rate(rate)
+        return limiter
+
+
+_CLIENTS: dict[str, httpx.Client] = {}
+_CLIENTS_LOCK = threading.Lock()
+_POOL_SIZE = 4
+_POOL_DEPTH = 0
+_STANDIN_URL: str | None = None
+
+
+def get_client(url: str) -> httpx.Client:
+    """Return the shared keep-alive client for the host of ``url``.
+
+    Headers and timeouts are passed per request, so one client per host can
+    serve every downloader that talks to it. Inside a pool with a stand-in
+    URL the client's transport reroutes requests to the local stand-in server.
+    """
+    parsed = httpx.URL(url)
+    key = f"{parsed.scheme}://{parsed.netloc.decode('ascii')}"
+    with _CLIENTS_LOCK:
+        client = _CLIENTS.get(key)
+        if client is None or client.is_closed:
+            limits = httpx.Limits(
+                max_connections=_POOL_SIZE,
+                max_keepalive_connections=_POOL_SIZE,
+                keepalive_expiry=30.0,
+            )
+            if _STANDIN_URL:
+                client = httpx.Client(transport=StandinTransport(_STANDIN_URL, limits))
+            else:
+                client = httpx.Client(limits=limits)
+            _CLIENTS[key] = client
+        return client
+
+
+def close_clients() -> None:
+    with _CLIENTS_LOCK:
+        clients = list(_CLIENTS.values())
+        _CLIENTS.clear()
+    for client in clients:
+        client.close()
+
+
+@contextmanager
+def client_pool(
+    max_connections: int,
+    host_limits: dict[str, float] | None = None,
+    shared_limit_dir: Path | None = None,
+    standin_url: str | None = None,
+) -> Iterator[None]:
+    """Size the per-host clients for a stage and close them when it ends.
+
+    ``host_limits`` maps host names to requests per second for the stage and
+    ``shared_limit_dir`` switches the limiters to cross-process buckets.
+    ``standin_url`` sends every request to a local record/replay server.
+    Nested pools (a stage calling another stage's helpers) share the outer
+    pool and leave closing to it.
+    """
+    global _POOL_DEPTH, _POOL_SIZE, _SHARED_DIR, _STANDIN_URL
+    with _CLIENTS_LOCK:
+        _POOL_DEPTH += 1
+        outermost = _POOL_DEPTH == 1
+        if outermost:
+            _POOL_SIZE = max(1, max_connections)
+            _HOST_LIMITS.clear()
+            _HOST_LIMITS.update(host_limits or {})
+            _SHARED_DIR = shared_limit_dir
+            _STANDIN_URL = standin_url
+    if outermost:
+        close_clients()
+    try:
+        yield
+    finally:
+        with _CLIENTS_LOCK:
+            _POOL_DEPTH -= 1
+            if outermost:
+                _HOST_LIMITS.clear()
+                _SHARED_DIR = None
+                _STANDIN_URL = None
+        if outermost:
+            close_clients()
+            flush_manifest_stores()
+
+
+atexit.register(close_clients)
+
+
+def manifest_store_for(path: Path) -> ManifestStore:
+    return get_manifest_store(path.parent / MANIFEST_DB_NAME)
 
 
 def append_manifest(path: Path, payload: dict[str, Any]) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    with path.open("a", encoding="utf-8") as handle:
-        handle.write(json.dumps(payload, sort_keys=True) + "\n")
+    """Record a download in the SQLite manifest that replaced the JSONL log ``path``.
+
+    ``path.stem`` names the log; ``ManifestStore.export_jsonl`` recreates it.
+    """
+    manifest_store_for(path).record(path.stem, payload)
+
+
+class RangeNotSatisfiable(Exception):
+    """The server rejected a resume request; the download restarts from zero."""
+
+
+class RangeMismatch(RangeNotSatisfiable):
+    """A 206 reply did not start at the requested offset; the partial file is discarded."""
+
+
+_THROTTLE_STATUSES = {429, 503}
+_MAX_RETRY_AFTER = 300.0
+
+
+def retry_after_seconds(response: httpx.Response) -> float | None:
+    value = response.headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        delay = float(value)
+    except ValueError:
+        try:
+            when = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if when.tzinfo is None:
+            when = when.replace(tzinfo=timezone.utc)
+        delay = (when - datetime.now(timezone.utc)).total_seconds()
+    return min(max(delay, 0.0), _MAX_RETRY_AFTER)
+
+
+_backoff = wait_exponential(multiplier=1, min=1, max=16)
+
+
+def _wait_retry_after(retry_state: RetryCallState) -> float:
+    # Exponential backoff, but never shorter than the server's Retry-After.
+    backoff = _backoff(retry_state)
+    exc = retry_state.outcome.exception() if retry_state.outcome else None
+    if isinstance(exc, httpx.HTTPStatusError):
+        delay = retry_after_seconds(exc.response)
+        if delay is not None:
+            return max(backoff, delay)
+    return backoff
 
 
 def _should_retry(exc: BaseException) -> bool:
     if isinstance(exc, httpx.HTTPStatusError):
         return exc.response.status_code in {429, 500, 502, 503, 504}
-    return isinstance(exc, httpx.TransportError)
+    return isinstance(exc, (httpx.TransportError, RangeNotSatisfiable))
+
+
+@dataclass(frozen=True)
+class _StreamedResponse:
+    status_code: int
+    content_type: str | None
+    sha256: str
+    bytes_written: int
+    resumed_from: int
+    etag: str | None = None
+    last_modified: str | None = None
+
+
+def _part_path(destination: Path) -> Path:
+    return destination.with_name(destination.name + ".part")
+
+
+def _part_meta_path(part_path: Path) -> Path:
+    return part_path.with_name(part_path.name + ".json")
+
+
+def _discard_part(part_path: Path) -> None:
+    part_path.unlink(missing_ok=True)
+    _part_meta_path(part_path).unlink(missing_ok=True)
+
+
+def sidecar_path(destination: Path) -> Path:
+    return destination.with_name(destination.name + ".meta.json")
+
+
+def read_sidecar(destination: Path) -> dict[str, Any]:
+    path = sidecar_path(destination)
+    if not path.exists():
+        return {}
+    try:
+        payload = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return {}
+    return payload if isinstance(payload, dict) else {}
+
+
+def write_sidecar(destination: Path, payload: dict[str, Any]) -> None:
+    path = sidecar_path(destination)
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.write_text(json.dumps(payload, sort_keys=True), encoding="utf-8")
+    os.replace(tmp_path, path)
+
+
+def _stat_key(path: Path) -> dict[str, int]:
+    stat = path.stat()
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def cached_sha256(path: Path, meta: dict[str, Any] | None = None) -> str:
+    """Return the SHA-256 of ``path``, reusing the sidecar hash when possible.
+
+    The stored hash is trusted only while the file's size and ``mtime_ns``
+    still match, so a cache hit costs a ``stat`` instead of a full read.
+    """
+    meta = read_sidecar(path) if meta is None else meta
+    key = _stat_key(path)
+    if meta.get("sha256") and all(meta.get(name) == value for name, value in key.items()):
+        return meta["sha256"]
+    sha = sha256_file(path)
+    write_sidecar(path, {**meta, **key, "sha256": sha})
+    return sha
+
+
+def _conditional_headers(meta: dict[str, Any]) -> dict[str, str]:
+    headers: dict[str, str] = {}
+    if meta.get("etag"):
+        headers["If-None-Match"] = meta["etag"]
+    if meta.get("last_modified"):
+        headers["If-Modified-Since"] = meta["last_modified"]
+    return headers
+
+
+def _needs_revalidation(
+    destination: Path, meta: dict[str, Any], revalidate: bool, max_age: float | None
+) -> bool:
+    if revalidate:
+        return True
+    if max_age is None:
+        return False
+    fetched_at = meta.get("fetched_at")
+    if not isinstance(fetched_at, (int, float)):
+        fetched_at = destination.stat().st_mtime
+    return time.time() - fetched_at > max_age
+
+
+def _fsync_directory(path: Path) -> None:
+    # Persist the rename itself; not every platform can open a directory.
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def _content_range_start(value: str | None) -> int | None:
+    # "bytes 1000-1999/5000" -> 1000
+    if not value or not value.startswith("bytes "):
+        return None
+    try:
+        return int(value[len("bytes ") :].split("-", 1)[0])
+    except ValueError:
+        return None
+
+
+def _resume_headers(part_path: Path, headers: dict[str, str]) -> tuple[int, dict[str, str]]:
+    offset = part_path.stat().st_size if part_path.exists() else 0
+    if not offset:
+        return 0, headers
+    meta: dict[str, Any] = {}
+    meta_path = _part_meta_path(part_path)
+    if meta_path.exists():
+        try:
+            meta = json.loads(meta_path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            meta = {}
+    if meta.get("content_encoding"):
+        # The .part holds decoded bytes, so offsets into an encoded (gzip)
+        # body cannot be resumed.
+        return 0, headers
+    request_headers = dict(headers)
+    request_headers["Range"] = f"bytes={offset}-"
+    # If-Range makes the server send the full body instead of a range when the
+    # resource changed since the partial file was started.
+    validator = meta.get("etag") or meta.get("last_modified")
+    if validator:
+        request_headers["If-Range"] = validator
+    return offset, request_headers
 
 
 @retry(
     retry=retry_if_exception(_should_retry),
     stop=stop_after_attempt(5),
-    wait=wait_exponential(multiplier=1, min=1, max=16),
+    wait=_wait_retry_after,
     reraise=True,
 )
-def _fetch_bytes(url: str, headers: dict[str, str], timeout: float) -> httpx.Response:
-    with httpx.Client(headers=headers, timeout=timeout) as client:
-        response = client.get(url)
+def _stream_to_file(
+    url: str,
+    part_path: Path,
+    headers: dict[str, str],
+    timeout: float,
+    limiter: RateLimiter | None = None,
+) -> _StreamedResponse:
+    # Acquire inside the retried call so that retries are rate limited too.
+    if limiter:
+        limiter.acquire()
+    offset, request_headers = _resume_headers(part_path, headers)
+    client = get_client(url)
+    with client.stream("GET", url, headers=request_headers, timeout=timeout) as response:
+        if limiter:
+            if response.status_code in _THROTTLE_STATUSES:
+                limiter.on_throttle(retry_after_seconds(response))
+            elif response.status_code < 400:
+                limiter.on_success()
+        if response.status_code == 304:
+            _discard_part(part_path)
+            return _StreamedResponse(
+                status_code=304,
+                content_type=response.headers.get("content-type"),
+                sha256="",
+                bytes_written=0,
+                resumed_from=0,
+                etag=response.headers.get("etag"),
+                last_modified=response.headers.get("last-modified"),
+            )
+        if offset and response.status_code == 416:
+            _discard_part(part_path)
+            raise RangeNotSatisfiable(url)
         response.raise_for_status()
-        return response
+        digest = hashlib.sha256()
+        resumed = (
+            offset > 0
+            and response.status_code == 206
+            and _content_range_start(response.headers.get("content-range")) == offset
+        )
+        if response.status_code == 206 and not resumed:
+            # Only a 200 carries the whole file; a range from elsewhere cannot be
+            # appended to (or stand in for) the partial download.
+            _discard_part(part_path)
+            raise RangeMismatch(url)
+        if resumed:
+            with part_path.open("rb") as existing:
+                for chunk in iter(lambda: existing.read(_CHUNK_SIZE), b""):
+                    digest.update(chunk)
+            written = offset
+        else:
+            # Full body (200): either a fresh download or the server ignored Range.
+            offset = 0
+            written = 0
+            _part_meta_path(part_path).write_text(
+                json.dumps(
+                    {
+                        "url": url,
+                        "etag": response.headers.get("etag"),
+                        "last_modified": response.headers.get("last-modified"),
+                        "content_encoding": response.headers.get("content-encoding"),
+                    },
+                    sort_keys=True,
+                ),
+                encoding="utf-8",
+            )
+        with part_path.open("ab" if resumed else "wb") as handle:
+            # No chunk_size: buffered chunks would be lost on a dropped link.
+            for chunk in response.iter_bytes():
+                handle.write(chunk)
+                digest.update(chunk)
+                written += len(chunk)
+            handle.flush()
+            os.fsync(handle.fileno())
+        return _StreamedResponse(
+            status_code=200 if resumed else response.status_code,
+            content_type=response.headers.get("content-type"),
+            sha256=digest.hexdigest(),
+            bytes_written=written,
+            resumed_from=offset,
+            etag=response.headers.get("etag"),
+            last_modified=response.headers.get("last-modified"),
+        )
 
 
 def download_file(
@@ -83,12 +491,21 @@ def download_file(
     timeout: float = 60.0,
     expected_sha256: str | None = None,
     extra_manifest: dict[str, Any] | None = None,
+    revalidate: bool = False,
+    max_age: float | None = None,
 ) -> DownloadResult:
+    """Download ``url`` to ``destination`` unless a usable copy is cached.
+
+    A cached file is reused as-is unless ``revalidate`` is set or it is older
+    than ``max_age`` seconds; then the ETag/Last-Modified validators stored in
+    its ``.meta.json`` sidecar are sent as a conditional request and a
+    ``304 Not Modified`` keeps the cached bytes without a transfer.
+    """
     destination.parent.mkdir(parents=True, exist_ok=True)
     headers = headers or {}
     limiter = None
     if max_rps:
-        limiter = _LIMITERS.setdefault(max_rps, RateLimiter(max_rps))
+        limiter = get_limiter(url, max_rps)
 
     def _log_result(
         status_code: int,
@@ -96,6 +513,9 @@ def download_file(
         bytes_written: int,
         content_type: str | None,
         cached: bool,
+        resumed_from: int = 0,
+        etag: str | None = None,
+        last_modified: str | None = None,
     ) -> None:
         if not manifest_path:
             return
@@ -109,15 +529,25 @@ def download_file(
             "content_type": content_type,
             "cached": cached,
         }
+        if resumed_from:
+            payload["resumed_from"] = resumed_from
+        if etag:
+            payload["etag"] = etag
+        if last_modified:
+            payload["last_modified"] = last_modified
         if extra_manifest:
             payload.update(extra_manifest)
         append_manifest(manifest_path, payload)
 
+    request_headers = headers
+    meta: dict[str, Any] = {}
     if destination.exists() and destination.stat().st_size > 0:
-        sha = sha256_file(destination)
+        meta = read_sidecar(destination)
+        sha = cached_sha256(destination, meta)
         if expected_sha256 and expected_sha256 != sha:
             destination.unlink()
-        else:
+            meta = {}
+        elif not _needs_revalidation(destination, meta, revalidate, max_age):
             _log_result(200, sha, destination.stat().st_size, None, True)
             return DownloadResult(
                 url=url,
@@ -128,31 +558,143 @@ def download_file(
                 content_type=None,
                 cached=True,
             )
+        else:
+            request_headers = {**headers, **_conditional_headers(meta)}
+            meta.update(_stat_key(destination), sha256=sha)
 
-    if limiter:
-        limiter.acquire()
-    response = _fetch_bytes(url, headers=headers, timeout=timeout)
-    destination.write_bytes(response.content)
+    # Stream into a sibling .part file and rename it into place only once it
+    # is complete, so an interrupted run never leaves a truncated file that
+    # would later be mistaken for a cache hit. The .part file survives
+    # transport failures so that the next attempt resumes with a Range request.
+    part_path = _part_path(destination)
+    try:
+        streamed = _stream_to_file(
+            url, part_path, headers=request_headers, timeout=timeout, limiter=limiter
+        )
+        if streamed.status_code == 304:
+            meta.update(
+                {
+                    "url": url,
+                    "fetched_at": time.time(),
+                    "etag": streamed.etag or meta.get("etag"),
+                    "last_modified": streamed.last_modified or meta.get("last_modified"),
+                }
+            )
+            write_sidecar(destination, meta)
+            size = destination.stat().st_size
+            _log_result(304, meta["sha256"], size, streamed.content_type, True)
+            return DownloadResult(
+                url=url,
+                path=destination,
+                status_code=304,
+                sha256=meta["sha256"],
+                bytes_written=size,
+                content_type=streamed.content_type,
+                cached=True,
+            )
+        if expected_sha256 and expected_sha256 != streamed.sha256:
+            raise ValueError(
+                f"SHA-256 mismatch for {url}: expected {expected_sha256}, got {streamed.sha256}"
+            )
+        os.replace(part_path, destination)
+        _part_meta_path(part_path).unlink(missing_ok=True)
+        write_sidecar(
+            destination,
+            {
+                "url": url,
+                "fetched_at": time.time(),
+                "etag": streamed.etag,
+                "last_modified": streamed.last_modified,
+                "sha256": streamed.sha256,
+                **_stat_key(destination),
+            },
+        )
+    except (httpx.TransportError, KeyboardInterrupt):
+        raise
+    except BaseException:
+        _discard_part(part_path)
+        raise
+    _fsync_directory(destination.parent)
     print(f"Downloaded: {destination}")
-    sha = sha256_bytes(response.content)
     _log_result(
-        response.status_code,
-        sha,
-        len(response.content),
-        response.headers.get("content-type"),
+        streamed.status_code,
+        streamed.sha256,
+        streamed.bytes_written,
+        streamed.content_type,
         False,
+        streamed.resumed_from,
+        streamed.etag,
+        streamed.last_modified,
     )
     return DownloadResult(
         url=url,
         path=destination,
-        status_code=response.status_code,
-        sha256=sha,
-        bytes_written=len(response.content),
-        content_type=response.headers.get("content-type"),
+        status_code=streamed.status_code,
+        sha256=streamed.sha256,
+        bytes_written=streamed.bytes_written,
+        content_type=streamed.content_type,
         cached=False,
     )
 
 
+# Hosts that reject HEAD answer one of these; fall back to a ranged GET.
+_HEAD_UNSUPPORTED = {403, 405, 501}
+_PROBE_RANGE = "bytes=0-1023"
+
+
+def check_url(
+    url: str,
+    *,
+    headers: dict[str, str] | None = None,
+    max_rps: float | None = None,
+    timeout: float = 30.0,
+    attempts: int = 3,
+) -> dict[str, Any]:
+    """Check that ``url`` is reachable without downloading its body.
+
+    Sends a HEAD request through the pooled client and the host's limiter.
+    If the host rejects HEAD, it retries with a GET for the first KiB only,
+    whose body is never read beyond that. Throttling responses feed the
+    adaptive limiter and are retried up to ``attempts`` times. Returns the
+    final status, content type and length, or the transport error.
+    """
+    limiter = get_limiter(url, max_rps) if max_rps else None
+    client = get_client(url)
+    method = "HEAD"
+    result: dict[str, Any] = {"url": url, "method": method, "status_code": None}
+    for _ in range(max(1, attempts)):
+        if limiter is not None:
+            limiter.acquire()
+        request_headers = dict(headers or {})
+        if method == "GET":
+            request_headers["Range"] = _PROBE_RANGE
+        try:
+            with client.stream(
+                method, url, headers=request_headers, timeout=timeout, follow_redirects=True
+            ) as response:
+                status = response.status_code
+                result = {
+                    "url": url,
+                    "method": method,
+                    "status_code": status,
+                    "content_type": response.headers.get("content-type"),
+                    "content_length": response.headers.get("content-length"),
+                }
+        except httpx.HTTPError as exc:
+            return {**result, "method": method, "error": f"{type(exc).__name__}: {exc}"}
+        if status in _THROTTLE_STATUSES:
+            if limiter is not None:
+                limiter.on_throttle(retry_after_seconds(response))
+            continue
+        if limiter is not None:
+            limiter.on_success()
+        if method == "HEAD" and status in _HEAD_UNSUPPORTED:
+            method = "GET"
+            continue
+        break
+    return result
+
+
 def ensure_directories(paths: Iterable[Path]) -> None:
     for path in paths:
         path.mkdir(parents=True, exist_ok=True)
@@ -0,0 +1,196 @@
+from __future__ import annotations
+
+import atexit
+import json
+from pathlib import Path
+import sqlite3
+import threading
+from typing import Any, Iterable
+
+MANIFEST_DB_NAME = "downloads.sqlite"
+
+_COLUMNS = [
+    "path",
+    "log",
+    "url",
+    "sha256",
+    "bytes",
+    "status_code",
+    "status",
+    "content_type",
+    "cached",
+    "etag",
+    "last_modified",
+    "first_seen",
+    "timestamp",
+    "extra",
+]
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS downloads (
+    path TEXT PRIMARY KEY,
+    log TEXT NOT NULL,
+    url TEXT,
+    sha256 TEXT,
+    bytes INTEGER,
+    status_code INTEGER,
+    status TEXT,
+    content_type TEXT,
+    cached INTEGER,
+    etag TEXT,
+    last_modified TEXT,
+    first_seen TEXT,
+    timestamp TEXT,
+    extra TEXT
+);
+CREATE INDEX IF NOT EXISTS downloads_url ON downloads (url);
+CREATE INDEX IF NOT EXISTS downloads_log ON downloads (log);
+"""
+# Cache hits refresh the row but keep what the original download recorded.
+_UPSERT = f"""
+INSERT INTO downloads ({", ".join(_COLUMNS)})
+VALUES ({", ".join("?" for _ in _COLUMNS)})
+ON CONFLICT (path) DO UPDATE SET
+    log = excluded.log,
+    url = excluded.url,
+    sha256 = excluded.sha256,
+    bytes = excluded.bytes,
+    status_code = CASE WHEN excluded.cached THEN downloads.status_code
+        ELSE excluded.status_code END,
+    status = excluded.status,
+    content_type = COALESCE(excluded.content_type, downloads.content_type),
+    cached = excluded.cached,
+    etag = COALESCE(excluded.etag, downloads.etag),
+    last_modified = COALESCE(excluded.last_modified, downloads.last_modified),
+    timestamp = excluded.timestamp,
+    extra = COALESCE(excluded.extra, downloads.extra)
+"""
+_KNOWN_KEYS = set(_COLUMNS) - {"log", "first_seen", "extra"}
+
+
+class ManifestStore:
+    """SQLite download manifest with one row per local path.
+
+    Writes are buffered and committed in batches inside a single transaction;
+    ``flush`` runs at the end of every download stage. The ``log`` column keeps
+    the name of the JSONL log a row used to be appended to, so
+    :meth:`export_jsonl` can reproduce those files for audit.
+    """
+
+    def __init__(self, db_path: Path, batch_size: int = 500) -> None:
+        self.db_path = db_path
+        self._batch_size = max(1, batch_size)
+        self._pending: list[tuple[Any, ...]] = []
+        self._lock = threading.Lock()
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    def record(self, log: str, payload: dict[str, Any]) -> None:
+        extra = {key: value for key, value in payload.items() if key not in _KNOWN_KEYS}
+        status = payload.get("status") or ("cached" if payload.get("cached") else "downloaded")
+        row = (
+            str(payload["path"]),
+            log,
+            payload.get("url"),
+            payload.get("sha256"),
+            payload.get("bytes"),
+            payload.get("status_code"),
+            status,
+            payload.get("content_type"),
+            int(bool(payload.get("cached"))),
+            payload.get("etag"),
+            payload.get("last_modified"),
+            payload.get("timestamp"),
+            payload.get("timestamp"),
+            json.dumps(extra, sort_keys=True) if extra else None,
+        )
+        with self._lock:
+            self._pending.append(row)
+            if len(self._pending) >= self._batch_size:
+                self._flush_locked()
+
+    def _flush_locked(self) -> None:
+        if not self._pending:
+            return
+        with self._conn:
+            self._conn.executemany(_UPSERT, self._pending)
+        self._pending.clear()
+
+    def flush(self) -> None:
+        with self._lock:
+            self._flush_locked()
+
+    def close(self) -> None:
+        with self._lock:
+            self._flush_locked()
+            self._conn.close()
+
+    def lookup(
+        self, paths: Iterable[Path | str] | None = None, *, log: str | None = None
+    ) -> dict[str, dict[str, Any]]:
+        """Return manifest rows keyed by path, optionally limited to ``paths``/``log``."""
+        self.flush()
+        query = f"SELECT {', '.join(_COLUMNS)} FROM downloads"
+        params: list[Any] = []
+        if log is not None:
+            query += " WHERE log = ?"
+            params.append(log)
+        with self._lock:
+            rows = [dict(zip(_COLUMNS, row)) for row in self._conn.execute(query, params)]
+        by_path = {row["path"]: row for row in rows}
+        if paths is None:
+            return by_path
+        return {key: by_path[key] for key in map(str, paths) if key in by_path}
+
+    def export_jsonl(self, output_path: Path, *, log: str | None = None) -> int:
+        rows = self.lookup(log=log)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        with output_path.open("w", encoding="utf-8") as handle:
+            for row in sorted(rows.values(), key=lambda r: (r["timestamp"] or "", r["path"])):
+                payload = {
+                    "timestamp": row["timestamp"],
+                    "url": row["url"],
+                    "path": row["path"],
+                    "sha256": row["sha256"],
+                    "bytes": row["bytes"],
+                    "status_code": row["status_code"],
+                    "content_type": row["content_type"],
+                    "cached": bool(row["cached"]),
+                }
+                if row["extra"]:
+                    payload.update(json.loads(row["extra"]))
+                handle.write(json.dumps(payload, sort_keys=True) + "\n")
+        return len(rows)
+
+
+_STORES: dict[Path, ManifestStore] = {}
+_STORES_LOCK = threading.Lock()
+
+
+def get_manifest_store(db_path: Path) -> ManifestStore:
+    key = db_path.resolve()
+    with _STORES_LOCK:
+        store = _STORES.get(key)
+        if store is None:
+            store = _STORES[key] = ManifestStore(db_path)
+        return store
+
+
+def flush_manifest_stores() -> None:
+    with _STORES_LOCK:
+        stores = list(_STORES.values())
+    for store in stores:
+        store.flush()
+
+
+def close_manifest_stores() -> None:
+    with _STORES_LOCK:
+        stores = list(_STORES.values())
+        _STORES.clear()
+    for store in stores:
+        store.close()
+
+
+atexit.register(close_manifest_stores)
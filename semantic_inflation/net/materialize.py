@@ -0,0 +1,137 @@
+"""Place files from a local mirror without copying their bytes through Python."""
+from __future__ import annotations
+
+from dataclasses import dataclass
+import errno
+import hashlib
+import os
+from pathlib import Path
+import sys
+
+from semantic_inflation.net.download import read_sidecar, sha256_file
+
+_CHUNK_SIZE = 1 << 20
+# ioctl(FICLONE) shares extents on btrfs, XFS and similar; fcntl only names it from 3.12.
+_FICLONE = 0x40049409
+# Raised when the filesystem or kernel cannot do the fast path; fall back to the next one.
+_UNSUPPORTED = {
+    errno.EXDEV,
+    errno.EPERM,
+    errno.EACCES,
+    errno.ENOSYS,
+    errno.EINVAL,
+    errno.ENOTTY,
+    errno.EOPNOTSUPP,
+    errno.EMLINK,
+}
+
+
+@dataclass(frozen=True)
+class MaterializeResult:
+    path: Path
+    sha256: str
+    bytes_written: int
+    method: str
+
+
+def _hardlink(source: Path, tmp_path: Path) -> None:
+    os.link(source, tmp_path)
+
+
+def _reflink(source: Path, tmp_path: Path) -> None:
+    if not sys.platform.startswith("linux"):
+        raise OSError(errno.EOPNOTSUPP, "reflinks need Linux FICLONE")
+    import fcntl
+
+    with source.open("rb") as src, tmp_path.open("wb") as dst:
+        fcntl.ioctl(dst.fileno(), getattr(fcntl, "FICLONE", _FICLONE), src.fileno())
+
+
+def _copy_file_range(source: Path, tmp_path: Path) -> None:
+    if not hasattr(os, "copy_file_range"):
+        raise OSError(errno.ENOSYS, "os.copy_file_range is unavailable")
+    size = source.stat().st_size
+    with source.open("rb") as src, tmp_path.open("wb") as dst:
+        copied = 0
+        while copied < size:
+            sent = os.copy_file_range(src.fileno(), dst.fileno(), size - copied)
+            if sent == 0:
+                break
+            copied += sent
+
+
+def _stream_copy(source: Path, tmp_path: Path) -> str:
+    digest = hashlib.sha256()
+    with source.open("rb") as src, tmp_path.open("wb") as dst:
+        for chunk in iter(lambda: src.read(_CHUNK_SIZE), b""):
+            digest.update(chunk)
+            dst.write(chunk)
+    return digest.hexdigest()
+
+
+def known_sha256(source: Path) -> str | None:
+    """Return the hash a mirror recorded for ``source`` in its sidecar, if still valid."""
+    meta = read_sidecar(source)
+    stat = source.stat()
+    if meta.get("sha256") and (meta.get("size"), meta.get("mtime_ns")) == (
+        stat.st_size,
+        stat.st_mtime_ns,
+    ):
+        return meta["sha256"]
+    return None
+
+
+def materialize_file(
+    source: Path,
+    destination: Path,
+    *,
+    sha256: str | None = None,
+    hardlink: bool = True,
+) -> MaterializeResult:
+    """Place ``source`` at ``destination`` with the cheapest available method.
+
+    Tries a hardlink, a reflink (``FICLONE``) and ``os.copy_file_range`` in
+    turn, and falls back to a streaming copy. ``sha256`` is the hash the
+    mirror's manifest recorded for ``source``; without it a valid sidecar hash
+    is used. If neither is known, the kernel copy is skipped: hashing would
+    read the file a second time, so the streaming copy (which hashes as it
+    goes) is cheaper. The result is written to a temporary name and moved
+    into place, so ``destination`` never holds a partial file.
+    """
+    sha256 = sha256 or known_sha256(source)
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = destination.with_name(destination.name + ".tmp")
+    attempts = [("reflink", _reflink)]
+    if hardlink:
+        attempts.insert(0, ("hardlink", _hardlink))
+    if sha256:
+        attempts.append(("copy_file_range", _copy_file_range))
+    method = "stream"
+    for name, place in attempts:
+        tmp_path.unlink(missing_ok=True)
+        try:
+            place(source, tmp_path)
+        except OSError as exc:
+            if exc.errno not in _UNSUPPORTED:
+                tmp_path.unlink(missing_ok=True)
+                raise
+            continue
+        method = name
+        break
+    else:
+        tmp_path.unlink(missing_ok=True)
+        try:
+            sha256 = _stream_copy(source, tmp_path)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+    os.replace(tmp_path, destination)
+    if sha256 is None:
+        # Links share the mirror's blocks, so hashing costs a read but no write.
+        sha256 = sha256_file(destination)
+    return MaterializeResult(
+        path=destination,
+        sha256=sha256,
+        bytes_written=destination.stat().st_size,
+        method=method,
+    )
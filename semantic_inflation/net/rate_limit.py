@@ -0,0 +1,272 @@
+from __future__ import annotations
+
+from contextlib import contextmanager
+import json
+import logging
+from pathlib import Path
+import threading
+import time
+from typing import Iterator
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows has no flock
+    fcntl = None  # type: ignore[assignment]
+
+LOGGER = logging.getLogger(__name__)
+
+SHARED_LIMITS_SUPPORTED = fcntl is not None
+
+
+class RateLimiter:
+    """Thread-safe token bucket shared by every worker that talks to a host.
+
+    Each ``acquire`` reserves a token under the lock and sleeps outside it, so
+    concurrent callers queue up behind one another and the aggregate rate never
+    exceeds ``max_rps``. ``burst`` (default 1) is the bucket capacity.
+    """
+
+    def __init__(self, max_rps: float, burst: float = 1.0) -> None:
+        self._max_rps = max(max_rps, 0.1)
+        self._capacity = max(burst, 1.0)
+        self._tokens = self._capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    @property
+    def max_rps(self) -> float:
+        return self._max_rps
+
+    def _refill_locked(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self._capacity, self._tokens + (now - self._updated) * self._max_rps)
+        self._updated = now
+
+    @property
+    def ceiling(self) -> float:
+        return self._max_rps
+
+    def set_rate(self, max_rps: float) -> None:
+        with self._lock:
+            # Settle tokens earned at the old rate before switching.
+            self._refill_locked()
+            self._max_rps = max(max_rps, 0.1)
+
+    def acquire(self) -> None:
+        with self._lock:
+            self._refill_locked()
+            self._tokens -= 1.0
+            wait = -self._tokens / self._max_rps if self._tokens < 0 else 0.0
+        if wait > 0:
+            time.sleep(wait)
+
+    def on_success(self) -> None:
+        pass
+
+    def on_throttle(self, retry_after: float | None = None) -> None:
+        pass
+
+
+class AdaptiveRateLimiter(RateLimiter):
+    """Token bucket whose rate follows AIMD between ``min_rps`` and a ceiling.
+
+    A 429/503 multiplies the rate by ``decrease`` and, when the server sent
+    ``Retry-After``, holds every caller until it has passed. Throttles that
+    arrive within one refill interval of a decrease (or during its
+    ``Retry-After`` pause) answer requests already in flight and only extend
+    the pause, so a burst of concurrent 429s lowers the rate once. Each
+    success adds ``increase / rate`` requests per second, i.e. roughly
+    ``increase`` rps per second of clean traffic, until the configured ceiling
+    is reached again.
+    """
+
+    def __init__(
+        self,
+        max_rps: float,
+        burst: float = 1.0,
+        *,
+        min_rps: float = 0.5,
+        decrease: float = 0.5,
+        increase: float = 0.1,
+        name: str = "",
+    ) -> None:
+        super().__init__(max_rps, burst)
+        self._ceiling = self._max_rps
+        self._min_rps = min(max(min_rps, 0.1), self._ceiling)
+        self._decrease = decrease
+        self._increase = increase
+        self._blocked_until = 0.0
+        self._cooldown_until = 0.0
+        self._logged_rps = self._max_rps
+        self._name = name
+
+    @property
+    def ceiling(self) -> float:
+        return self._ceiling
+
+    def set_rate(self, max_rps: float) -> None:
+        with self._lock:
+            self._refill_locked()
+            self._ceiling = max(max_rps, 0.1)
+            self._min_rps = min(self._min_rps, self._ceiling)
+            self._max_rps = min(self._max_rps, self._ceiling)
+
+    def acquire(self) -> None:
+        with self._lock:
+            delay = self._blocked_until - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+        super().acquire()
+
+    def on_success(self) -> None:
+        with self._lock:
+            if self._max_rps >= self._ceiling:
+                return
+            self._refill_locked()
+            self._max_rps = min(self._ceiling, self._max_rps + self._increase / self._max_rps)
+            rate = self._max_rps
+            # Log recovery in steps rather than on every request.
+            if rate < self._ceiling and rate - self._logged_rps < 0.5:
+                return
+            self._logged_rps = rate
+        LOGGER.info("Rate limit for %s raised to %.2f req/s", self._name or "host", rate)
+
+    def on_throttle(self, retry_after: float | None = None) -> None:
+        with self._lock:
+            now = time.monotonic()
+            if retry_after:
+                self._blocked_until = max(self._blocked_until, now + retry_after)
+            if now < self._cooldown_until:
+                return
+            self._refill_locked()
+            previous = self._max_rps
+            self._max_rps = max(self._min_rps, self._max_rps * self._decrease)
+            self._logged_rps = self._max_rps
+            self._cooldown_until = now + max(1.0 / self._max_rps, retry_after or 0.0)
+            # Drop any saved-up burst so the lower rate applies immediately.
+            self._tokens = min(self._tokens, 0.0)
+            rate = self._max_rps
+        LOGGER.warning(
+            "Throttled by %s: rate %.2f -> %.2f req/s%s",
+            self._name or "host",
+            previous,
+            rate,
+            f", pausing {retry_after:.1f}s for Retry-After" if retry_after else "",
+        )
+
+
+class SharedRateLimiter(RateLimiter):
+    """AIMD token bucket whose state lives in a file shared by many processes.
+
+    Every ``acquire`` takes an exclusive ``flock`` on ``path``, refills the
+    bucket from the wall clock, reserves a token and releases the lock before
+    sleeping, so any number of processes drawing from the same file stay
+    within one budget. Throttling is shared too: a 429 seen by one process
+    lowers the rate (and applies ``Retry-After``) for all of them. Nodes can
+    share a budget through a network filesystem whose ``flock`` is coherent.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        max_rps: float,
+        burst: float = 1.0,
+        *,
+        min_rps: float = 0.5,
+        decrease: float = 0.5,
+        increase: float = 0.1,
+        name: str = "",
+    ) -> None:
+        if fcntl is None:
+            raise RuntimeError("SharedRateLimiter requires fcntl.flock (POSIX).")
+        super().__init__(max_rps, burst)
+        self._path = path
+        self._ceiling = self._max_rps
+        self._min_rps = min(max(min_rps, 0.1), self._ceiling)
+        self._decrease = decrease
+        self._increase = increase
+        self._name = name
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+    @contextmanager
+    def _state(self) -> Iterator[dict[str, float]]:
+        with self._lock, self._path.open("a+", encoding="utf-8") as handle:
+            fcntl.flock(handle, fcntl.LOCK_EX)
+            try:
+                handle.seek(0)
+                try:
+                    stored = json.loads(handle.read() or "{}")
+                except json.JSONDecodeError:
+                    stored = {}
+                now = time.time()
+                rate = min(float(stored.get("rate", self._ceiling)), self._ceiling)
+                tokens = float(stored.get("tokens", self._capacity))
+                elapsed = max(0.0, now - float(stored.get("updated", now)))
+                state = {
+                    "rate": rate,
+                    "tokens": min(self._capacity, tokens + elapsed * rate),
+                    "updated": now,
+                    "cooldown_until": float(stored.get("cooldown_until", 0.0)),
+                }
+                yield state
+                handle.seek(0)
+                handle.truncate()
+                handle.write(json.dumps(state))
+                handle.flush()
+            finally:
+                fcntl.flock(handle, fcntl.LOCK_UN)
+
+    @property
+    def max_rps(self) -> float:
+        with self._state() as state:
+            return state["rate"]
+
+    @property
+    def ceiling(self) -> float:
+        return self._ceiling
+
+    def set_rate(self, max_rps: float) -> None:
+        self._ceiling = max(max_rps, 0.1)
+        self._min_rps = min(self._min_rps, self._ceiling)
+        with self._state() as state:
+            state["rate"] = min(state["rate"], self._ceiling)
+
+    def acquire(self) -> None:
+        with self._state() as state:
+            state["tokens"] -= 1.0
+            wait = -state["tokens"] / state["rate"] if state["tokens"] < 0 else 0.0
+        if wait > 0:
+            time.sleep(wait)
+
+    def on_success(self) -> None:
+        with self._state() as state:
+            if state["rate"] >= self._ceiling:
+                return
+            previous = state["rate"]
+            state["rate"] = min(self._ceiling, previous + self._increase / previous)
+            rate = state["rate"]
+        if int(rate * 2) != int(previous * 2) or rate >= self._ceiling:
+            LOGGER.info("Shared rate limit for %s raised to %.2f req/s", self._name or "host", rate)
+
+    def on_throttle(self, retry_after: float | None = None) -> None:
+        with self._state() as state:
+            # As in AdaptiveRateLimiter, one decrease per refill interval (or
+            # Retry-After pause) however many in-flight requests were throttled.
+            if state["updated"] < state.get("cooldown_until", 0.0):
+                return
+            previous = state["rate"]
+            state["rate"] = max(self._min_rps, previous * self._decrease)
+            # Borrowing Retry-After worth of tokens queues every process behind
+            # the pause without a separate "blocked until" field.
+            state["tokens"] = min(state["tokens"], 0.0) - (retry_after or 0.0) * state["rate"]
+            state["cooldown_until"] = state["updated"] + max(
+                1.0 / state["rate"], retry_after or 0.0
+            )
+            rate = state["rate"]
+        LOGGER.warning(
+            "Throttled by %s: shared rate %.2f -> %.2f req/s%s",
+            self._name or "host",
+            previous,
+            rate,
+            f", pausing {retry_after:.1f}s for Retry-After" if retry_after else "",
+        )
@@ -0,0 +1,374 @@
+"""Local record/replay stand-in for the SEC, EPA and USAspending hosts."""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+import hashlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import mimetypes
+import os
+from pathlib import Path
+import random
+import threading
+import time
+from typing import Any, Self
+from urllib.parse import urlsplit
+
+import httpx
+
+_FORWARDED_HEADERS = ("user-agent", "accept", "content-type")
+_RECORDED_HEADERS = ("content-type", "etag", "last-modified")
+
+
+@dataclass
+class StandinOptions:
+    latency_seconds: float = 0.0
+    max_requests_per_second: float | None = None
+    retry_after_seconds: float = 1.0
+    failure_rate: float = 0.0
+    truncate_rate: float = 0.0
+    allow_head: bool = True
+    # Start 206 bodies this many bytes past the requested offset, like a broken cache.
+    range_shift: int = 0
+    record: bool = False
+    seed: int = 0
+
+
+@dataclass
+class StandinStats:
+    requests: int = 0
+    statuses: dict[int, int] = field(default_factory=dict)
+    methods: dict[str, int] = field(default_factory=dict)
+    bytes_sent: int = 0
+    recorded: int = 0
+    truncated: int = 0
+    max_in_flight: int = 0
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "statuses": {str(k): v for k, v in sorted(self.statuses.items())},
+            "methods": dict(sorted(self.methods.items())),
+            "bytes_sent": self.bytes_sent,
+            "recorded": self.recorded,
+            "truncated": self.truncated,
+            "max_in_flight": self.max_in_flight,
+        }
+
+
+def _digest(payload: bytes) -> str:
+    return hashlib.sha256(payload).hexdigest()[:16]
+
+
+def cassette_path(
+    cassette_dir: Path, method: str, host: str, path: str, query: str = "", body: bytes = b""
+) -> Path:
+    """Map a request onto its file in the cassette directory.
+
+    ``https://data.sec.gov/submissions/CIK0000320193.json`` is stored at
+    ``<cassette>/data.sec.gov/submissions/CIK0000320193.json``; query strings
+    and POST bodies (USAspending pages) become a short hash suffix.
+    """
+    relative = path.lstrip("/")
+    if not relative or relative.endswith("/"):
+        relative += "index"
+    if query:
+        relative += f"__q{_digest(query.encode('utf-8'))}"
+    if method == "POST":
+        relative += f"__post{_digest(body)}"
+    return cassette_dir / host / relative
+
+
+def _headers_path(path: Path) -> Path:
+    return path.with_name(path.name + ".headers.json")
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    # A per-thread temporary name keeps concurrent misses for one URL apart.
+    tmp_path = path.with_name(f"{path.name}.{threading.get_ident()}.tmp")
+    tmp_path.write_bytes(data)
+    os.replace(tmp_path, path)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: _StandinHTTPServer
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args: object) -> None:
+        pass
+
+    def do_GET(self) -> None:
+        self._serve("GET")
+
+    def do_HEAD(self) -> None:
+        self._serve("HEAD")
+
+    def do_POST(self) -> None:
+        self._serve("POST")
+
+    def _send_empty(self, status: int, headers: dict[str, str] | None = None) -> None:
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+        self.server.count(status, 0)
+
+    def _serve(self, method: str) -> None:
+        self.server.enter(method)
+        try:
+            self._respond(method)
+        finally:
+            self.server.leave()
+
+    def _respond(self, method: str) -> None:
+        standin = self.server
+        options = standin.options
+        body = b""
+        if method == "POST":
+            body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        if options.latency_seconds:
+            time.sleep(options.latency_seconds)
+
+        retry_after = {"Retry-After": f"{options.retry_after_seconds:g}"}
+        if not standin.take_token():
+            self._send_empty(429, retry_after)
+            return
+        if standin.roll(options.failure_rate):
+            self._send_empty(503, retry_after)
+            return
+        if method == "HEAD" and not options.allow_head:
+            self._send_empty(405, {"Allow": "GET, POST"})
+            return
+
+        split = urlsplit(self.path)
+        host, _, rest = split.path.lstrip("/").partition("/")
+        target = cassette_path(standin.cassette_dir, method, host, "/" + rest, split.query, body)
+        if not target.exists():
+            if not (options.record and host):
+                self._send_empty(404)
+                return
+            # HEAD responses carry no body: record the GET and answer from it.
+            record_method = "GET" if method == "HEAD" else method
+            status = standin.record(
+                record_method, host, rest, split.query, body, self.headers, target
+            )
+            if status >= 400:
+                self._send_empty(status)
+                return
+
+        payload = target.read_bytes()
+        stored: dict[str, str] = {}
+        if _headers_path(target).exists():
+            stored = json.loads(_headers_path(target).read_text(encoding="utf-8"))
+        etag = stored.get("etag") or f'"{_digest(payload)}"'
+        content_type = (
+            stored.get("content-type")
+            or mimetypes.guess_type(target.name)[0]
+            or "application/octet-stream"
+        )
+        if self.headers.get("If-None-Match") == etag:
+            self._send_empty(304, {"ETag": etag})
+            return
+
+        status = 200
+        start, end = 0, len(payload) - 1
+        requested = self.headers.get("Range", "")
+        if method == "GET" and requested.startswith("bytes="):
+            first, _, last = requested[len("bytes=") :].partition("-")
+            try:
+                start = int(first)
+                end = min(int(last), end) if last else end
+            except ValueError:
+                start, end = 0, len(payload) - 1
+            if start >= len(payload):
+                self._send_empty(416, {"Content-Range": f"bytes */{len(payload)}"})
+                return
+            status = 206 if (start, end) != (0, len(payload) - 1) else 200
+            if status == 206 and options.range_shift:
+                start = min(start + options.range_shift, end)
+        chunk = payload[start : end + 1]
+
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(chunk)))
+        self.send_header("ETag", etag)
+        self.send_header("Accept-Ranges", "bytes")
+        if stored.get("last-modified"):
+            self.send_header("Last-Modified", stored["last-modified"])
+        if status == 206:
+            self.send_header("Content-Range", f"bytes {start}-{end}/{len(payload)}")
+        self.end_headers()
+        if method == "HEAD":
+            standin.count(status, 0)
+            return
+        if len(chunk) > 1 and standin.roll(options.truncate_rate):
+            # Promise the full length, send half and drop the connection.
+            chunk = chunk[: len(chunk) // 2]
+            self.close_connection = True
+            standin.count(status, len(chunk), truncated=True)
+        else:
+            standin.count(status, len(chunk))
+        self.wfile.write(chunk)
+
+
+class _StandinHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], cassette_dir: Path, options: StandinOptions):
+        super().__init__(address, _Handler)
+        self.cassette_dir = cassette_dir
+        self.options = options
+        self.stats = StandinStats()
+        self._lock = threading.Lock()
+        self._rng = random.Random(options.seed)
+        self._tokens = 1.0
+        self._updated = time.monotonic()
+        self._upstream: httpx.Client | None = None
+        self._in_flight = 0
+
+    def enter(self, method: str) -> None:
+        with self._lock:
+            self.stats.methods[method] = self.stats.methods.get(method, 0) + 1
+            self._in_flight += 1
+            self.stats.max_in_flight = max(self.stats.max_in_flight, self._in_flight)
+
+    def leave(self) -> None:
+        with self._lock:
+            self._in_flight -= 1
+
+    def take_token(self) -> bool:
+        rate = self.options.max_requests_per_second
+        if not rate:
+            return True
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(1.0, self._tokens + (now - self._updated) * rate)
+            self._updated = now
+            if self._tokens < 1.0:
+                return False
+            self._tokens -= 1.0
+            return True
+
+    def roll(self, probability: float) -> bool:
+        if probability <= 0:
+            return False
+        with self._lock:
+            return self._rng.random() < probability
+
+    def count(self, status: int, sent: int, truncated: bool = False) -> None:
+        with self._lock:
+            self.stats.requests += 1
+            self.stats.statuses[status] = self.stats.statuses.get(status, 0) + 1
+            self.stats.bytes_sent += sent
+            self.stats.truncated += int(truncated)
+
+    def record(
+        self,
+        method: str,
+        host: str,
+        rest: str,
+        query: str,
+        body: bytes,
+        headers: Any,
+        target: Path,
+    ) -> int:
+        with self._lock:
+            if self._upstream is None:
+                self._upstream = httpx.Client(timeout=60.0, follow_redirects=True)
+            upstream = self._upstream
+        url = f"https://{host}/{rest}" + (f"?{query}" if query else "")
+        forwarded = {name: headers[name] for name in _FORWARDED_HEADERS if headers.get(name)}
+        response = upstream.request(method, url, content=body or None, headers=forwarded)
+        if response.status_code >= 400:
+            return response.status_code
+        target.parent.mkdir(parents=True, exist_ok=True)
+        recorded = {
+            name: response.headers[name] for name in _RECORDED_HEADERS if name in response.headers
+        }
+        # Headers first: a cassette body is only ever replayed with its headers.
+        _write_atomic(_headers_path(target), json.dumps(recorded, sort_keys=True).encode("utf-8"))
+        _write_atomic(target, response.content)
+        with self._lock:
+            self.stats.recorded += 1
+        return response.status_code
+
+    def server_close(self) -> None:
+        super().server_close()
+        if self._upstream is not None:
+            self._upstream.close()
+
+
+class StandinServer:
+    """Serve a cassette directory over HTTP with injectable latency and faults.
+
+    Requests arrive as ``/<host>/<path>``; point the download clients at
+    :attr:`url` (``runtime.http_standin_url``) and they are rewritten that way.
+    With ``record`` enabled, misses are fetched from the real host and saved.
+    """
+
+    def __init__(
+        self,
+        cassette_dir: Path,
+        options: StandinOptions | None = None,
+        *,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ) -> None:
+        self._server = _StandinHTTPServer((host, port), cassette_dir, options or StandinOptions())
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def options(self) -> StandinOptions:
+        return self._server.options
+
+    @property
+    def stats(self) -> StandinStats:
+        return self._server.stats
+
+    def serve_forever(self) -> None:
+        self._server.serve_forever()
+
+    def start(self) -> Self:
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="http-standin", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._server.server_close()
+
+    def __enter__(self) -> Self:
+        return self.start()
+
+    def __exit__(self, *exc: object) -> None:
+        self.stop()
+
+
+class StandinTransport(httpx.BaseTransport):
+    """Send every request to the stand-in as ``<standin>/<host>/<path>``."""
+
+    def __init__(self, standin_url: str, limits: httpx.Limits | None = None) -> None:
+        self._base = httpx.URL(standin_url)
+        self._inner = httpx.HTTPTransport(limits=limits or httpx.Limits())
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        original = request.url
+        request.url = self._base.copy_with(
+            raw_path=f"/{original.host}".encode("ascii") + original.raw_path
+        )
+        request.headers["Host"] = self._base.netloc.decode("ascii")
+        return self._inner.handle_request(request)
+
+    def close(self) -> None:
+        self._inner.close()
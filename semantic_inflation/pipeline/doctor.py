@@ -10,6 +10,7 @@ from semantic_inflation.pipeline.io import write_json
 from semantic_inflation.pipeline.state import (
     StageResult,
     compute_inputs_hash,
+    stage_config,
     stage_manifest_path,
     write_stage_manifest,
 )
@@ -221,7 +222,7 @@ def run_doctor(context: PipelineContext, force: bool = False) -> StageResult:
         "errors": errors,
     }
 
-    inputs_hash = compute_inputs_hash({"stage": "doctor", "config": settings.model_dump(mode="json")})
+    inputs_hash = compute_inputs_hash({"stage": "doctor", "config": stage_config(settings)})
     result = StageResult(
         name="doctor",
         status="completed" if not errors else "failed",
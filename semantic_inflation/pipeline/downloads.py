@@ -1,8 +1,48 @@
 from __future__ import annotations
 
+from contextlib import AbstractContextManager
 from pathlib import Path
 
-from semantic_inflation.net.download import DownloadResult, download_file, sha256_bytes, sha256_file
+from semantic_inflation.config import Settings
+from semantic_inflation.net.download import (
+    DownloadResult,
+    append_manifest,
+    check_url,
+    client_pool,
+    download_file,
+    get_client,
+    manifest_store_for,
+    sha256_bytes,
+    sha256_file,
+)
+from semantic_inflation.net.materialize import MaterializeResult, materialize_file
+
+# Stage modules import the network helpers through this module.
+__all__ = [
+    "DownloadResult",
+    "MaterializeResult",
+    "append_manifest",
+    "check_url",
+    "client_pool",
+    "download_file",
+    "download_with_cache",
+    "get_client",
+    "manifest_store_for",
+    "materialize_file",
+    "network_session",
+    "sha256_bytes",
+    "sha256_file",
+]
+
+
+def network_session(settings: Settings) -> AbstractContextManager[None]:
+    """Pooled clients and per-host rate limits for one stage's downloads."""
+    return client_pool(
+        settings.sec.concurrent_downloads,
+        host_limits=settings.runtime.host_max_requests_per_second,
+        shared_limit_dir=settings.runtime.shared_rate_limit_dir,
+        standin_url=settings.runtime.http_standin_url,
+    )
 
 
 def download_with_cache(
@@ -12,6 +52,9 @@ def download_with_cache(
     max_rps: float,
     log_path: Path,
     timeout: float = 60.0,
+    *,
+    revalidate: bool = False,
+    max_age_hours: float | None = None,
 ) -> DownloadResult:
     return download_file(
         url,
@@ -20,4 +63,6 @@ def download_with_cache(
         max_rps=max_rps,
         manifest_path=log_path,
         timeout=timeout,
+        revalidate=revalidate,
+        max_age=max_age_hours * 3600 if max_age_hours is not None else None,
     )
@@ -8,12 +8,13 @@ import pandas as pd
 
 from semantic_inflation.epa.frs import build_ghgrp_to_frs, parse_frs_program_links
 from semantic_inflation.pipeline.context import PipelineContext
-from semantic_inflation.pipeline.downloads import download_with_cache, sha256_file
+from semantic_inflation.pipeline.downloads import download_with_cache, network_session, sha256_file
 from semantic_inflation.pipeline.io import write_json
 from semantic_inflation.pipeline.state import (
     StageResult,
     compute_inputs_hash,
     should_skip_stage,
+    stage_config,
     stage_manifest_path,
     write_stage_manifest,
 )
@@ -242,10 +243,12 @@ def download_echo(context: PipelineContext, force: bool = False) -> StageResult:
     settings = context.settings
     output_path = settings.paths.processed_dir / "echo_facility_year.parquet"
     inputs_hash = compute_inputs_hash(
-        {"stage": "echo_download", "config": settings.model_dump(mode="json")}
+        {"stage": "echo_download", "config": stage_config(settings)}
     )
     manifest_path = stage_manifest_path(settings.paths.outputs_dir, "echo_download")
-    if should_skip_stage(manifest_path, [output_path], inputs_hash, force):
+    if should_skip_stage(
+        manifest_path, [output_path], inputs_hash, force or settings.runtime.refresh
+    ):
         return StageResult(
             name="echo_download",
             status="skipped",
@@ -273,8 +276,13 @@ def download_echo(context: PipelineContext, force: bool = False) -> StageResult:
         raw_dir = settings.paths.raw_dir / "epa" / "echo"
         case_zip = raw_dir / "case_downloads.zip"
         frs_zip = raw_dir / "frs_downloads.zip"
-        download_with_cache(case_url, case_zip, headers, rps, log_path)
-        download_with_cache(frs_url, frs_zip, headers, rps, log_path)
+        cache_policy = {
+            "revalidate": settings.runtime.refresh,
+            "max_age_hours": settings.pipeline.echo.max_age_hours,
+        }
+        with network_session(settings):
+            download_with_cache(case_url, case_zip, headers, rps, log_path, **cache_policy)
+            download_with_cache(frs_url, frs_zip, headers, rps, log_path, **cache_policy)
 
         df, frs_id_source = _parse_case_downloads(
             case_zip,
@@ -1,103 +1,294 @@
 from __future__ import annotations
 
-import csv
+from concurrent.futures import Executor, ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
+from functools import partial
 from pathlib import Path
-from typing import Any
+import time
+from typing import Any, Callable, Iterator
 
 import pandas as pd
 
+from semantic_inflation.config import Settings
 from semantic_inflation.pipeline.context import PipelineContext
+from semantic_inflation.pipeline.filings_index import read_filings_index
+from semantic_inflation.pipeline.guarded import GuardedOutcome, GuardedPool, run_guarded
 from semantic_inflation.pipeline.io import write_json
+from semantic_inflation.pipeline.scheduling import ScheduleReport, SizedJob, run_scheduled
 from semantic_inflation.pipeline.state import (
     StageResult,
     compute_inputs_hash,
     should_skip_stage,
+    stage_config,
     stage_manifest_path,
     write_stage_manifest,
 )
+from semantic_inflation.pipeline.telemetry import peak_rss_bytes, reset_peak_rss, summarize_timings
 from semantic_inflation.text.features import compute_features_from_file
 
+_TELEMETRY_KEY = "_telemetry"
+_JOB_COLUMNS = ["cik", "filing_year", "file_path", "primary_document"]
+
+
+@dataclass(frozen=True)
+class FeatureJob:
+    cik: str
+    filing_year: int
+    file_path: Path
+
 
 def _resolve_path(path: str | Path, repo_root: Path) -> Path:
     p = Path(path)
     return p if p.is_absolute() else repo_root / p
 
 
-def compute_sec_features(context: PipelineContext, force: bool = False) -> StageResult:
+def _feature_options(settings: Settings) -> dict[str, Any]:
+    return {
+        "dictionary_version": settings.text.dictionary_version,
+        "min_sentence_chars": settings.text.min_sentence_chars,
+        "html_extractor": settings.text.html.extractor,
+        "drop_hidden": settings.text.html.drop_hidden,
+        "drop_ix_hidden": settings.text.html.drop_ix_hidden,
+        "unwrap_ix_tags": settings.text.html.unwrap_ix_tags,
+        "keep_tables": settings.text.html.keep_tables,
+        "table_cell_sep": settings.text.html.table_cell_sep,
+        "table_row_sep": settings.text.html.table_row_sep,
+    }
+
+
+def load_feature_jobs(
+    context: PipelineContext, *, require_exists: bool = True
+) -> list[FeatureJob]:
     settings = context.settings
-    output_path = settings.paths.processed_dir / "sec_features.parquet"
-    inputs_hash = compute_inputs_hash(
-        {"stage": "sec_features", "config": settings.model_dump(mode="json")}
-    )
-    manifest_path = stage_manifest_path(settings.paths.outputs_dir, "sec_features")
-    if should_skip_stage(manifest_path, [output_path], inputs_hash, force):
-        return StageResult(
-            name="sec_features",
-            status="skipped",
-            outputs=[str(output_path)],
-            inputs_hash=inputs_hash,
-            stats={"skipped": True},
+    index_path = _resolve_path(settings.pipeline.sec.filings_index_path, context.repo_root)
+    jobs: list[FeatureJob] = []
+    for row in read_filings_index(index_path).records(_JOB_COLUMNS):
+        cik = row["cik"]
+        filing_year = row["filing_year"]
+        primary_document = row["primary_document"] or f"{cik}-{filing_year}.html"
+        if row["file_path"]:
+            file_path = _resolve_path(row["file_path"], context.repo_root)
+        else:
+            filings_dir = settings.paths.raw_dir / "sec" / "filings"
+            file_path = filings_dir / cik / str(filing_year) / primary_document
+        if require_exists and not file_path.exists():
+            raise FileNotFoundError(f"Missing SEC filing: {file_path}")
+        jobs.append(FeatureJob(cik=cik, filing_year=filing_year, file_path=file_path))
+    return jobs
+
+
+def _manifest_sizes(manifest_path: Path) -> dict[str, int]:
+    if not manifest_path.exists():
+        return {}
+    try:
+        manifest = pd.read_parquet(manifest_path, columns=["local_path", "bytes"])
+    except (OSError, ValueError, KeyError):
+        return {}
+    manifest = manifest.dropna()
+    return dict(zip(manifest["local_path"].astype(str), manifest["bytes"].astype(int)))
+
+
+def _sized_jobs(jobs: list[FeatureJob], manifest_path: Path) -> list[SizedJob[FeatureJob]]:
+    known = _manifest_sizes(manifest_path)
+    sized: list[SizedJob[FeatureJob]] = []
+    for key, job in enumerate(jobs):
+        size = known.get(str(job.file_path))
+        if size is None:
+            size = job.file_path.stat().st_size
+        sized.append(SizedJob(key=key, size=size, payload=job))
+    return sized
+
+
+def _compute_job(
+    job: FeatureJob, options: dict[str, Any], telemetry: bool = False
+) -> dict[str, Any]:
+    if not telemetry:
+        result = compute_features_from_file(job.file_path, **options)
+    else:
+        reset_peak_rss()
+        timings: dict[str, Any] = {}
+        start = time.perf_counter()
+        result = compute_features_from_file(job.file_path, timings=timings, **options)
+        timings["total_seconds"] = time.perf_counter() - start
+        timings["peak_rss_bytes"] = peak_rss_bytes()
+        result[_TELEMETRY_KEY] = timings
+    result["cik"] = job.cik
+    result["filing_year"] = job.filing_year
+    result["si_simple"] = float(result.get("A_share") or 0) - float(result.get("Q_share") or 0)
+    return result
+
+
+@contextmanager
+def feature_runner(
+    settings: Settings, workers: int
+) -> Iterator[tuple[Callable[[FeatureJob], Any], Callable[[int], Executor] | None]]:
+    feature_settings = settings.pipeline.features
+    options = _feature_options(settings)
+    compute = partial(_compute_job, telemetry=feature_settings.telemetry)
+    if not feature_settings.guarded:
+        yield partial(compute, options=options), None
+        return
+    fallback_options = None
+    fallback = feature_settings.fallback_extractor
+    if fallback and fallback != options["html_extractor"]:
+        fallback_options = {**options, "html_extractor": fallback}
+    # Documents run inside guarded child processes, so threads are enough to
+    # supervise them.
+    with GuardedPool(workers, feature_settings.memory_limit_mb) as pool:
+        yield (
+            partial(
+                run_guarded,
+                compute,
+                options=options,
+                fallback_options=fallback_options,
+                pool=pool,
+                timeout_seconds=feature_settings.timeout_seconds,
+            ),
+            lambda n: ThreadPoolExecutor(max_workers=n),
         )
 
-    index_path = _resolve_path(settings.pipeline.sec.filings_index_path, context.repo_root)
-    rows: list[dict[str, Any]] = []
 
-    with index_path.open("r", encoding="utf-8") as handle:
-        reader = csv.DictReader(handle)
-        for row in reader:
-            cik = (row.get("cik") or "").strip()
-            if not cik:
-                continue
-            filing_year = int(row.get("filing_year") or 0)
-            source_path = row.get("file_path")
-            primary_document = row.get("primary_document") or f"{cik}-{filing_year}.html"
-            if source_path:
-                file_path = _resolve_path(source_path, context.repo_root)
-            else:
-                file_path = (
-                    settings.paths.raw_dir / "sec" / "filings" / cik / str(filing_year) / primary_document
-                )
-            if not file_path.exists():
-                raise FileNotFoundError(f"Missing SEC filing: {file_path}")
-
-            result = compute_features_from_file(
-                file_path,
-                dictionary_version=settings.text.dictionary_version,
-                min_sentence_chars=settings.text.min_sentence_chars,
-                html_extractor=settings.text.html.extractor,
-                drop_hidden=settings.text.html.drop_hidden,
-                drop_ix_hidden=settings.text.html.drop_ix_hidden,
-                unwrap_ix_tags=settings.text.html.unwrap_ix_tags,
-                keep_tables=settings.text.html.keep_tables,
-                table_cell_sep=settings.text.html.table_cell_sep,
-                table_row_sep=settings.text.html.table_row_sep,
-            )
-            result["cik"] = cik
-            result["filing_year"] = filing_year
-            result["si_simple"] = float(result.get("A_share") or 0) - float(
-                result.get("Q_share") or 0
+def collect_feature_rows(
+    jobs: list[SizedJob[FeatureJob]], results: list[Any]
+) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
+    rows: list[dict[str, Any]] = []
+    failures: list[dict[str, Any]] = []
+    for job, outcome in zip(sorted(jobs, key=lambda j: j.key), results):
+        if not isinstance(outcome, GuardedOutcome):
+            rows.append(outcome)
+            continue
+        if outcome.attempts:
+            failures.append(
+                {
+                    "cik": job.payload.cik,
+                    "filing_year": job.payload.filing_year,
+                    "path": str(job.payload.file_path),
+                    "bytes": job.size,
+                    "recovered": not outcome.failed,
+                    "attempts": outcome.attempts,
+                }
             )
-            rows.append(result)
+        if outcome.result is not None:
+            rows.append(outcome.result)
+    return rows, failures
 
+
+def features_inputs_hash(context: PipelineContext) -> str:
+    return compute_inputs_hash(
+        {"stage": "sec_features", "config": stage_config(context.settings)}
+    )
+
+
+def features_output_path(context: PipelineContext) -> Path:
+    return context.settings.paths.processed_dir / "sec_features.parquet"
+
+
+def feature_workers(settings: Settings) -> int:
+    return settings.pipeline.features.max_workers or settings.runtime.max_workers
+
+
+def _split_telemetry(rows: list[dict[str, Any]]) -> pd.DataFrame:
+    records: list[dict[str, Any]] = []
+    for row in rows:
+        timings = row.pop(_TELEMETRY_KEY, None)
+        if timings is None:
+            continue
+        records.append(
+            {
+                "cik": row["cik"],
+                "filing_year": row["filing_year"],
+                "input_path": row.get("input_path"),
+                "html_extractor": row.get("html_extractor"),
+                **timings,
+            }
+        )
+    return pd.DataFrame(records)
+
+
+def finalize_features(
+    context: PipelineContext,
+    rows: list[dict[str, Any]],
+    failures: list[dict[str, Any]],
+    schedule: ScheduleReport,
+    inputs_hash: str,
+) -> StageResult:
+    settings = context.settings
+    output_path = features_output_path(context)
+    timings = _split_telemetry(rows)
     df = pd.DataFrame(rows)
     output_path.parent.mkdir(parents=True, exist_ok=True)
     df.to_parquet(output_path, index=False)
+    outputs = [output_path]
 
     qc_payload = {
         "rows": len(df),
         "columns": list(df.columns),
         "output": str(output_path),
+        "schedule": schedule.to_dict(),
+        "guarded": settings.pipeline.features.guarded,
     }
+    if settings.pipeline.features.telemetry:
+        timings_path = settings.paths.processed_dir / "sec_features_timings.parquet"
+        timings.to_parquet(timings_path, index=False)
+        outputs.append(timings_path)
+        qc_payload["telemetry"] = summarize_timings(timings, schedule.wall_seconds)
+        qc_payload["telemetry"]["output"] = str(timings_path)
+    warnings: list[str] = []
+    if settings.pipeline.features.guarded:
+        failures_path = settings.paths.outputs_dir / "qc" / "sec_features_failures.json"
+        write_json(failures_path, {"failures": failures})
+        dropped = sum(1 for failure in failures if not failure["recovered"])
+        qc_payload["limit_failures"] = len(failures)
+        qc_payload["dropped_filings"] = dropped
+        qc_payload["failures_path"] = str(failures_path)
+        if dropped:
+            warnings.append(
+                f"{dropped} filings exceeded resource limits with every extractor; "
+                f"see {failures_path}."
+            )
     qc_path = settings.paths.outputs_dir / "qc" / "sec_features.json"
     write_json(qc_path, qc_payload)
 
     result = StageResult(
         name="sec_features",
         status="completed",
-        outputs=[str(output_path)],
+        outputs=[str(p) for p in outputs],
         qc_path=str(qc_path),
+        warnings=warnings,
         stats=qc_payload,
         inputs_hash=inputs_hash,
     )
-    write_stage_manifest(manifest_path, result)
+    write_stage_manifest(stage_manifest_path(settings.paths.outputs_dir, "sec_features"), result)
     return result
+
+
+def compute_sec_features(context: PipelineContext, force: bool = False) -> StageResult:
+    settings = context.settings
+    output_path = features_output_path(context)
+    inputs_hash = features_inputs_hash(context)
+    manifest_path = stage_manifest_path(settings.paths.outputs_dir, "sec_features")
+    if should_skip_stage(manifest_path, [output_path], inputs_hash, force):
+        return StageResult(
+            name="sec_features",
+            status="skipped",
+            outputs=[str(output_path)],
+            inputs_hash=inputs_hash,
+            stats={"skipped": True},
+        )
+
+    jobs = _sized_jobs(
+        load_feature_jobs(context),
+        settings.paths.raw_dir / "sec" / "filings_manifest.parquet",
+    )
+    workers = feature_workers(settings)
+    with feature_runner(settings, workers) as (func, executor_factory):
+        results, schedule = run_scheduled(
+            jobs,
+            func,
+            workers=workers,
+            ordering=settings.pipeline.features.scheduler,
+            executor_factory=executor_factory,
+        )
+    rows, failures = collect_feature_rows(jobs, results)
+    return finalize_features(context, rows, failures, schedule, inputs_hash)
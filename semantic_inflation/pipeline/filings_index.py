@@ -0,0 +1,171 @@
+"""Typed SEC filings index shared by the index, download and feature stages.
+
+``sec index`` stores the index as a Parquet table sorted by
+``(cik, filing_year)`` next to the configured CSV, which is kept as a
+plain-text export in the same order. Readers go through
+:func:`read_filings_index`, which prefers the Parquet table, falls back to
+hand-written CSV indexes (such as the fixtures) in their own row order, and
+parses each file once per process.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from pathlib import Path
+import threading
+from typing import Any, Iterable
+
+import pandas as pd
+
+INDEX_COLUMNS = [
+    "cik",
+    "filing_year",
+    "source_url",
+    "file_path",
+    "form",
+    "filing_date",
+    "report_date",
+    "accession_number",
+    "primary_document",
+    "archive_dir",
+    "company_name_sec",
+]
+_SORT_KEY = ["cik", "filing_year"]
+
+_CACHE: dict[tuple[str, int, int], FilingsIndex] = {}
+_CACHE_LOCK = threading.Lock()
+
+
+def parquet_path(path: Path) -> Path:
+    """Return the Parquet table stored alongside the index at ``path``."""
+    return path.with_suffix(".parquet")
+
+
+def _csv_path(path: Path) -> Path:
+    return path.with_suffix(".csv") if path.suffix == ".parquet" else path
+
+
+def _normalize(frame: pd.DataFrame, *, sort: bool) -> pd.DataFrame:
+    """Coerce an index frame to the typed layout: string columns with ``None``
+    for blanks, zero-padded CIKs and an int64 ``filing_year``.
+
+    Rows without a CIK are dropped and a blank year reads as 0; a year that is
+    not a number raises ``ValueError``. ``sort`` orders rows by
+    ``(cik, filing_year)``; otherwise the input order is kept.
+    """
+    frame = frame.copy()
+    for column in INDEX_COLUMNS:
+        if column not in frame.columns:
+            frame[column] = None
+    extras = [column for column in frame.columns if column not in INDEX_COLUMNS]
+    frame = frame[INDEX_COLUMNS + extras]
+    for column in frame.columns:
+        if column == "filing_year":
+            continue
+        values = frame[column].astype("string").str.strip().replace("", pd.NA)
+        frame[column] = values.astype(object).where(values.notna(), None)
+    frame = frame[frame["cik"].notna()]
+    frame["cik"] = frame["cik"].str.zfill(10)
+    years = frame["filing_year"].astype("string").str.strip().replace("", "0").fillna("0")
+    numeric = pd.to_numeric(years, errors="coerce")
+    if numeric.isna().any():
+        position = int(numeric.isna().to_numpy().argmax())
+        row = frame.index[position]
+        raise ValueError(
+            f"Invalid filing_year {years.iloc[position]!r} in filings index row {row + 1}"
+        )
+    frame["filing_year"] = numeric.astype("int64")
+    if sort:
+        frame = frame.sort_values(_SORT_KEY, kind="stable")
+    return frame.reset_index(drop=True)
+
+
+@dataclass
+class FilingsIndex:
+    """An in-memory filings index with column projection and per-key lookup."""
+
+    frame: pd.DataFrame
+    _positions: dict[tuple[str, int], int] | None = field(default=None, repr=False)
+
+    def __len__(self) -> int:
+        return len(self.frame)
+
+    @property
+    def columns(self) -> list[str]:
+        return list(self.frame.columns)
+
+    def project(self, columns: Iterable[str]) -> pd.DataFrame:
+        """Return only ``columns``; columns the index lacks come back as ``None``."""
+        columns = list(columns)
+        projected = self.frame.reindex(columns=columns)
+        return projected.astype(object).where(projected.notna(), None)
+
+    def records(self, columns: Iterable[str] | None = None) -> list[dict[str, Any]]:
+        frame = self.frame if columns is None else self.project(columns)
+        return frame.to_dict("records")
+
+    def lookup(self, cik: str, filing_year: int) -> dict[str, Any] | None:
+        """Return the row for ``(cik, filing_year)``, or ``None`` if it is absent."""
+        if self._positions is None:
+            positions: dict[tuple[str, int], int] = {}
+            for position, key in enumerate(
+                zip(self.frame["cik"], self.frame["filing_year"].tolist())
+            ):
+                positions.setdefault(key, position)
+            self._positions = positions
+        position = self._positions.get((str(cik).zfill(10), int(filing_year)))
+        if position is None:
+            return None
+        return self.frame.iloc[[position]].to_dict("records")[0]
+
+
+def _source(path: Path) -> Path:
+    csv_path = _csv_path(path)
+    table = parquet_path(csv_path)
+    if table.exists() and (
+        not csv_path.exists() or table.stat().st_mtime_ns >= csv_path.stat().st_mtime_ns
+    ):
+        return table
+    if csv_path.exists():
+        return csv_path
+    raise FileNotFoundError(f"Missing filings index: {path}")
+
+
+def read_filings_index(path: Path) -> FilingsIndex:
+    """Load the filings index at ``path`` (the configured CSV location).
+
+    The Parquet table is used unless the CSV was edited after it was written,
+    so CSV-only indexes keep working. Results are cached per file and
+    modification time, so every stage in a run shares one parse.
+    """
+    source = _source(Path(path))
+    stat = source.stat()
+    key = (str(source.resolve()), stat.st_mtime_ns, stat.st_size)
+    with _CACHE_LOCK:
+        cached = _CACHE.get(key)
+    if cached is not None:
+        return cached
+    if source.suffix == ".parquet":
+        frame = pd.read_parquet(source)
+    else:
+        # Hand-written CSV indexes keep their row order (it decides max_filings).
+        frame = _normalize(pd.read_csv(source, dtype=str, keep_default_na=False), sort=False)
+    index = FilingsIndex(frame)
+    with _CACHE_LOCK:
+        _CACHE.clear()
+        _CACHE[key] = index
+    return index
+
+
+def write_filings_index(rows: list[dict[str, Any]], path: Path) -> Path:
+    """Write ``rows`` as the CSV export at ``path`` and the sorted Parquet table.
+
+    The CSV is written first so the table is never older than it. Returns the
+    Parquet path.
+    """
+    frame = _normalize(pd.DataFrame(rows, columns=INDEX_COLUMNS), sort=True)
+    csv_path = _csv_path(Path(path))
+    table = parquet_path(csv_path)
+    csv_path.parent.mkdir(parents=True, exist_ok=True)
+    frame.to_csv(csv_path, index=False)
+    frame.to_parquet(table, index=False)
+    return table
@@ -8,17 +8,22 @@ import zipfile
 from urllib.parse import urljoin
 
 from bs4 import BeautifulSoup
-import httpx
 import pandas as pd
 
 from semantic_inflation.epa.frs import build_ghgrp_to_frs, parse_frs_program_links
 from semantic_inflation.pipeline.context import PipelineContext
-from semantic_inflation.pipeline.downloads import download_with_cache, sha256_file
+from semantic_inflation.pipeline.downloads import (
+    download_with_cache,
+    get_client,
+    network_session,
+    sha256_file,
+)
 from semantic_inflation.pipeline.io import write_json
 from semantic_inflation.pipeline.state import (
     StageResult,
     compute_inputs_hash,
     should_skip_stage,
+    stage_config,
     stage_manifest_path,
     write_stage_manifest,
 )
@@ -47,7 +52,7 @@ def _find_column(columns: list[str], keywords: list[str]) -> str | None:
 def resolve_ghgrp_urls(
     data_sets_page: str, data_summary_label: str, parent_label: str
 ) -> dict[str, str]:
-    response = httpx.get(data_sets_page, timeout=60.0)
+    response = get_client(data_sets_page).get(data_sets_page, timeout=60.0)
     response.raise_for_status()
     soup = BeautifulSoup(response.text, "html.parser")
     summary_url = None
@@ -308,14 +313,14 @@ def download_ghgrp(context: PipelineContext, force: bool = False) -> StageResult
         settings.paths.processed_dir / "ghgrp_facility_year_with_parent.parquet"
     )
     inputs_hash = compute_inputs_hash(
-        {"stage": "ghgrp_download", "config": settings.model_dump(mode="json")}
+        {"stage": "ghgrp_download", "config": stage_config(settings)}
     )
     manifest_path = stage_manifest_path(settings.paths.outputs_dir, "ghgrp_download")
     if should_skip_stage(
         manifest_path,
         [facility_output_path, parent_output_path, combined_output_path],
         inputs_hash,
-        force,
+        force or settings.runtime.refresh,
     ):
         return StageResult(
             name="ghgrp_download",
@@ -337,17 +342,6 @@ def download_ghgrp(context: PipelineContext, force: bool = False) -> StageResult
     else:
         if settings.runtime.offline:
             raise FileNotFoundError("GHGRP fixture missing while runtime.offline is true.")
-        data_summary_url = settings.pipeline.ghgrp.data_summary_url
-        parent_url = settings.pipeline.ghgrp.parent_companies_url
-        if not data_summary_url or not parent_url:
-            resolved = resolve_ghgrp_urls(
-                settings.pipeline.ghgrp.data_sets_page,
-                settings.pipeline.ghgrp.data_summary_label,
-                settings.pipeline.ghgrp.parent_companies_label,
-            )
-            data_summary_url = data_summary_url or resolved["data_summary"]
-            parent_url = parent_url or resolved["parent_companies"]
-
         headers = {"User-Agent": settings.sec.resolved_user_agent()}
         rps = min(settings.sec.max_requests_per_second, 10.0)
         log_path = settings.paths.raw_dir / "_manifests" / "ghgrp_downloads.jsonl"
@@ -356,34 +350,58 @@ def download_ghgrp(context: PipelineContext, force: bool = False) -> StageResult
         data_summary_zip = raw_dir / "data_summary_spreadsheets.zip"
         parent_companies_path = raw_dir / "reported_parent_companies.xlsb"
 
-        download_with_cache(data_summary_url, data_summary_zip, headers, rps, log_path)
-        download_with_cache(parent_url, parent_companies_path, headers, rps, log_path)
+        cache_policy = {
+            "revalidate": settings.runtime.refresh,
+            "max_age_hours": settings.pipeline.ghgrp.max_age_hours,
+        }
+        with network_session(settings):
+            data_summary_url = settings.pipeline.ghgrp.data_summary_url
+            parent_url = settings.pipeline.ghgrp.parent_companies_url
+            if not data_summary_url or not parent_url:
+                resolved = resolve_ghgrp_urls(
+                    settings.pipeline.ghgrp.data_sets_page,
+                    settings.pipeline.ghgrp.data_summary_label,
+                    settings.pipeline.ghgrp.parent_companies_label,
+                )
+                data_summary_url = data_summary_url or resolved["data_summary"]
+                parent_url = parent_url or resolved["parent_companies"]
 
-        suffixes = load_corp_suffixes(
-            _resolve_path(settings.dictionaries.corp_suffixes_path, context.repo_root)
-        )
-        parent_df = parse_ghgrp_parent_companies(parent_companies_path, suffixes)
-        facility_df = parse_ghgrp_facility_year(
-            data_summary_zip,
-            settings.project.start_year,
-            settings.project.end_year,
-            raw_dir / "unzipped",
-        )
+            download_with_cache(
+                data_summary_url, data_summary_zip, headers, rps, log_path, **cache_policy
+            )
+            download_with_cache(
+                parent_url, parent_companies_path, headers, rps, log_path, **cache_policy
+            )
 
-        frs_share = facility_df["frs_id"].notna().mean()
-        mapping_df = pd.DataFrame()
-        if frs_share < 0.8:
-            frs_zip = settings.paths.raw_dir / "epa" / "echo" / "frs_downloads.zip"
-            if not frs_zip.exists():
+            suffixes = load_corp_suffixes(
+                _resolve_path(settings.dictionaries.corp_suffixes_path, context.repo_root)
+            )
+            parent_df = parse_ghgrp_parent_companies(parent_companies_path, suffixes)
+            facility_df = parse_ghgrp_facility_year(
+                data_summary_zip,
+                settings.project.start_year,
+                settings.project.end_year,
+                raw_dir / "unzipped",
+            )
+
+            frs_share = facility_df["frs_id"].notna().mean()
+            mapping_df = pd.DataFrame()
+            if frs_share < 0.8:
+                frs_zip = settings.paths.raw_dir / "epa" / "echo" / "frs_downloads.zip"
                 echo_headers = {"User-Agent": settings.sec.resolved_user_agent()}
                 download_with_cache(
-                    settings.pipeline.echo.frs_downloads_url, frs_zip, echo_headers, rps, log_path
+                    settings.pipeline.echo.frs_downloads_url,
+                    frs_zip,
+                    echo_headers,
+                    rps,
+                    log_path,
+                    **cache_policy,
                 )
-            facility_df, mapping_df = _merge_frs_ids(facility_df, frs_zip)
-            mapping_path = settings.paths.processed_dir / "ghgrp_to_frs.parquet"
-            mapping_path.parent.mkdir(parents=True, exist_ok=True)
-            if not mapping_df.empty:
-                mapping_df.to_parquet(mapping_path, index=False)
+                facility_df, mapping_df = _merge_frs_ids(facility_df, frs_zip)
+                mapping_path = settings.paths.processed_dir / "ghgrp_to_frs.parquet"
+                mapping_path.parent.mkdir(parents=True, exist_ok=True)
+                if not mapping_df.empty:
+                    mapping_df.to_parquet(mapping_path, index=False)
 
     facility_output_path.parent.mkdir(parents=True, exist_ok=True)
     facility_df.to_parquet(facility_output_path, index=False)
@@ -0,0 +1,208 @@
+from __future__ import annotations
+
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from functools import partial
+import multiprocessing
+from multiprocessing.connection import Connection
+import queue
+import traceback
+from typing import Any, Callable, Iterator, Self
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - Windows has no setrlimit
+    resource = None  # type: ignore[assignment]
+
+# Limit breaches trigger a retry with the fallback extractor; plain errors do not.
+LIMIT_STATUSES = {"memory", "timeout", "crashed"}
+
+_PRELOAD = ["semantic_inflation.text.features"]
+
+
+@dataclass(frozen=True)
+class IsolatedAttempt:
+    status: str
+    value: Any = None
+    detail: str | None = None
+
+
+@dataclass
+class GuardedOutcome:
+    result: dict[str, Any] | None
+    attempts: list[dict[str, Any]] = field(default_factory=list)
+
+    @property
+    def failed(self) -> bool:
+        return self.result is None
+
+
+def _context() -> multiprocessing.context.BaseContext:
+    # A fork server avoids forking the (multi-threaded) supervising parent.
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        ctx = multiprocessing.get_context("forkserver")
+        ctx.set_forkserver_preload(_PRELOAD)
+        return ctx
+    return multiprocessing.get_context("spawn")
+
+
+def _apply_memory_limit(memory_limit_mb: int | None) -> None:
+    if not memory_limit_mb or resource is None:
+        return
+    limit = int(memory_limit_mb) * 1024 * 1024
+    _, hard = resource.getrlimit(resource.RLIMIT_AS)
+    if hard != resource.RLIM_INFINITY:
+        limit = min(limit, hard)
+    resource.setrlimit(resource.RLIMIT_AS, (limit, hard))
+
+
+def _worker_main(conn: Connection, memory_limit_mb: int | None) -> None:
+    _apply_memory_limit(memory_limit_mb)
+    conn.send("ready")
+    while True:
+        try:
+            task = conn.recv()
+        except EOFError:
+            break
+        if task is None:
+            break
+        func, payload = task
+        try:
+            conn.send(("ok", func(payload), None))
+        except MemoryError:
+            # The heap may be in a poor state; let the parent start a fresh worker.
+            conn.send(("memory", None, "MemoryError"))
+            break
+        except BaseException:
+            conn.send(("error", None, traceback.format_exc()))
+    conn.close()
+
+
+class GuardedWorker:
+    """A child process that runs one document at a time under resource limits.
+
+    The process is reused across documents and only replaced after it breaks a
+    limit, so start-up cost is paid once per worker rather than once per filing.
+    """
+
+    def __init__(self, memory_limit_mb: int | None) -> None:
+        self._memory_limit_mb = memory_limit_mb
+        self._ctx = _context()
+        self._process: multiprocessing.process.BaseProcess | None = None
+        self._conn: Connection | None = None
+
+    def _start(self) -> None:
+        parent_conn, child_conn = self._ctx.Pipe()
+        process = self._ctx.Process(
+            target=_worker_main,
+            args=(child_conn, self._memory_limit_mb),
+            daemon=True,
+        )
+        process.start()
+        child_conn.close()
+        if parent_conn.recv() != "ready":
+            raise RuntimeError("Guarded worker failed to start.")
+        self._process = process
+        self._conn = parent_conn
+
+    def _stop(self) -> None:
+        if self._process is not None:
+            if self._process.is_alive():
+                self._process.kill()
+            self._process.join()
+        if self._conn is not None:
+            self._conn.close()
+        self._process = None
+        self._conn = None
+
+    def run(
+        self,
+        func: Callable[[Any], Any],
+        payload: Any,
+        timeout_seconds: float,
+    ) -> IsolatedAttempt:
+        if self._process is None or not self._process.is_alive():
+            self._stop()
+            self._start()
+        assert self._conn is not None and self._process is not None
+        self._conn.send((func, payload))
+        if not self._conn.poll(timeout_seconds):
+            self._stop()
+            return IsolatedAttempt(
+                status="timeout", detail=f"exceeded {timeout_seconds}s wall-clock limit"
+            )
+        try:
+            status, value, detail = self._conn.recv()
+        except (EOFError, OSError):
+            self._process.join(5)
+            exitcode = self._process.exitcode
+            self._stop()
+            return IsolatedAttempt(
+                status="crashed", detail=f"worker exited with code {exitcode}"
+            )
+        if status == "memory":
+            self._stop()
+        return IsolatedAttempt(status=status, value=value, detail=detail)
+
+    def close(self) -> None:
+        if self._conn is not None and self._process is not None and self._process.is_alive():
+            try:
+                self._conn.send(None)
+            except (BrokenPipeError, OSError):
+                pass
+            self._process.join(5)
+        self._stop()
+
+
+class GuardedPool:
+    def __init__(self, workers: int, memory_limit_mb: int | None) -> None:
+        self._idle: queue.Queue[GuardedWorker] = queue.Queue()
+        self._workers = [GuardedWorker(memory_limit_mb) for _ in range(max(1, workers))]
+        for worker in self._workers:
+            self._idle.put(worker)
+
+    @contextmanager
+    def checkout(self) -> Iterator[GuardedWorker]:
+        worker = self._idle.get()
+        try:
+            yield worker
+        finally:
+            self._idle.put(worker)
+
+    def close(self) -> None:
+        for worker in self._workers:
+            worker.close()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+def run_guarded(
+    func: Callable[[Any, dict[str, Any]], dict[str, Any]],
+    payload: Any,
+    options: dict[str, Any],
+    *,
+    fallback_options: dict[str, Any] | None,
+    pool: GuardedPool,
+    timeout_seconds: float,
+) -> GuardedOutcome:
+    attempts: list[dict[str, Any]] = []
+    plans = [options] + ([fallback_options] if fallback_options else [])
+    with pool.checkout() as worker:
+        for plan in plans:
+            attempt = worker.run(partial(func, options=plan), payload, timeout_seconds)
+            if attempt.status == "ok":
+                return GuardedOutcome(result=attempt.value, attempts=attempts)
+            attempts.append(
+                {
+                    "html_extractor": plan.get("html_extractor"),
+                    "status": attempt.status,
+                    "detail": attempt.detail,
+                }
+            )
+            if attempt.status not in LIMIT_STATUSES:
+                raise RuntimeError(f"Guarded feature extraction failed:\n{attempt.detail}")
+    return GuardedOutcome(result=None, attempts=attempts)
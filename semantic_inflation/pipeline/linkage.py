@@ -10,6 +10,7 @@ from semantic_inflation.pipeline.state import (
     StageResult,
     compute_inputs_hash,
     should_skip_stage,
+    stage_config,
     stage_manifest_path,
     write_stage_manifest,
 )
@@ -18,7 +19,7 @@ from semantic_inflation.pipeline.state import (
 def build_linkage(context: PipelineContext, force: bool = False) -> StageResult:
     settings = context.settings
     output_path = settings.paths.processed_dir / "linkage.parquet"
-    inputs_hash = compute_inputs_hash({"stage": "linkage", "config": settings.model_dump(mode="json")})
+    inputs_hash = compute_inputs_hash({"stage": "linkage", "config": stage_config(settings)})
     manifest_path = stage_manifest_path(settings.paths.outputs_dir, "linkage")
     if should_skip_stage(manifest_path, [output_path], inputs_hash, force):
         return StageResult(
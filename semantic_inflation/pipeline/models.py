@@ -15,6 +15,7 @@ from semantic_inflation.pipeline.state import (
     StageResult,
     compute_inputs_hash,
     should_skip_stage,
+    stage_config,
     stage_manifest_path,
     write_stage_manifest,
 )
@@ -70,7 +71,7 @@ def _select_full_rank(df: pd.DataFrame) -> tuple[pd.DataFrame, list[str]]:
 def run_models(context: PipelineContext, force: bool = False) -> StageResult:
     settings = context.settings
     output_path = settings.paths.outputs_dir / "results" / "models_summary.json"
-    inputs_hash = compute_inputs_hash({"stage": "models", "config": settings.model_dump(mode="json")})
+    inputs_hash = compute_inputs_hash({"stage": "models", "config": stage_config(settings)})
     manifest_path = stage_manifest_path(settings.paths.outputs_dir, "models")
     if should_skip_stage(manifest_path, [output_path], inputs_hash, force):
         return StageResult(
@@ -6,12 +6,13 @@ from typing import Any
 import pandas as pd
 
 from semantic_inflation.pipeline.context import PipelineContext
-from semantic_inflation.pipeline.downloads import sha256_file
+from semantic_inflation.pipeline.downloads import network_session, sha256_file
 from semantic_inflation.pipeline.io import write_json
 from semantic_inflation.pipeline.state import (
     StageResult,
     compute_inputs_hash,
     should_skip_stage,
+    stage_config,
     stage_manifest_path,
     write_stage_manifest,
 )
@@ -68,7 +69,7 @@ def build_parent_to_cik(context: PipelineContext, force: bool = False) -> StageR
     universe_path = settings.paths.processed_dir / "cik_universe_ghgrp.csv"
     ghgrp_matched_path = settings.paths.processed_dir / "ghgrp.parquet"
     inputs_hash = compute_inputs_hash(
-        {"stage": "parent_to_cik", "config": settings.model_dump(mode="json")}
+        {"stage": "parent_to_cik", "config": stage_config(settings)}
     )
     manifest_path = stage_manifest_path(settings.paths.outputs_dir, "parent_to_cik")
     if should_skip_stage(
@@ -157,13 +158,14 @@ def build_parent_to_cik(context: PipelineContext, force: bool = False) -> StageR
     rps = min(settings.sec.max_requests_per_second, 10.0)
     manifest_log = settings.paths.raw_dir / "_manifests" / "sec_downloads.jsonl"
     sec_tickers_path = settings.paths.raw_dir / "sec" / "company_tickers.json"
-    sec_df = download_company_tickers(
-        settings.pipeline.sec.company_tickers_url,
-        sec_tickers_path,
-        headers,
-        rps,
-        manifest_log,
-    )
+    with network_session(settings):
+        sec_df = download_company_tickers(
+            settings.pipeline.sec.company_tickers_url,
+            sec_tickers_path,
+            headers,
+            rps,
+            manifest_log,
+        )
     sec_df = sec_df.rename(columns={"title": "sec_name_raw"})
 
     suffixes = load_corp_suffixes(
@@ -13,6 +13,7 @@ from semantic_inflation.pipeline.parent_to_cik import build_parent_to_cik
 from semantic_inflation.pipeline.panel import build_panel
 from semantic_inflation.pipeline.sec import download_sec_filings
 from semantic_inflation.pipeline.sec_index import build_sec_filings_index
+from semantic_inflation.pipeline.sec_stream import stream_sec_filings
 from semantic_inflation.pipeline.state import StageResult
 from semantic_inflation.pipeline.usaspending import download_usaspending_awards
 
@@ -38,7 +39,15 @@ def run_pipeline(context: PipelineContext, *, force: bool = False) -> dict[str,
         ("models", run_models),
     ]
 
+    stream_features = context.settings.pipeline.sec.stream_features
     for name, func in stages:
+        if stream_features and name == "sec_download":
+            results["sec_download"], results["sec_features"] = stream_sec_filings(
+                context, force
+            )
+            continue
+        if stream_features and name == "sec_features":
+            continue
         results[name] = func(context, force)
 
     return {
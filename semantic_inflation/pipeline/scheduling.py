@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, ProcessPoolExecutor, wait
+from dataclasses import asdict, dataclass
+import time
+from typing import Any, Callable, Generic, Iterable, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+@dataclass(frozen=True)
+class SizedJob(Generic[T]):
+    key: int
+    size: int
+    payload: T
+
+
+@dataclass(frozen=True)
+class ScheduleReport:
+    ordering: str
+    workers: int
+    jobs: int
+    total_bytes: int
+    wall_seconds: float
+    busy_seconds: float
+    max_job_seconds: float
+    utilization: float
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+def order_jobs(jobs: list[SizedJob[T]], ordering: str = "lpt") -> list[SizedJob[T]]:
+    if ordering == "lpt":
+        # Longest-processing-time-first, with file size as the cost estimate.
+        return sorted(jobs, key=lambda job: (-job.size, job.key))
+    if ordering == "index":
+        return sorted(jobs, key=lambda job: job.key)
+    raise ValueError(f"Unsupported scheduler ordering: {ordering}")
+
+
+def _timed_call(func: Callable[[T], R], payload: T) -> tuple[float, R]:
+    start = time.perf_counter()
+    result = func(payload)
+    return time.perf_counter() - start, result
+
+
+def _execute(
+    source: Iterable[SizedJob[T]],
+    func: Callable[[T], R],
+    workers: int,
+    executor_factory: Callable[[int], Executor] | None,
+    record: Callable[[SizedJob[T], float, R], None],
+) -> None:
+    if workers == 1:
+        for job in source:
+            elapsed, result = _timed_call(func, job.payload)
+            record(job, elapsed, result)
+        return
+
+    factory = executor_factory or (lambda n: ProcessPoolExecutor(max_workers=n))
+    with factory(workers) as executor:
+        in_flight: dict[Future[tuple[float, R]], SizedJob[T]] = {}
+
+        def _collect() -> None:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                job = in_flight.pop(future)
+                elapsed, result = future.result()
+                record(job, elapsed, result)
+
+        # Keep exactly one job per worker in flight so that no worker
+        # prefetches work another idle worker could have taken.
+        for job in source:
+            while len(in_flight) >= workers:
+                _collect()
+            in_flight[executor.submit(_timed_call, func, job.payload)] = job
+        while in_flight:
+            _collect()
+
+
+def _run(
+    source: Iterable[SizedJob[T]],
+    func: Callable[[T], R],
+    *,
+    workers: int,
+    ordering: str,
+    executor_factory: Callable[[int], Executor] | None,
+) -> tuple[list[R], ScheduleReport]:
+    results: dict[int, R] = {}
+    busy = 0.0
+    max_job = 0.0
+    total_bytes = 0
+    start = time.perf_counter()
+
+    def _record(job: SizedJob[T], elapsed: float, result: R) -> None:
+        nonlocal busy, max_job, total_bytes
+        busy += elapsed
+        max_job = max(max_job, elapsed)
+        total_bytes += job.size
+        results[job.key] = result
+
+    _execute(source, func, workers, executor_factory, _record)
+
+    wall = time.perf_counter() - start
+    report = ScheduleReport(
+        ordering=ordering,
+        workers=workers,
+        jobs=len(results),
+        total_bytes=total_bytes,
+        wall_seconds=wall,
+        busy_seconds=busy,
+        max_job_seconds=max_job,
+        utilization=(busy / (workers * wall)) if wall > 0 else 0.0,
+    )
+    return [results[key] for key in sorted(results)], report
+
+
+def run_scheduled(
+    jobs: list[SizedJob[T]],
+    func: Callable[[T], R],
+    *,
+    workers: int,
+    ordering: str = "lpt",
+    executor_factory: Callable[[int], Executor] | None = None,
+) -> tuple[list[R], ScheduleReport]:
+    """Run ``func`` over ``jobs`` and return results in ``key`` order.
+
+    Jobs are handed out one at a time from a shared queue: an idle worker pulls
+    the next-largest job as soon as it finishes, so no worker is stuck with a
+    pre-assigned chunk while the others sit idle. ``func`` must be picklable
+    when the default process pool is used.
+    """
+    return _run(
+        order_jobs(jobs, ordering),
+        func,
+        workers=max(1, min(workers, len(jobs) or 1)),
+        ordering=ordering,
+        executor_factory=executor_factory,
+    )
+
+
+def run_streaming(
+    source: Iterable[SizedJob[T]],
+    func: Callable[[T], R],
+    *,
+    workers: int,
+    executor_factory: Callable[[int], Executor] | None = None,
+) -> tuple[list[R], ScheduleReport]:
+    """Like :func:`run_scheduled`, but for jobs that become available over time.
+
+    Jobs are dispatched in arrival order; a blocking ``source`` (for example one
+    fed by a bounded queue) throttles its producer while all workers are busy.
+    """
+    return _run(
+        source,
+        func,
+        workers=max(1, workers),
+        ordering="arrival",
+        executor_factory=executor_factory,
+    )
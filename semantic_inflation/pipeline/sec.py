@@ -1,19 +1,29 @@
 from __future__ import annotations
 
-import csv
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterator
 
 import pandas as pd
 
 from semantic_inflation.pipeline.context import PipelineContext
-from semantic_inflation.pipeline.downloads import download_with_cache, sha256_file
+from semantic_inflation.pipeline.downloads import (
+    append_manifest,
+    download_with_cache,
+    manifest_store_for,
+    materialize_file,
+    network_session,
+)
+from semantic_inflation.pipeline.filings_index import read_filings_index
 from semantic_inflation.pipeline.io import write_json
 from semantic_inflation.pipeline.state import (
     StageResult,
     compute_inputs_hash,
     should_skip_stage,
+    stage_config,
     stage_manifest_path,
     write_stage_manifest,
 )
@@ -28,123 +38,218 @@ class SecFilingRecord:
     primary_document: str | None
 
 
+_RECORD_COLUMNS = ["cik", "filing_year", "file_path", "source_url", "primary_document"]
+
+
 def _resolve_path(path: str | Path, repo_root: Path) -> Path:
     p = Path(path)
     return p if p.is_absolute() else repo_root / p
 
 
-def _load_filings_index(context: PipelineContext) -> list[SecFilingRecord]:
+def load_filings_index(context: PipelineContext) -> list[SecFilingRecord]:
     settings = context.settings
     index_path = _resolve_path(settings.pipeline.sec.filings_index_path, context.repo_root)
-    if not index_path.exists():
-        raise FileNotFoundError(f"Missing filings index: {index_path}")
-
-    records: list[SecFilingRecord] = []
-    with index_path.open("r", encoding="utf-8") as handle:
-        reader = csv.DictReader(handle)
-        for row in reader:
-            cik = (row.get("cik") or "").strip()
-            if not cik:
-                continue
-            filing_year = int(row.get("filing_year") or 0)
-            source_path = row.get("file_path")
-            source_url = row.get("source_url")
-            primary_document = row.get("primary_document")
-            records.append(
-                SecFilingRecord(
-                    cik=cik,
-                    filing_year=filing_year,
-                    source_path=_resolve_path(source_path, context.repo_root)
-                    if source_path
-                    else None,
-                    source_url=source_url or None,
-                    primary_document=primary_document or None,
-                )
-            )
+
+    index = read_filings_index(index_path)
+    records = [
+        SecFilingRecord(
+            cik=row["cik"],
+            filing_year=row["filing_year"],
+            source_path=_resolve_path(row["file_path"], context.repo_root)
+            if row["file_path"]
+            else None,
+            source_url=row["source_url"],
+            primary_document=row["primary_document"],
+        )
+        for row in index.records(_RECORD_COLUMNS)
+    ]
 
     if settings.pipeline.sec.max_filings:
         records = records[: settings.pipeline.sec.max_filings]
     return records
 
 
-def download_sec_filings(context: PipelineContext, force: bool = False) -> StageResult:
-    settings = context.settings
-    raw_dir = settings.paths.raw_dir / "sec" / "filings"
-    outputs: list[Path] = []
-    filings = _load_filings_index(context)
-    outputs = [
+def filing_destinations(context: PipelineContext, filings: list[SecFilingRecord]) -> list[Path]:
+    raw_dir = context.settings.paths.raw_dir / "sec" / "filings"
+    return [
         raw_dir
         / rec.cik
         / str(rec.filing_year)
         / (rec.primary_document or f"{rec.cik}-{rec.filing_year}.html")
         for rec in filings
     ]
-    inputs_hash = compute_inputs_hash(
+
+
+def download_inputs_hash(context: PipelineContext, filings: list[SecFilingRecord]) -> str:
+    return compute_inputs_hash(
         {
             "stage": "sec_download",
             "filings": [rec.__dict__ for rec in filings],
-            "config": settings.model_dump(mode="json"),
+            "config": stage_config(context.settings),
         }
     )
-    manifest_path = stage_manifest_path(settings.paths.outputs_dir, "sec_download")
-    if should_skip_stage(manifest_path, outputs, inputs_hash, force):
-        return StageResult(
-            name="sec_download",
-            status="skipped",
-            outputs=[str(p) for p in outputs],
-            inputs_hash=inputs_hash,
-            stats={"skipped": True},
+
+
+def materialize_filing(
+    record: SecFilingRecord,
+    dest: Path,
+    headers: dict[str, str],
+    rps: float,
+    log_path: Path,
+    *,
+    mirror: dict[str, Any] | None = None,
+    hardlink: bool = True,
+) -> dict[str, Any] | None:
+    """Place one filing at ``dest`` from its local mirror file or its URL.
+
+    Local files are linked or cloned where the filesystem allows it. ``mirror``
+    is the download-manifest row of the source file; its hash is reused while
+    the size still matches, so the copy is not read back to hash it.
+    """
+    if dest.exists():
+        return None
+    if record.source_path and record.source_path.exists():
+        sha256 = None
+        if mirror and mirror.get("bytes") == record.source_path.stat().st_size:
+            sha256 = mirror.get("sha256")
+        placed = materialize_file(record.source_path, dest, sha256=sha256, hardlink=hardlink)
+        row = {
+            "cik": record.cik,
+            "filing_year": record.filing_year,
+            "url": None,
+            "local_path": str(dest),
+            "sha256": placed.sha256,
+            "bytes": placed.bytes_written,
+            "status": "copied",
+        }
+        append_manifest(
+            log_path,
+            {
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+                "url": None,
+                "path": str(dest),
+                "sha256": row["sha256"],
+                "bytes": row["bytes"],
+                "status": "copied",
+                "source_path": str(record.source_path),
+                "method": placed.method,
+            },
         )
+        return row
+    if record.source_url:
+        result = download_with_cache(record.source_url, dest, headers, rps, log_path)
+        return {
+            "cik": record.cik,
+            "filing_year": record.filing_year,
+            "url": record.source_url,
+            "local_path": str(result.path),
+            "sha256": result.sha256,
+            "bytes": result.bytes_written,
+            "status": "cached" if result.cached else "downloaded",
+        }
+    raise FileNotFoundError(
+        f"No source path or URL for filing {record.cik} {record.filing_year}"
+    )
 
-    headers = {"User-Agent": settings.sec.resolved_user_agent()}
-    rps = min(settings.sec.max_requests_per_second, 10.0)
-    log_path = settings.paths.raw_dir / "_manifests" / "sec_filings.jsonl"
 
-    downloaded: list[str] = []
-    manifest_rows: list[dict[str, Any]] = []
-    for record, dest in zip(filings, outputs):
-        if dest.exists():
-            continue
-        if record.source_path and record.source_path.exists():
-            dest.parent.mkdir(parents=True, exist_ok=True)
-            dest.write_bytes(record.source_path.read_bytes())
-            downloaded.append(str(dest))
-            manifest_rows.append(
-                {
-                    "cik": record.cik,
-                    "filing_year": record.filing_year,
-                    "url": None,
-                    "local_path": str(dest),
-                    "sha256": sha256_file(dest),
-                    "bytes": dest.stat().st_size,
-                    "status": "copied",
-                }
-            )
-            continue
-        if record.source_url:
-            result = download_with_cache(record.source_url, dest, headers, rps, log_path)
-            downloaded.append(str(dest))
-            manifest_rows.append(
-                {
-                    "cik": record.cik,
-                    "filing_year": record.filing_year,
-                    "url": record.source_url,
-                    "local_path": str(result.path),
-                    "sha256": result.sha256,
-                    "bytes": result.bytes_written,
-                    "status": "cached" if result.cached else "downloaded",
-                }
-            )
-            continue
-        raise FileNotFoundError(
-            f"No source path or URL for filing {record.cik} {record.filing_year}"
+def _on_disk(path: Path, size: int | None) -> bool:
+    try:
+        stat = path.stat()
+    except OSError:
+        return False
+    return size is None or stat.st_size == size
+
+
+def materialize_filings(
+    filings: list[SecFilingRecord],
+    outputs: list[Path],
+    headers: dict[str, str],
+    rps: float,
+    log_path: Path,
+    workers: int,
+    *,
+    trust_manifest: bool = True,
+    hardlink: bool = True,
+) -> Iterator[tuple[int, dict[str, Any] | None]]:
+    """Materialize filings with up to ``workers`` requests in flight.
+
+    Yields ``(index, manifest_row)`` in index order. All workers share the
+    per-rate token bucket in ``download_file``, so concurrency hides latency
+    without exceeding ``rps``. Filings already in the download manifest are
+    skipped while the file is still on disk with the recorded size, unless
+    ``trust_manifest`` is off (forced runs re-check everything). The same
+    query returns the recorded hashes of local mirror files.
+    """
+    known: set[str] = set()
+    mirror: dict[str, dict[str, Any]] = {}
+    if trust_manifest:
+        store = manifest_store_for(log_path)
+        known = {
+            path
+            for path, row in store.lookup(outputs, log=log_path.stem).items()
+            if _on_disk(Path(path), row.get("bytes"))
+        }
+        sources = [record.source_path for record in filings if record.source_path]
+        if sources:
+            mirror = store.lookup(sources)
+
+    def _materialize(record: SecFilingRecord, dest: Path) -> dict[str, Any] | None:
+        return materialize_filing(
+            record,
+            dest,
+            headers,
+            rps,
+            log_path,
+            mirror=mirror.get(str(record.source_path)) if record.source_path else None,
+            hardlink=hardlink,
         )
 
-    manifest_path = settings.paths.raw_dir / "sec" / "filings_manifest.parquet"
+    if workers <= 1:
+        for index, (record, dest) in enumerate(zip(filings, outputs)):
+            if str(dest) in known:
+                yield index, None
+                continue
+            yield index, _materialize(record, dest)
+        return
+
+    skipped: Future[dict[str, Any] | None] = Future()
+    skipped.set_result(None)
+
+    pending: deque[Future[dict[str, Any] | None]] = deque()
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="sec-download") as executor:
+        try:
+            index = 0
+            for record, dest in zip(filings, outputs):
+                if str(dest) in known:
+                    pending.append(skipped)
+                else:
+                    pending.append(executor.submit(_materialize, record, dest))
+                # A small window keeps every worker busy while bounding how far
+                # downloads run ahead of a slow consumer.
+                if len(pending) >= 2 * workers:
+                    yield index, pending.popleft().result()
+                    index += 1
+            while pending:
+                yield index, pending.popleft().result()
+                index += 1
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+def finalize_download(
+    context: PipelineContext,
+    outputs: list[Path],
+    manifest_rows: list[dict[str, Any]],
+    inputs_hash: str,
+) -> StageResult:
+    settings = context.settings
+    rps = min(settings.sec.max_requests_per_second, 10.0)
+    filings_manifest_path = settings.paths.raw_dir / "sec" / "filings_manifest.parquet"
     if manifest_rows:
         manifest_df = pd.DataFrame(manifest_rows)
-        manifest_path.parent.mkdir(parents=True, exist_ok=True)
-        manifest_df.to_parquet(manifest_path, index=False)
+        filings_manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        manifest_df.to_parquet(filings_manifest_path, index=False)
         success_rate = (manifest_df["status"] != "failed").mean()
     else:
         success_rate = 1.0
@@ -158,11 +263,11 @@ def download_sec_filings(context: PipelineContext, force: bool = False) -> Stage
         raise ValueError("SEC download success rate below 95%.")
 
     qc_payload: dict[str, Any] = {
-        "filings": len(filings),
-        "downloaded": downloaded,
+        "filings": len(outputs),
+        "downloaded": [row["local_path"] for row in manifest_rows],
         "user_agent": settings.sec.resolved_user_agent(),
         "requests_per_second": rps,
-        "manifest": str(manifest_path),
+        "manifest": str(filings_manifest_path),
         "success_rate": success_rate,
         "failures_path": str(failures_path) if failures_path else None,
     }
@@ -177,5 +282,45 @@ def download_sec_filings(context: PipelineContext, force: bool = False) -> Stage
         stats=qc_payload,
         inputs_hash=inputs_hash,
     )
-    write_stage_manifest(manifest_path, result)
+    write_stage_manifest(
+        stage_manifest_path(settings.paths.outputs_dir, "sec_download"), result
+    )
     return result
+
+
+def download_sec_filings(context: PipelineContext, force: bool = False) -> StageResult:
+    settings = context.settings
+    filings = load_filings_index(context)
+    outputs = filing_destinations(context, filings)
+    inputs_hash = download_inputs_hash(context, filings)
+    manifest_path = stage_manifest_path(settings.paths.outputs_dir, "sec_download")
+    if should_skip_stage(manifest_path, outputs, inputs_hash, force):
+        return StageResult(
+            name="sec_download",
+            status="skipped",
+            outputs=[str(p) for p in outputs],
+            inputs_hash=inputs_hash,
+            stats={"skipped": True},
+        )
+
+    headers = {"User-Agent": settings.sec.resolved_user_agent()}
+    rps = min(settings.sec.max_requests_per_second, 10.0)
+    log_path = settings.paths.raw_dir / "_manifests" / "sec_filings.jsonl"
+
+    manifest_rows: list[dict[str, Any]] = []
+    workers = settings.sec.concurrent_downloads
+    with network_session(settings):
+        for _, row in materialize_filings(
+            filings,
+            outputs,
+            headers,
+            rps,
+            log_path,
+            workers,
+            trust_manifest=not force,
+            hardlink=settings.pipeline.sec.hardlink_local_filings,
+        ):
+            if row is not None:
+                manifest_rows.append(row)
+
+    return finalize_download(context, outputs, manifest_rows, inputs_hash)
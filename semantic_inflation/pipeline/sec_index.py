@@ -1,24 +1,38 @@
 from __future__ import annotations
 
-import csv
-from dataclasses import dataclass
-from datetime import datetime, timezone
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, replace
+from datetime import date, datetime, timezone
+from itertools import chain
 import json
 from pathlib import Path
 import random
 import re
-import time
-from typing import Any
+from typing import Any, Iterator
+import zipfile
 
-import httpx
+from bs4 import BeautifulSoup
 import pandas as pd
+from semantic_inflation.config import Settings
 from semantic_inflation.pipeline.context import PipelineContext
-from semantic_inflation.pipeline.downloads import download_with_cache, sha256_bytes, sha256_file
+from semantic_inflation.pipeline.downloads import (
+    check_url,
+    download_with_cache,
+    network_session,
+    sha256_file,
+)
+from semantic_inflation.pipeline.filings_index import (
+    INDEX_COLUMNS,
+    parquet_path,
+    read_filings_index,
+    write_filings_index,
+)
 from semantic_inflation.pipeline.io import write_json
 from semantic_inflation.pipeline.state import (
     StageResult,
     compute_inputs_hash,
     should_skip_stage,
+    stage_config,
     stage_manifest_path,
     write_stage_manifest,
 )
@@ -69,85 +83,559 @@ def _resolve_path(path: str | Path, repo_root: Path) -> Path:
     return p if p.is_absolute() else repo_root / p
 
 
-def _extract_filings(payload: dict[str, Any], cik: str) -> list[FilingCandidate]:
-    filings = payload.get("filings", {})
-    recent = filings.get("recent", {})
-    candidates: list[FilingCandidate] = []
-    if recent:
-        count = len(recent.get("accessionNumber", []))
-        for idx in range(count):
-            candidates.append(
-                FilingCandidate(
-                    cik=cik,
-                    form=recent.get("form", [None])[idx],
-                    filing_date=recent.get("filingDate", [None])[idx],
-                    report_date=recent.get("reportDate", [None])[idx],
-                    accession_number=recent.get("accessionNumber", [None])[idx],
-                    primary_document=recent.get("primaryDocument", [None])[idx],
-                    company_name=payload.get("name"),
-                )
-            )
-    return candidates
+# Submissions array name for each FilingCandidate field.
+_SUBMISSIONS_FIELDS = {
+    "form": "form",
+    "filing_date": "filingDate",
+    "report_date": "reportDate",
+    "accession_number": "accessionNumber",
+    "primary_document": "primaryDocument",
+}
+_CANDIDATE_COLUMNS = [
+    "cik",
+    "form",
+    "filing_date",
+    "report_date",
+    "accession_number",
+    "primary_document",
+    "company_name",
+]
+
+
+def _candidate_frame(candidates: list[FilingCandidate]) -> pd.DataFrame:
+    return pd.DataFrame(
+        [[getattr(c, column) for column in _CANDIDATE_COLUMNS] for c in candidates],
+        columns=_CANDIDATE_COLUMNS,
+        dtype=object,
+    )
+
+
+def _extract_filings(
+    payload: dict[str, Any], cik: str, company_name: str | None = None
+) -> dict[str, list[Any]]:
+    """Return the submissions filing arrays as candidate columns, one entry per filing."""
+    # The main submissions file nests the arrays under filings.recent; the
+    # extra filings.files pages are the bare arrays.
+    if "filings" in payload:
+        recent = payload["filings"].get("recent", {})
+    else:
+        recent = payload
+    count = len(recent.get("accessionNumber", [])) if recent else 0
+    columns: dict[str, list[Any]] = {"cik": [cik] * count}
+    for field, key in _SUBMISSIONS_FIELDS.items():
+        columns[field] = (recent.get(key) or [None] * count) if count else []
+    columns["company_name"] = [payload.get("name", company_name)] * count
+    return columns
+
+
+def _candidate_table(pages: list[dict[str, list[Any]]]) -> pd.DataFrame:
+    """Stack :func:`_extract_filings` columns into one candidate table."""
+    return pd.DataFrame(
+        {
+            column: list(chain.from_iterable(page[column] for page in pages))
+            for column in _CANDIDATE_COLUMNS
+        },
+        dtype=object,
+    )
+
+
+def _page_in_range(extra: dict[str, Any], start_year: int, end_year: int) -> bool:
+    """Whether a ``filings.files`` page can hold a filing for ``[start_year, end_year]``.
+
+    Pages are bounded by filing date while filing years prefer the report
+    date, which trails it; a page filed up to ``end_year + 1`` can still carry
+    an ``end_year`` report. Pages without bounds are always fetched.
+    """
+    try:
+        filed_from = int(str(extra.get("filingFrom"))[:4])
+        filed_to = int(str(extra.get("filingTo"))[:4])
+    except ValueError:
+        return True
+    return filed_to >= start_year and filed_from <= end_year + 1
+
+
+def _fetch_submissions_page(
+    name: str,
+    cache_dir: Path,
+    headers: dict[str, str],
+    max_rps: float,
+    log_path: Path,
+    cache_policy: dict[str, Any],
+) -> dict[str, Any]:
+    url = f"https://data.sec.gov/submissions/{name}"
+    path = cache_dir / name
+    download_with_cache(url, path, headers, max_rps, log_path, **cache_policy)
+    return json.loads(path.read_text(encoding="utf-8"))
 
 
 def _fetch_submissions(
-    cik: str,
+    ciks: list[str],
     cache_dir: Path,
     headers: dict[str, str],
     max_rps: float,
     log_path: Path,
-) -> list[FilingCandidate]:
+    workers: int,
+    *,
+    year_range: tuple[int, int] | None = None,
+    revalidate: bool = False,
+    max_age_hours: float | None = None,
+) -> tuple[pd.DataFrame, list[dict[str, Any]]]:
+    """Fetch and parse submissions for ``ciks`` with up to ``workers`` requests in flight.
+
+    Each page is parsed in its worker as soon as it arrives, and a CIK's extra
+    ``filings.files`` pages are queued ahead of new CIKs. Requests share the
+    per-host limiter, so concurrency hides latency without raising the rate.
+    Candidate rows come back in CIK and page order, as a sequential fetch would
+    return them, together with the extra pages skipped as outside
+    ``year_range``.
+    """
     cache_dir.mkdir(parents=True, exist_ok=True)
-    submissions_url = f"https://data.sec.gov/submissions/CIK{cik}.json"
-    cache_path = cache_dir / f"CIK{cik}.json"
-    download_with_cache(submissions_url, cache_path, headers, max_rps, log_path)
-    payload = json.loads(cache_path.read_text(encoding="utf-8"))
-    candidates = _extract_filings(payload, cik)
-    for extra in payload.get("filings", {}).get("files", []):
-        name = extra.get("name")
-        if not name:
+    cache_policy = {"revalidate": revalidate, "max_age_hours": max_age_hours}
+    workers = max(1, workers)
+
+    def _load(
+        name: str, cik: str, company_name: str | None = None
+    ) -> tuple[dict[str, list[Any]], dict[str, Any]]:
+        payload = _fetch_submissions_page(
+            name, cache_dir, headers, max_rps, log_path, cache_policy
+        )
+        return _extract_filings(payload, cik, company_name), payload
+
+    pages: dict[tuple[str, int], dict[str, list[Any]]] = {}
+    skipped: list[dict[str, Any]] = []
+    page_counts: dict[str, int] = {}
+    pending_ciks = iter(ciks)
+    in_flight: dict[Future[Any], tuple[str, int]] = {}
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="sec-submissions") as executor:
+        try:
+            while True:
+                # Keep a small window of CIKs queued behind the running requests.
+                while len(in_flight) < 2 * workers:
+                    cik = next(pending_ciks, None)
+                    if cik is None:
+                        break
+                    page_counts[cik] = 1
+                    in_flight[executor.submit(_load, f"CIK{cik}.json", cik)] = (cik, 0)
+                if not in_flight:
+                    break
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    cik, page = in_flight.pop(future)
+                    candidates, payload = future.result()
+                    pages[(cik, page)] = candidates
+                    if page:
+                        continue
+                    names: list[str] = []
+                    for extra in payload.get("filings", {}).get("files", []):
+                        if not extra.get("name"):
+                            continue
+                        if year_range and not _page_in_range(extra, *year_range):
+                            skipped.append({"cik": cik, **extra})
+                            continue
+                        names.append(extra["name"])
+                    page_counts[cik] += len(names)
+                    for number, name in enumerate(names, start=1):
+                        future = executor.submit(_load, name, cik, payload.get("name"))
+                        in_flight[future] = (cik, number)
+        finally:
+            for future in in_flight:
+                future.cancel()
+
+    ordered = [pages[(cik, page)] for cik in ciks for page in range(page_counts.get(cik, 0))]
+    return _candidate_table(ordered), skipped
+
+
+def _bulk_submissions_zip(
+    settings: Settings,
+    headers: dict[str, str],
+    max_rps: float,
+    log_path: Path,
+    cache_policy: dict[str, Any],
+) -> Path:
+    configured = settings.pipeline.sec.submissions_zip_path
+    if configured is not None:
+        if not Path(configured).exists():
+            raise FileNotFoundError(f"Missing bulk submissions archive: {configured}")
+        return Path(configured)
+    zip_path = settings.paths.raw_dir / "sec" / "submissions.zip"
+    download_with_cache(
+        settings.pipeline.sec.submissions_zip_url,
+        zip_path,
+        headers,
+        max_rps,
+        log_path,
+        timeout=600.0,
+        **cache_policy,
+    )
+    return zip_path
+
+
+def _read_bulk_submissions(
+    zip_path: Path,
+    ciks: list[str],
+    *,
+    year_range: tuple[int, int] | None = None,
+) -> tuple[pd.DataFrame, list[dict[str, Any]], list[str]]:
+    """Parse the matched CIKs' members of the bulk ``submissions.zip``.
+
+    Only the ``CIK##########.json`` members for ``ciks`` (and their in-range
+    ``filings.files`` pages) are decompressed, one at a time, straight from
+    the archive. Returns candidates in the same order as
+    :func:`_fetch_submissions`, the skipped pages and the CIKs missing from
+    the archive.
+    """
+    pages: list[dict[str, list[Any]]] = []
+    skipped: list[dict[str, Any]] = []
+    missing: list[str] = []
+    with zipfile.ZipFile(zip_path) as archive:
+        members = set(archive.namelist())
+
+        def _load(name: str) -> dict[str, Any]:
+            with archive.open(name) as handle:
+                return json.load(handle)
+
+        for cik in ciks:
+            name = f"CIK{cik}.json"
+            if name not in members:
+                missing.append(cik)
+                continue
+            payload = _load(name)
+            pages.append(_extract_filings(payload, cik))
+            for extra in payload.get("filings", {}).get("files", []):
+                extra_name = extra.get("name")
+                if not extra_name:
+                    continue
+                if year_range and not _page_in_range(extra, *year_range):
+                    skipped.append({"cik": cik, **extra})
+                    continue
+                if extra_name not in members:
+                    missing.append(f"{cik}:{extra_name}")
+                    continue
+                pages.append(_extract_filings(_load(extra_name), cik, payload.get("name")))
+    return _candidate_table(pages), skipped, missing
+
+
+def _allowed_forms(forms: list[str]) -> set[str]:
+    allowed = {form.upper() for form in forms}
+    allowed.update({"10-K", "10-K/A", "10-K405"})
+    return allowed
+
+
+def _full_index_quarters(
+    start_year: int, end_year: int, today: date | None = None
+) -> list[tuple[int, int]]:
+    """Quarters of EDGAR full-index files that can list filings for the range.
+
+    A report for ``end_year`` is usually filed the following year, so its
+    quarters are included too; quarters that have not started yet are not.
+    """
+    today = today or date.today()
+    return [
+        (year, quarter)
+        for year in range(start_year, end_year + 2)
+        for quarter in range(1, 5)
+        if date(year, 3 * quarter - 2, 1) <= today
+    ]
+
+
+def _fetch_full_index(
+    quarters: list[tuple[int, int]],
+    cache_dir: Path,
+    headers: dict[str, str],
+    max_rps: float,
+    log_path: Path,
+    workers: int,
+    cache_policy: dict[str, Any],
+) -> list[Path]:
+    def _load(year: int, quarter: int) -> Path:
+        path = cache_dir / str(year) / f"QTR{quarter}" / "master.idx"
+        url = f"https://www.sec.gov/Archives/edgar/full-index/{year}/QTR{quarter}/master.idx"
+        download_with_cache(url, path, headers, max_rps, log_path, timeout=300.0, **cache_policy)
+        return path
+
+    with ThreadPoolExecutor(
+        max_workers=max(1, workers), thread_name_prefix="sec-full-index"
+    ) as executor:
+        return list(executor.map(lambda key: _load(*key), quarters))
+
+
+def _read_master_index(
+    path: Path, ciks: set[str], forms: set[str], years: tuple[int, int]
+) -> Iterator[FilingCandidate]:
+    """Stream ``master.idx`` rows for ``ciks`` and ``forms`` filed within ``years``.
+
+    Rows are ``CIK|Company Name|Form Type|Date Filed|Filename`` after a dashed
+    separator line; the accession number is the ``Filename`` stem.
+    """
+    with path.open("r", encoding="latin-1") as handle:
+        for line in handle:
+            if line.startswith("-----"):
+                break
+        for line in handle:
+            parts = line.rstrip("\n").split("|")
+            if len(parts) != 5:
+                continue
+            cik_raw, company, form, filed, filename = parts
+            cik = cik_raw.strip().zfill(10)
+            if cik not in ciks or form.upper() not in forms:
+                continue
+            try:
+                filed_year = int(filed[:4])
+            except ValueError:
+                continue
+            if not years[0] <= filed_year <= years[1]:
+                continue
+            yield FilingCandidate(
+                cik=cik,
+                form=form,
+                filing_date=filed,
+                report_date=None,
+                accession_number=Path(filename).stem,
+                primary_document=None,
+                company_name=company.strip() or None,
+            )
+
+
+def _parse_filing_index(html: str, form: str) -> tuple[str | None, str | None]:
+    """Return ``(primary_document, period_of_report)`` from an ``-index.htm`` page.
+
+    The primary document is the row of the document table whose Type equals
+    ``form``; inline XBRL links (``/ix?doc=...``) resolve to the document name.
+    """
+    soup = BeautifulSoup(html, "html.parser")
+    period = None
+    for head in soup.find_all("div", class_="infoHead"):
+        if head.get_text(strip=True) == "Period of Report":
+            info = head.find_next_sibling("div", class_="info")
+            period = info.get_text(strip=True) if info else None
+            break
+    table = soup.find("table", class_="tableFile")
+    if table is None:
+        return None, period
+    for row in table.find_all("tr"):
+        cells = row.find_all("td")
+        if len(cells) < 4 or cells[3].get_text(strip=True).upper() != form.upper():
             continue
-        extra_url = f"https://data.sec.gov/submissions/{name}"
-        extra_path = cache_dir / name
-        download_with_cache(extra_url, extra_path, headers, max_rps, log_path)
-        extra_payload = json.loads(extra_path.read_text(encoding="utf-8"))
-        candidates.extend(_extract_filings(extra_payload, cik))
-    return candidates
+        link = cells[2].find("a")
+        href = link.get("href") if link else None
+        if href:
+            return href.split("?doc=")[-1].rsplit("/", 1)[-1], period
+    return None, period
+
+
+def _provisional_candidates(candidates: list[FilingCandidate]) -> list[FilingCandidate]:
+    """Keep the full-index rows whose index pages can decide the selection.
+
+    Before resolution a row's year is its filing year (the fallback in
+    :func:`_filing_years`). The original 10-K is the provisional pick for its
+    (cik, year); several originals in one year straddle a fiscal-year boundary,
+    so all of them are kept and placed by report date once resolved.
+    Amendments are kept only for filers with no original filed that year.
+    """
+    if not candidates:
+        return []
+    frame = _candidate_frame(candidates)
+    forms = frame["form"].astype("string").str.upper()
+    amendment = forms.str.endswith("/A").fillna(False).astype(bool)
+    group = frame.groupby([frame["cik"], _filing_years(frame)], sort=False, dropna=False).ngroup()
+    has_original = (~amendment).groupby(group).transform("any")
+    keep = ~amendment | ~has_original
+    return [candidate for candidate, kept in zip(candidates, keep) if kept]
+
+
+def _resolve_primary_documents(
+    candidates: list[FilingCandidate],
+    cache_dir: Path,
+    headers: dict[str, str],
+    max_rps: float,
+    log_path: Path,
+    workers: int,
+    cache_policy: dict[str, Any],
+) -> tuple[list[FilingCandidate], list[str]]:
+    """Fill in primary documents and report dates from each filing's index page.
+
+    Runs as a separate batch after the full-index filter, with up to
+    ``workers`` index pages in flight under the shared limiter. Returns the
+    resolved candidates in input order and the accessions left unresolved.
+    """
+
+    def _resolve(candidate: FilingCandidate) -> FilingCandidate:
+        accession = candidate.accession_number or ""
+        url = (
+            f"https://www.sec.gov/Archives/edgar/data/{int(candidate.cik)}/"
+            f"{candidate.archive_dir()}/{accession}-index.htm"
+        )
+        path = cache_dir / candidate.cik / f"{accession}-index.htm"
+        download_with_cache(url, path, headers, max_rps, log_path, **cache_policy)
+        document, period = _parse_filing_index(
+            path.read_text(encoding="utf-8", errors="replace"), candidate.form
+        )
+        return replace(candidate, primary_document=document, report_date=period)
+
+    with ThreadPoolExecutor(
+        max_workers=max(1, workers), thread_name_prefix="sec-filing-index"
+    ) as executor:
+        resolved = list(executor.map(_resolve, candidates))
+    unresolved = [c.accession_number or "" for c in resolved if not c.primary_document]
+    return resolved, unresolved
+
+
+def _filing_years(candidates: pd.DataFrame) -> pd.Series:
+    """Vectorized :meth:`FilingCandidate.filing_year`: report year, else filing year."""
+    years = pd.Series(pd.NA, index=candidates.index, dtype="Int64")
+    for column in ["filing_date", "report_date"]:
+        prefix = candidates[column].astype("string[pyarrow]").str.slice(0, 4).str.strip()
+        numeric = prefix.str.fullmatch(r"[+-]?\d+").fillna(False).astype(bool)
+        parsed = pd.to_numeric(prefix.where(numeric), errors="coerce").astype("Int64")
+        years = parsed.where(parsed.notna(), years)
+    return years
 
 
 def _select_filings(
-    candidates: list[FilingCandidate],
+    candidates: pd.DataFrame,
     start_year: int,
     end_year: int,
     forms: list[str],
 ) -> list[FilingCandidate]:
-    allowed_forms = {form.upper() for form in forms}
-    allowed_forms.update({"10-K", "10-K/A", "10-K405"})
-    filtered = [
-        c
-        for c in candidates
-        if c.form and c.form.upper() in allowed_forms and c.filing_year() is not None
+    """Pick one filing per (cik, year): the latest original, else the latest amendment.
+
+    Runs as table operations over the candidate rows; groups come back in
+    order of their first in-range candidate.
+    """
+    if candidates.empty:
+        return []
+    forms_upper = candidates["form"].astype("string[pyarrow]").str.upper()
+    frame = candidates[forms_upper.isin(_allowed_forms(forms)).fillna(False).astype(bool)]
+    frame = frame.assign(filing_year=_filing_years(frame))
+    frame = frame[frame["filing_year"].between(start_year, end_year).fillna(False).astype(bool)]
+    if frame.empty:
+        return []
+
+    keys = ["cik", "filing_year"]
+    frame["group"] = frame.groupby(keys, sort=False).ngroup()
+    frame["amendment"] = frame["form"].str.upper().str.endswith("/A")
+    only_amendments = frame.groupby("group")["amendment"].transform("all")
+    pool = frame[~frame["amendment"] | only_amendments]
+    pool = pool.assign(
+        filing_key=pool["filing_date"].fillna(""),
+        accession_key=pool["accession_number"].fillna(""),
+    )
+    # A stable descending sort keeps the first of equal keys, as max() does.
+    chosen = pool.sort_values(
+        ["filing_key", "accession_key"], ascending=False, kind="stable"
+    ).drop_duplicates("group", keep="first")
+    chosen = chosen.sort_values("group")
+    return [
+        FilingCandidate(**{column: row[column] for column in _CANDIDATE_COLUMNS})
+        for row in chosen[_CANDIDATE_COLUMNS].to_dict("records")
     ]
-    grouped: dict[tuple[str, int], list[FilingCandidate]] = {}
-    for cand in filtered:
-        year = cand.filing_year()
-        if year is None or year < start_year or year > end_year:
-            continue
-        grouped.setdefault((cand.cik, year), []).append(cand)
-
-    selected: list[FilingCandidate] = []
-    for _, group in grouped.items():
-        non_amendments = [c for c in group if not c.is_amendment()]
-        pool = non_amendments or group
-        chosen = max(
-            pool,
-            key=lambda c: (
-                c.filing_date or "",
-                c.accession_number or "",
-            ),
+
+
+def _index_row(cand: FilingCandidate) -> dict[str, Any]:
+    return {
+        "cik": cand.cik,
+        "filing_year": cand.filing_year(),
+        "source_url": cand.source_url() or "",
+        "file_path": "",
+        "form": cand.form,
+        "filing_date": cand.filing_date or "",
+        "report_date": cand.report_date or "",
+        "accession_number": cand.accession_number or "",
+        "primary_document": cand.primary_document or "",
+        "archive_dir": cand.archive_dir() or "",
+        "company_name_sec": cand.company_name or "",
+    }
+
+
+def _row_candidate(row: dict[str, Any]) -> FilingCandidate:
+    return FilingCandidate(
+        cik=row["cik"],
+        form=row.get("form") or "",
+        filing_date=row.get("filing_date") or None,
+        report_date=row.get("report_date") or None,
+        accession_number=row.get("accession_number") or None,
+        primary_document=row.get("primary_document") or None,
+        company_name=row.get("company_name_sec") or None,
+    )
+
+
+def _read_index_rows(path: Path) -> list[dict[str, Any]]:
+    rows = read_filings_index(path).records(INDEX_COLUMNS)
+    return [{k: "" if v is None else v for k, v in row.items()} for row in rows]
+
+
+def _index_state_path(output_path: Path) -> Path:
+    return output_path.with_name(f"{output_path.stem}.state.json")
+
+
+def _high_water_marks(candidates: pd.DataFrame) -> dict[str, dict[str, str]]:
+    """Latest ``(filing_date, accession_number)`` seen for each CIK."""
+    if candidates.empty:
+        return {}
+    latest = (
+        candidates.assign(
+            filing_key=candidates["filing_date"].fillna(""),
+            accession_key=candidates["accession_number"].fillna(""),
         )
-        selected.append(chosen)
-    return selected
+        .sort_values(["cik", "filing_key", "accession_key"], kind="stable")
+        .drop_duplicates("cik", keep="last")
+    )
+    return {
+        row["cik"]: {"filing_date": row["filing_key"], "accession_number": row["accession_key"]}
+        for row in latest[["cik", "filing_key", "accession_key"]].to_dict("records")
+    }
+
+
+def _newer_than_marks(candidates: pd.DataFrame, marks: dict[str, dict[str, str]]) -> pd.Series:
+    """Mask of candidates filed after their CIK's high-water mark (or with no mark)."""
+    if not marks or candidates.empty:
+        return pd.Series(True, index=candidates.index)
+    marked = candidates["cik"].isin(list(marks))
+    mark_dates = candidates["cik"].map({cik: m["filing_date"] for cik, m in marks.items()})
+    mark_accessions = candidates["cik"].map(
+        {cik: m["accession_number"] for cik, m in marks.items()}
+    )
+    filing_key = candidates["filing_date"].fillna("")
+    accession_key = candidates["accession_number"].fillna("")
+    mark_dates = mark_dates.fillna("")
+    newer = (filing_key > mark_dates) | (
+        (filing_key == mark_dates) & (accession_key > mark_accessions.fillna(""))
+    )
+    return ~marked | newer
+
+
+def _merge_rows(
+    previous: list[dict[str, Any]], selected: list[FilingCandidate]
+) -> tuple[list[dict[str, Any]], list[dict[str, Any]], list[dict[str, Any]]]:
+    """Merge freshly selected filings into the previous index rows.
+
+    Rows keep their previous order and content unless a different filing now
+    wins their (cik, filing_year); new keys are appended. Returns the merged
+    rows and the added and changed keys.
+    """
+    by_key = {(row["cik"], row["filing_year"]): row for row in previous}
+    updates: dict[tuple[str, int], dict[str, Any]] = {}
+    added: list[dict[str, Any]] = []
+    changed: list[dict[str, Any]] = []
+    for cand in selected:
+        row = _index_row(cand)
+        key = (row["cik"], row["filing_year"])
+        old = by_key.get(key)
+        if old is not None and old.get("accession_number") == row["accession_number"]:
+            continue
+        report = {
+            "cik": row["cik"],
+            "filing_year": row["filing_year"],
+            "accession_number": row["accession_number"],
+        }
+        if old is None:
+            added.append(report)
+        else:
+            changed.append({**report, "previous_accession_number": old.get("accession_number")})
+        updates[key] = row
+    merged = [updates.pop(key, row) for key, row in by_key.items()]
+    merged.extend(updates.values())
+    return merged, added, changed
 
 
 def _assert_unique(records: list[dict[str, Any]]) -> None:
@@ -171,25 +659,24 @@ def _sample_urls(
     urls: list[str],
     headers: dict[str, str],
     max_rps: float,
-    sample_size: int,
+    sample_size: int | None,
+    workers: int,
 ) -> list[dict[str, Any]]:
-    sampled = random.sample(urls, k=min(sample_size, len(urls)))
-    results: list[dict[str, Any]] = []
-    with httpx.Client(headers=headers, timeout=30.0) as client:
-        for url in sampled:
-            response = client.get(url)
-            results.append(
-                {
-                    "url": url,
-                    "status_code": response.status_code,
-                    "content_type": response.headers.get("content-type"),
-                    "sha256": sha256_bytes(response.content)
-                    if response.status_code < 400
-                    else None,
-                }
-            )
-            time.sleep(max(0.1, 1.0 / max(max_rps, 0.1)))
-    return results
+    """Check a random sample of ``urls`` (every URL when ``sample_size`` is None).
+
+    Checks are HEAD requests (ranged GETs where HEAD is refused) spread over
+    ``workers`` threads, all drawing from the host's shared limiter.
+    """
+    if sample_size is None or sample_size >= len(urls):
+        sampled = list(urls)
+    else:
+        sampled = random.sample(urls, k=sample_size)
+    with ThreadPoolExecutor(
+        max_workers=max(1, workers), thread_name_prefix="sec-url-check"
+    ) as executor:
+        return list(
+            executor.map(lambda url: check_url(url, headers=headers, max_rps=max_rps), sampled)
+        )
 
 
 def build_sec_filings_index(context: PipelineContext, force: bool = False) -> StageResult:
@@ -205,23 +692,29 @@ def build_sec_filings_index(context: PipelineContext, force: bool = False) -> St
         raise ValueError("SEC filings index build requires network access (runtime.offline=true).")
 
     output_path = _resolve_path(settings.pipeline.sec.filings_index_path, context.repo_root)
+    table_path = parquet_path(output_path)
     universe_path = settings.paths.processed_dir / "cik_universe_ghgrp.csv"
     log_path = settings.paths.raw_dir / "_manifests" / "sec_downloads.jsonl"
     universe_sha256 = sha256_file(universe_path) if universe_path.exists() else None
     inputs_hash = compute_inputs_hash(
         {
             "stage": "sec_index",
-            "config": settings.model_dump(mode="json"),
+            "config": stage_config(settings),
             "output_path": str(output_path),
             "universe_sha256": universe_sha256,
         }
     )
     manifest_path = stage_manifest_path(settings.paths.outputs_dir, "sec_index")
-    if should_skip_stage(manifest_path, [output_path, universe_path], inputs_hash, force):
+    if should_skip_stage(
+        manifest_path,
+        [output_path, table_path, universe_path],
+        inputs_hash,
+        force or settings.runtime.refresh or settings.pipeline.sec.incremental,
+    ):
         return StageResult(
             name="sec_index",
             status="skipped",
-            outputs=[str(output_path), str(universe_path)],
+            outputs=[str(output_path), str(table_path), str(universe_path)],
             inputs_hash=inputs_hash,
             stats={"skipped": True},
         )
@@ -237,36 +730,94 @@ def build_sec_filings_index(context: PipelineContext, force: bool = False) -> St
     headers = {"User-Agent": settings.sec.resolved_user_agent()}
     rps = min(settings.sec.max_requests_per_second, 10.0)
     submissions_cache = settings.paths.raw_dir / "sec" / "submissions"
-    candidates: list[FilingCandidate] = []
-    for cik in matched_ciks:
-        candidates.extend(_fetch_submissions(cik, submissions_cache, headers, rps, log_path))
+    index_source = settings.pipeline.sec.index_source
+    year_range = (settings.project.start_year, settings.project.end_year)
+    missing_submissions: list[str] = []
+    unresolved_documents: list[str] = []
+    skipped_pages: list[dict[str, Any]] = []
+    max_age_hours = settings.pipeline.sec.submissions_max_age_hours
+    state_path = _index_state_path(output_path)
+    incremental = (
+        settings.pipeline.sec.incremental and output_path.exists() and state_path.exists()
+    )
+    previous_rows: list[dict[str, Any]] = []
+    marks: dict[str, dict[str, str]] = {}
+    if incremental:
+        previous_rows = _read_index_rows(output_path)
+        marks = json.loads(state_path.read_text(encoding="utf-8")).get("ciks", {})
+    # Incremental runs revalidate cached sources with conditional requests,
+    # or only those older than submissions_max_age_hours when it is set.
+    cache_policy = {
+        "revalidate": settings.runtime.refresh or (incremental and max_age_hours is None),
+        "max_age_hours": max_age_hours,
+    }
+    with network_session(settings):
+        if index_source == "full-index":
+            full_index_cache = settings.paths.raw_dir / "sec" / "full-index"
+            index_files = _fetch_full_index(
+                _full_index_quarters(*year_range),
+                full_index_cache,
+                headers,
+                rps,
+                log_path,
+                settings.sec.concurrent_downloads,
+                cache_policy,
+            )
+            allowed_forms = _allowed_forms(settings.project.filing_forms)
+            ciks = set(matched_ciks)
+            listed = [
+                candidate
+                for path in index_files
+                for candidate in _read_master_index(
+                    path, ciks, allowed_forms, (year_range[0], year_range[1] + 1)
+                )
+            ]
+            # Quarter files are each sorted by CIK; group rows per CIK as the other sources do.
+            listed.sort(key=lambda candidate: candidate.cik)
+            # Only filings past the high-water marks need their index pages.
+            newer = _newer_than_marks(_candidate_frame(listed), marks)
+            listed = [candidate for candidate, keep in zip(listed, newer) if keep]
+            resolved, unresolved_documents = _resolve_primary_documents(
+                _provisional_candidates(listed),
+                full_index_cache / "filings",
+                headers,
+                rps,
+                log_path,
+                settings.sec.concurrent_downloads,
+                cache_policy,
+            )
+            candidates = _candidate_frame(resolved)
+        elif index_source == "bulk":
+            zip_path = _bulk_submissions_zip(settings, headers, rps, log_path, cache_policy)
+            candidates, skipped_pages, missing_submissions = _read_bulk_submissions(
+                zip_path, matched_ciks, year_range=year_range
+            )
+        else:
+            candidates, skipped_pages = _fetch_submissions(
+                matched_ciks,
+                submissions_cache,
+                headers,
+                rps,
+                log_path,
+                settings.sec.concurrent_downloads,
+                year_range=year_range,
+                **cache_policy,
+            )
 
+    fresh = candidates[_newer_than_marks(candidates, marks)]
+    refreshed_ciks = set(fresh["cik"])
+    # Previous selections compete with the new filings for their (cik, year).
+    previous_candidates = _candidate_frame(
+        [_row_candidate(row) for row in previous_rows if row["cik"] in refreshed_ciks]
+    )
+    pool = [frame for frame in (previous_candidates, fresh) if not frame.empty]
     selected = _select_filings(
-        candidates,
+        pd.concat(pool, ignore_index=True) if pool else fresh,
         settings.project.start_year,
         settings.project.end_year,
         settings.project.filing_forms,
     )
-
-    rows: list[dict[str, Any]] = []
-    for cand in selected:
-        archive_dir = cand.archive_dir()
-        source_url = cand.source_url()
-        rows.append(
-            {
-                "cik": cand.cik,
-                "filing_year": cand.filing_year(),
-                "source_url": source_url or "",
-                "file_path": "",
-                "form": cand.form,
-                "filing_date": cand.filing_date or "",
-                "report_date": cand.report_date or "",
-                "accession_number": cand.accession_number or "",
-                "primary_document": cand.primary_document or "",
-                "archive_dir": archive_dir or "",
-                "company_name_sec": cand.company_name or "",
-            }
-        )
+    rows, added_rows, changed_rows = _merge_rows(previous_rows, selected)
 
     _assert_unique(rows)
     _validate_urls(rows)
@@ -274,29 +825,30 @@ def build_sec_filings_index(context: PipelineContext, force: bool = False) -> St
         non_empty = sum(1 for row in rows if row.get("source_url"))
         if non_empty / len(rows) < 0.99:
             raise ValueError("SEC filings index has too many empty source URLs.")
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    fieldnames = [
-        "cik",
-        "filing_year",
-        "source_url",
-        "file_path",
-        "form",
-        "filing_date",
-        "report_date",
-        "accession_number",
-        "primary_document",
-        "archive_dir",
-        "company_name_sec",
-    ]
-    with output_path.open("w", newline="", encoding="utf-8") as handle:
-        writer = csv.DictWriter(handle, fieldnames=fieldnames)
-        writer.writeheader()
-        if rows:
-            writer.writerows(rows)
+    write_filings_index(rows, output_path)
+    write_json(
+        state_path,
+        {
+            "index_source": index_source,
+            "updated_at": datetime.now(timezone.utc).isoformat(),
+            "ciks": {**marks, **_high_water_marks(fresh)},
+        },
+    )
 
     qc_payload: dict[str, Any] = {
         "rows": len(rows),
         "output": str(output_path),
+        "table": str(table_path),
+        "index_source": index_source,
+        "skipped_submission_pages": skipped_pages,
+        "missing_submissions": missing_submissions,
+        "unresolved_documents": unresolved_documents,
+        "incremental": {
+            "enabled": incremental,
+            "refreshed_ciks": len(refreshed_ciks),
+            "added": added_rows,
+            "changed": changed_rows,
+        },
         "index_sha256": sha256_file(output_path) if output_path.exists() else None,
         "run_timestamp": datetime.now(timezone.utc).isoformat(),
         "dictionary_sha256": sha256_file(
@@ -305,21 +857,35 @@ def build_sec_filings_index(context: PipelineContext, force: bool = False) -> St
     }
 
     warnings: list[str] = []
-    if rows:
-        sampled = _sample_urls(
-            [row["source_url"] for row in rows if row.get("source_url")],
-            headers,
-            rps,
-            sample_size=25,
+    if missing_submissions:
+        warnings.append(
+            f"{len(missing_submissions)} submissions files missing from the bulk archive"
+        )
+    if unresolved_documents:
+        warnings.append(
+            f"{len(unresolved_documents)} filings without a primary document in their index page"
         )
+    if rows:
+        with network_session(settings):
+            sampled = _sample_urls(
+                [row["source_url"] for row in rows if row.get("source_url")],
+                headers,
+                rps,
+                settings.pipeline.sec.url_sample_size,
+                settings.sec.concurrent_downloads,
+            )
         qc_payload["sampled_urls"] = sampled
+        reachable = 0
         for entry in sampled:
             status = entry.get("status_code")
             content_type = (entry.get("content_type") or "").lower()
-            if status != 200:
+            if status not in (200, 206):
                 warnings.append(f"Non-200 status for sample URL: {entry.get('url')}")
-            if status == 200 and not ("html" in content_type or "text" in content_type):
+                continue
+            reachable += 1
+            if not ("html" in content_type or "text" in content_type):
                 warnings.append(f"Unexpected content-type for sample URL: {entry.get('url')}")
+        qc_payload["url_checks"] = {"checked": len(sampled), "reachable": reachable}
 
     qc_path = settings.paths.outputs_dir / "qc" / "sec_index.json"
     write_json(qc_path, qc_payload)
@@ -327,7 +893,7 @@ def build_sec_filings_index(context: PipelineContext, force: bool = False) -> St
     result = StageResult(
         name="sec_index",
         status="completed",
-        outputs=[str(output_path), str(universe_path)],
+        outputs=[str(output_path), str(table_path), str(universe_path)],
         qc_path=str(qc_path),
         stats=qc_payload,
         warnings=warnings,
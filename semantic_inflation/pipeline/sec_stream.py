@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+from concurrent.futures import Executor, ProcessPoolExecutor
+from contextlib import closing
+import multiprocessing
+import queue
+import threading
+from typing import Any, Iterator
+
+from semantic_inflation.pipeline.context import PipelineContext
+from semantic_inflation.pipeline.downloads import network_session
+from semantic_inflation.pipeline.features import (
+    FeatureJob,
+    collect_feature_rows,
+    feature_runner,
+    feature_workers,
+    features_inputs_hash,
+    features_output_path,
+    finalize_features,
+    load_feature_jobs,
+)
+from semantic_inflation.pipeline.scheduling import SizedJob, run_streaming
+from semantic_inflation.pipeline.sec import (
+    download_inputs_hash,
+    filing_destinations,
+    finalize_download,
+    load_filings_index,
+    materialize_filings,
+)
+from semantic_inflation.pipeline.state import (
+    StageResult,
+    should_skip_stage,
+    stage_manifest_path,
+)
+
+_DONE = object()
+
+
+def _process_executor(workers: int) -> Executor:
+    # The download thread is running while workers start, so avoid plain fork.
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        return ProcessPoolExecutor(
+            max_workers=workers, mp_context=multiprocessing.get_context("forkserver")
+        )
+    return ProcessPoolExecutor(max_workers=workers)
+
+
+def stream_sec_filings(
+    context: PipelineContext, force: bool = False
+) -> tuple[StageResult, StageResult]:
+    """Run ``sec_download`` and ``sec_features`` as one overlapping stage.
+
+    A download thread materializes filings and hands each one to the feature
+    workers through a bounded queue, so parsing starts while later filings are
+    still waiting on the SEC rate limit. Both stage manifests are written as if
+    the stages had run separately.
+    """
+    settings = context.settings
+    filings = load_filings_index(context)
+    outputs = filing_destinations(context, filings)
+    download_hash = download_inputs_hash(context, filings)
+    features_hash = features_inputs_hash(context)
+    features_output = features_output_path(context)
+    download_manifest = stage_manifest_path(settings.paths.outputs_dir, "sec_download")
+    features_manifest = stage_manifest_path(settings.paths.outputs_dir, "sec_features")
+    if should_skip_stage(
+        download_manifest, outputs, download_hash, force
+    ) and should_skip_stage(features_manifest, [features_output], features_hash, force):
+        return (
+            StageResult(
+                name="sec_download",
+                status="skipped",
+                outputs=[str(p) for p in outputs],
+                inputs_hash=download_hash,
+                stats={"skipped": True},
+            ),
+            StageResult(
+                name="sec_features",
+                status="skipped",
+                outputs=[str(features_output)],
+                inputs_hash=features_hash,
+                stats={"skipped": True},
+            ),
+        )
+
+    headers = {"User-Agent": settings.sec.resolved_user_agent()}
+    rps = min(settings.sec.max_requests_per_second, 10.0)
+    log_path = settings.paths.raw_dir / "_manifests" / "sec_filings.jsonl"
+    feature_jobs = load_feature_jobs(context, require_exists=False)
+
+    buffer: queue.Queue[Any] = queue.Queue(
+        maxsize=max(1, settings.pipeline.sec.stream_queue_size)
+    )
+    stop = threading.Event()
+    manifest_rows: list[dict[str, Any]] = []
+    received: list[SizedJob[FeatureJob]] = []
+
+    def _put(item: Any) -> None:
+        while not stop.is_set():
+            try:
+                buffer.put(item, timeout=0.5)
+                return
+            except queue.Full:
+                continue
+
+    def _produce() -> None:
+        workers = settings.sec.concurrent_downloads
+        try:
+            with network_session(settings), closing(
+                materialize_filings(
+                    filings,
+                    outputs,
+                    headers,
+                    rps,
+                    log_path,
+                    workers,
+                    trust_manifest=not force,
+                    hardlink=settings.pipeline.sec.hardlink_local_filings,
+                )
+            ) as materialized:
+                for key, job in enumerate(feature_jobs):
+                    if stop.is_set():
+                        return
+                    if key < len(filings):
+                        _, row = next(materialized)
+                        if row is not None:
+                            manifest_rows.append(row)
+                    if not job.file_path.exists():
+                        raise FileNotFoundError(f"Missing SEC filing: {job.file_path}")
+                    _put(SizedJob(key=key, size=job.file_path.stat().st_size, payload=job))
+        except BaseException as exc:
+            _put(exc)
+        else:
+            _put(_DONE)
+
+    def _source() -> Iterator[SizedJob[FeatureJob]]:
+        while True:
+            item = buffer.get()
+            if item is _DONE:
+                return
+            if isinstance(item, BaseException):
+                raise item
+            received.append(item)
+            yield item
+
+    producer = threading.Thread(target=_produce, name="sec-stream-download", daemon=True)
+    producer.start()
+    workers = feature_workers(settings)
+    try:
+        with feature_runner(settings, workers) as (func, executor_factory):
+            results, schedule = run_streaming(
+                _source(),
+                func,
+                workers=workers,
+                executor_factory=executor_factory or _process_executor,
+            )
+    finally:
+        stop.set()
+        producer.join()
+
+    download_result = finalize_download(context, outputs, manifest_rows, download_hash)
+    rows, failures = collect_feature_rows(received, results)
+    features_result = finalize_features(context, rows, failures, schedule, features_hash)
+    return download_result, features_result
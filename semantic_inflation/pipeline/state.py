@@ -28,6 +28,42 @@ def stage_manifest_path(outputs_dir: Path, stage: str) -> Path:
     return outputs_dir / "qc" / f"stage_{stage}.json"
 
 
+# Settings that change how inputs are fetched, cached, scheduled or checked,
+# or how a stage is run, but not what it produces; they are left out of stage
+# input hashes.
+_TRANSPORT_SETTINGS = {
+    "runtime": (
+        "refresh",
+        "host_max_requests_per_second",
+        "shared_rate_limit_dir",
+        "http_standin_url",
+    ),
+    "pipeline.sec": (
+        "stream_features",
+        "stream_queue_size",
+        "submissions_max_age_hours",
+        "incremental",
+        "url_sample_size",
+        "hardlink_local_filings",
+    ),
+    "pipeline.features": ("max_workers", "scheduler", "telemetry"),
+    "pipeline.ghgrp": ("max_age_hours",),
+    "pipeline.echo": ("max_age_hours",),
+}
+
+
+def stage_config(settings: Any) -> dict[str, Any]:
+    """Return ``settings`` as JSON for a stage input hash, minus transport-only knobs."""
+    config = settings.model_dump(mode="json")
+    for section, keys in _TRANSPORT_SETTINGS.items():
+        values = config
+        for part in section.split("."):
+            values = values.get(part, {})
+        for key in keys:
+            values.pop(key, None)
+    return config
+
+
 def compute_inputs_hash(payload: dict[str, Any]) -> str:
     raw = json.dumps(payload, sort_keys=True, default=str).encode("utf-8")
     return hashlib.sha256(raw).hexdigest()
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+from pathlib import Path
+import sys
+from typing import Any
+
+import pandas as pd
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - Windows has no getrusage
+    resource = None  # type: ignore[assignment]
+
+TIMING_COLUMNS = [
+    "read_seconds",
+    "extract_seconds",
+    "split_seconds",
+    "classify_seconds",
+    "hash_seconds",
+    "total_seconds",
+]
+_CLEAR_REFS = Path("/proc/self/clear_refs")
+_STATUS = Path("/proc/self/status")
+
+
+def reset_peak_rss() -> None:
+    # Linux lets a process reset its RSS high-water mark, which turns the
+    # process-lifetime peak into a per-filing peak for reused workers.
+    try:
+        _CLEAR_REFS.write_text("5", encoding="ascii")
+    except OSError:
+        pass
+
+
+def peak_rss_bytes() -> int | None:
+    try:
+        for line in _STATUS.read_text(encoding="ascii").splitlines():
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS and kilobytes elsewhere.
+    return int(peak if sys.platform == "darwin" else peak * 1024)
+
+
+def summarize_timings(timings: pd.DataFrame, wall_seconds: float) -> dict[str, Any]:
+    summary: dict[str, Any] = {
+        "docs": len(timings),
+        "wall_seconds": wall_seconds,
+        "docs_per_second": (len(timings) / wall_seconds) if wall_seconds > 0 else None,
+    }
+    if timings.empty:
+        return summary
+    total_bytes = int(timings["bytes"].sum())
+    summary["bytes"] = total_bytes
+    summary["megabytes_per_second"] = (
+        (total_bytes / 1_000_000) / wall_seconds if wall_seconds > 0 else None
+    )
+    for column in TIMING_COLUMNS + ["bytes", "sentences", "peak_rss_bytes"]:
+        if column not in timings.columns:
+            continue
+        values = pd.to_numeric(timings[column], errors="coerce").dropna()
+        if values.empty:
+            continue
+        quantiles = values.quantile([0.5, 0.95, 0.99])
+        summary[column] = {
+            "p50": float(quantiles.loc[0.5]),
+            "p95": float(quantiles.loc[0.95]),
+            "p99": float(quantiles.loc[0.99]),
+            "max": float(values.max()),
+        }
+    return summary
@@ -13,11 +13,13 @@ import pandas as pd
 from tenacity import retry, retry_if_exception, stop_after_attempt, wait_exponential
 
 from semantic_inflation.pipeline.context import PipelineContext
+from semantic_inflation.pipeline.downloads import get_client, network_session
 from semantic_inflation.pipeline.io import write_json
 from semantic_inflation.pipeline.state import (
     StageResult,
     compute_inputs_hash,
     should_skip_stage,
+    stage_config,
     stage_manifest_path,
     write_stage_manifest,
 )
@@ -45,10 +47,9 @@ def _should_retry(exc: BaseException) -> bool:
     reraise=True,
 )
 def _post_json(url: str, payload: dict[str, Any], headers: dict[str, str], timeout: float) -> dict[str, Any]:
-    with httpx.Client(headers=headers, timeout=timeout) as client:
-        response = client.post(url, json=payload)
-        response.raise_for_status()
-        return response.json()
+    response = get_client(url).post(url, json=payload, headers=headers, timeout=timeout)
+    response.raise_for_status()
+    return response.json()
 
 
 def _resolve_page_dir(context: PipelineContext) -> Path:
@@ -184,7 +185,7 @@ def download_usaspending_awards(context: PipelineContext, force: bool = False) -
     settings = context.settings
     output_path = _resolve_output_path(context)
     inputs_hash = compute_inputs_hash(
-        {"stage": "usaspending", "config": settings.model_dump(mode="json")}
+        {"stage": "usaspending", "config": stage_config(settings)}
     )
     manifest_path = stage_manifest_path(settings.paths.outputs_dir, "usaspending")
     if should_skip_stage(manifest_path, [output_path], inputs_hash, force):
@@ -222,62 +223,63 @@ def download_usaspending_awards(context: PipelineContext, force: bool = False) -
     page = start_page
     page_count = 0
     cache_key = _payload_cache_key(base_payload, page_size, api_url)
-    while True:
-        if max_pages is not None and page_count >= max_pages:
-            warnings.append(
-                f"USAspending download stopped after max_pages={max_pages} at page {page}."
-            )
-            break
-        payload = dict(base_payload)
-        payload["page"] = page
-        payload["limit"] = page_size
-        cache_path = page_dir / f"page_{page:04d}_{cache_key}.json"
-        page_result = _fetch_page(
-            api_url,
-            fallback_url,
-            payload,
-            headers,
-            timeout,
-            cache_path,
-            cache_pages,
-            warnings,
-        )
-        if page_result.api_url != api_url:
-            api_url = page_result.api_url
-            fallback_url = api_url.rstrip("/") if api_url.endswith("/") else f"{api_url}/"
-            cache_key = _payload_cache_key(base_payload, page_size, api_url)
-        page_payload = page_result.payload
-        page_results = page_payload.get("results", [])
-        if not isinstance(page_results, list):
-            raise ValueError(f"USAspending page {page} missing results list.")
-        records.extend(page_results)
-        page_count += 1
-        total_pages = total_pages or _infer_total_pages(page_payload, page_size)
-        status = "cached" if page_result.cached else "downloaded"
-        LOGGER.info(
-            "USAspending page %s %s with %s rows (cumulative %s)",
-            page,
-            status,
-            len(page_results),
-            len(records),
-        )
-        log_path.parent.mkdir(parents=True, exist_ok=True)
-        with log_path.open("a", encoding="utf-8") as handle:
-            handle.write(
-                json.dumps(
-                    {
-                        "page": page,
-                        "rows": len(page_results),
-                        "cached": page_result.cached,
-                        "total_pages": total_pages,
-                    },
-                    sort_keys=True,
+    with network_session(settings):
+        while True:
+            if max_pages is not None and page_count >= max_pages:
+                warnings.append(
+                    f"USAspending download stopped after max_pages={max_pages} at page {page}."
                 )
-                + "\n"
+                break
+            payload = dict(base_payload)
+            payload["page"] = page
+            payload["limit"] = page_size
+            cache_path = page_dir / f"page_{page:04d}_{cache_key}.json"
+            page_result = _fetch_page(
+                api_url,
+                fallback_url,
+                payload,
+                headers,
+                timeout,
+                cache_path,
+                cache_pages,
+                warnings,
+            )
+            if page_result.api_url != api_url:
+                api_url = page_result.api_url
+                fallback_url = api_url.rstrip("/") if api_url.endswith("/") else f"{api_url}/"
+                cache_key = _payload_cache_key(base_payload, page_size, api_url)
+            page_payload = page_result.payload
+            page_results = page_payload.get("results", [])
+            if not isinstance(page_results, list):
+                raise ValueError(f"USAspending page {page} missing results list.")
+            records.extend(page_results)
+            page_count += 1
+            total_pages = total_pages or _infer_total_pages(page_payload, page_size)
+            status = "cached" if page_result.cached else "downloaded"
+            LOGGER.info(
+                "USAspending page %s %s with %s rows (cumulative %s)",
+                page,
+                status,
+                len(page_results),
+                len(records),
             )
-        if not _has_next(page_payload, page, total_pages):
-            break
-        page += 1
+            log_path.parent.mkdir(parents=True, exist_ok=True)
+            with log_path.open("a", encoding="utf-8") as handle:
+                handle.write(
+                    json.dumps(
+                        {
+                            "page": page,
+                            "rows": len(page_results),
+                            "cached": page_result.cached,
+                            "total_pages": total_pages,
+                        },
+                        sort_keys=True,
+                    )
+                    + "\n"
+                )
+            if not _has_next(page_payload, page, total_pages):
+                break
+            page += 1
 
     df = pd.json_normalize(records)
     output_path.parent.mkdir(parents=True, exist_ok=True)
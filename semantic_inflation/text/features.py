@@ -3,6 +3,7 @@ from __future__ import annotations
 import hashlib
 import json
 import re
+import time
 from pathlib import Path
 
 from semantic_inflation.text.clean_html import html_to_text
@@ -23,7 +24,8 @@ def _file_sha256(path: Path) -> str:
     return h.hexdigest()
 
 
-def _read_filing_text(
+def _extract_filing_text(
+    raw: str,
     path: Path,
     *,
     html_extractor: str,
@@ -34,7 +36,6 @@ def _read_filing_text(
     table_cell_sep: str,
     table_row_sep: str,
 ) -> str:
-    raw = path.read_text(encoding="utf-8", errors="replace")
     if path.suffix.lower() in {".html", ".htm"}:
         return html_to_text(
             raw,
@@ -64,9 +65,15 @@ def compute_features_from_text(
     *,
     dictionary_version: str = "v1",
     min_sentence_chars: int = 10,
+    timings: dict[str, float] | None = None,
 ) -> dict:
     dicts = load_dictionaries(dictionary_version)
+    if timings is not None:
+        split_start = time.perf_counter()
     sentences = [s for s in split_sentences(text) if len(s) >= min_sentence_chars]
+    if timings is not None:
+        classify_start = time.perf_counter()
+        timings["split_seconds"] = classify_start - split_start
 
     env = [s for s in sentences if dicts.env_pattern.search(s)]
     kpi = [s for s in env if _is_kpi_sentence(s, dicts)]
@@ -87,6 +94,9 @@ def compute_features_from_text(
     q_share = (kpi_count / env_count) if env_count else 0.0
 
     env_words = sum(len(s.split()) for s in env)
+    if timings is not None:
+        timings["classify_seconds"] = time.perf_counter() - classify_start
+        timings["sentences"] = len(sentences)
 
     return {
         "dictionary_version": dicts.version,
@@ -113,9 +123,23 @@ def compute_features_from_file(
     keep_tables: bool = True,
     table_cell_sep: str = " | ",
     table_row_sep: str = "\n",
+    timings: dict[str, float] | None = None,
 ) -> dict:
+    """Compute features for one filing.
+
+    Pass a dict as ``timings`` to have it filled with per-phase wall-clock
+    seconds (read, extract, split, classify, hash) plus byte and sentence counts.
+    """
     p = Path(path)
-    text = _read_filing_text(
+    if timings is not None:
+        read_start = time.perf_counter()
+    raw = p.read_text(encoding="utf-8", errors="replace")
+    if timings is not None:
+        extract_start = time.perf_counter()
+        timings["read_seconds"] = extract_start - read_start
+        timings["bytes"] = p.stat().st_size
+    text = _extract_filing_text(
+        raw,
         p,
         html_extractor=html_extractor,
         drop_hidden=drop_hidden,
@@ -125,13 +149,20 @@ def compute_features_from_file(
         table_cell_sep=table_cell_sep,
         table_row_sep=table_row_sep,
     )
+    if timings is not None:
+        timings["extract_seconds"] = time.perf_counter() - extract_start
     feats = compute_features_from_text(
         text,
         dictionary_version=dictionary_version,
         min_sentence_chars=min_sentence_chars,
+        timings=timings,
     )
+    if timings is not None:
+        hash_start = time.perf_counter()
     feats["input_path"] = str(p)
     feats["input_sha256"] = _file_sha256(p)
+    if timings is not None:
+        timings["hash_seconds"] = time.perf_counter() - hash_start
     feats["html_extractor"] = html_extractor
     feats["html_extractor_settings"] = {
         "drop_hidden": drop_hidden,
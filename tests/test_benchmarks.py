@@ -0,0 +1,48 @@
+import unittest
+
+from semantic_inflation.benchmarks.runner import compare_to_baseline, run_benchmarks
+from semantic_inflation.benchmarks.synthetic import SyntheticFilingSpec, generate_filing_html
+
+
+class TestBenchmarks(unittest.TestCase):
+    def test_generator_is_deterministic_and_scales(self) -> None:
+        small = SyntheticFilingSpec(paragraphs=20)
+        self.assertEqual(generate_filing_html(small), generate_filing_html(small))
+        plain = generate_filing_html(SyntheticFilingSpec(paragraphs=20, ixbrl_density=0.0))
+        self.assertNotIn("ix:nonFraction", plain)
+        large = generate_filing_html(SyntheticFilingSpec(paragraphs=80, ixbrl_density=0.0))
+        self.assertGreater(len(large), 2 * len(plain))
+
+    def test_run_and_compare(self) -> None:
+        spec = SyntheticFilingSpec(paragraphs=10, table_density=0.5)
+        payload = run_benchmarks(spec, repeat=1)
+        self.assertIn("html_to_text[bs4]", payload["results"])
+        self.assertIn("compute_features_from_text", payload["results"])
+
+        slower = {
+            "spec": payload["spec"],
+            "results": {
+                name: {"median_seconds": result["median_seconds"] / 10}
+                for name, result in payload["results"].items()
+            },
+        }
+        statuses = {c["name"]: c["status"] for c in compare_to_baseline(payload, slower)}
+        self.assertEqual(statuses["split_sentences"], "regression")
+        self.assertEqual(
+            {c["status"] for c in compare_to_baseline(payload, payload)}, {"ok"}
+        )
+
+    def test_spec_mismatch_is_not_a_regression(self) -> None:
+        payload = run_benchmarks(SyntheticFilingSpec(paragraphs=10), repeat=1)
+        baseline = {
+            "spec": {**payload["spec"], "paragraphs": 400},
+            "results": {
+                name: {"median_seconds": result["median_seconds"] / 10}
+                for name, result in payload["results"].items()
+            },
+        }
+        comparison = compare_to_baseline(payload, baseline)
+        statuses = {c["name"]: c["status"] for c in comparison}
+        self.assertEqual(statuses.pop("spec"), "mismatch")
+        self.assertEqual(set(statuses.values()), {"incomparable"})
+        self.assertFalse(any("ratio" in c for c in comparison))
@@ -0,0 +1,345 @@
+import hashlib
+import json
+import multiprocessing
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+import threading
+import time
+from typing import ClassVar, Iterator
+
+import httpx
+import pytest
+
+from semantic_inflation.net import download as download_module
+from semantic_inflation.net.download import RateLimiter, client_pool, download_file, get_client
+from semantic_inflation.net.manifest import ManifestStore
+from semantic_inflation.net.rate_limit import SHARED_LIMITS_SUPPORTED, SharedRateLimiter
+
+
+def test_clients_are_shared_per_host_and_closed_with_pool() -> None:
+    with client_pool(2):
+        sec = get_client("https://www.sec.gov/Archives/edgar/data/1/a.htm")
+        assert get_client("https://www.sec.gov/cgi-bin/browse-edgar") is sec
+        data = get_client("https://data.sec.gov/submissions/CIK0000000001.json")
+        assert data is not sec
+        with client_pool(8):
+            assert get_client("https://www.sec.gov/other") is sec
+        assert not sec.is_closed
+    assert sec.is_closed and data.is_closed
+    assert get_client("https://www.sec.gov/x") is not sec
+
+
+def test_rate_limiter_enforces_rate_across_threads() -> None:
+    limiter = RateLimiter(40.0)
+    stamps: list[float] = []
+
+    def _worker() -> None:
+        for _ in range(5):
+            limiter.acquire()
+            stamps.append(time.monotonic())
+
+    threads = [threading.Thread(target=_worker) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    stamps.sort()
+    assert len(stamps) == 30
+    # 30 tokens at 40/s with a burst of one need at least 29 intervals.
+    assert stamps[-1] - stamps[0] >= 29 / 40 - 0.02
+
+
+class _Handler(BaseHTTPRequestHandler):
+    payload = bytes(range(256)) * 1200
+    fail_after: int | None = None
+    fail_once = False
+    supports_range = False
+    ranges: ClassVar[list[str | None]] = []
+    conditional: ClassVar[list[str | None]] = []
+    throttle_once = False
+
+    def do_GET(self) -> None:
+        if self.throttle_once:
+            type(self).throttle_once = False
+            self.send_response(429)
+            self.send_header("Retry-After", "0")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        requested = self.headers.get("Range")
+        type(self).ranges.append(requested)
+        type(self).conditional.append(self.headers.get("If-None-Match"))
+        if self.headers.get("If-None-Match") == '"v1"':
+            self.send_response(304)
+            self.send_header("ETag", '"v1"')
+            self.end_headers()
+            return
+        start = 0
+        if requested and self.supports_range:
+            start = int(requested.split("=", 1)[1].split("-", 1)[0])
+            self.send_response(206)
+            self.send_header(
+                "Content-Range", f"bytes {start}-{len(self.payload) - 1}/{len(self.payload)}"
+            )
+        else:
+            self.send_response(200)
+        body = self.payload[start:]
+        self.send_header("Content-Type", "application/zip")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", '"v1"')
+        self.end_headers()
+        if self.fail_after is not None:
+            body = body[: self.fail_after]
+            if self.fail_once:
+                type(self).fail_after = None
+        self.wfile.write(body)
+
+    def log_message(self, *args: object) -> None:
+        pass
+
+
+@pytest.fixture()
+def http_server() -> Iterator[ThreadingHTTPServer]:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+    _Handler.fail_after = None
+    _Handler.fail_once = False
+    _Handler.supports_range = False
+    _Handler.ranges = []
+    _Handler.conditional = []
+    _Handler.throttle_once = False
+
+
+def test_download_streams_to_part_and_renames(tmp_path: Path, http_server) -> None:
+    url = f"http://127.0.0.1:{http_server.server_address[1]}/case_downloads.zip"
+    destination = tmp_path / "case_downloads.zip"
+    with client_pool(1):
+        result = download_file(url, destination)
+    assert result.bytes_written == len(_Handler.payload)
+    assert result.sha256 == hashlib.sha256(_Handler.payload).hexdigest()
+    assert destination.read_bytes() == _Handler.payload
+    assert not (tmp_path / "case_downloads.zip.part").exists()
+
+
+def test_truncated_download_leaves_no_cache_entry(
+    tmp_path: Path, http_server, monkeypatch
+) -> None:
+    monkeypatch.setattr(download_module._stream_to_file.retry, "sleep", lambda _: None)
+    _Handler.fail_after = 1000
+    url = f"http://127.0.0.1:{http_server.server_address[1]}/frs_downloads.zip"
+    destination = tmp_path / "frs_downloads.zip"
+    with client_pool(1), pytest.raises(httpx.TransportError):
+        download_file(url, destination)
+    assert not destination.exists()
+
+
+def test_interrupted_download_resumes_with_range(
+    tmp_path: Path, http_server, monkeypatch
+) -> None:
+    monkeypatch.setattr(download_module._stream_to_file.retry, "sleep", lambda _: None)
+    _Handler.fail_after = 100_000
+    _Handler.fail_once = True
+    _Handler.supports_range = True
+    url = f"http://127.0.0.1:{http_server.server_address[1]}/data_summary.zip"
+    destination = tmp_path / "data_summary.zip"
+    with client_pool(1):
+        result = download_file(url, destination)
+    assert _Handler.ranges == [None, "bytes=100000-"]
+    assert result.sha256 == hashlib.sha256(_Handler.payload).hexdigest()
+    assert destination.read_bytes() == _Handler.payload
+    assert not list(tmp_path.glob("*.part*"))
+
+
+def test_resume_falls_back_to_full_download(tmp_path: Path, http_server) -> None:
+    destination = tmp_path / "frs_downloads.zip"
+    (tmp_path / "frs_downloads.zip.part").write_bytes(b"stale partial bytes")
+    url = f"http://127.0.0.1:{http_server.server_address[1]}/frs_downloads.zip"
+    with client_pool(1):
+        result = download_file(url, destination)
+    assert _Handler.ranges == ["bytes=19-"]
+    assert destination.read_bytes() == _Handler.payload
+    assert result.sha256 == hashlib.sha256(_Handler.payload).hexdigest()
+
+
+def test_refresh_sends_conditional_request(tmp_path: Path, http_server) -> None:
+    url = f"http://127.0.0.1:{http_server.server_address[1]}/CIK0000000001.json"
+    destination = tmp_path / "CIK0000000001.json"
+    with client_pool(1):
+        first = download_file(url, destination)
+        assert download_file(url, destination).cached
+        assert _Handler.conditional == [None]
+        refreshed = download_file(url, destination, revalidate=True)
+        expired = download_file(url, destination, max_age=0.0)
+    assert _Handler.conditional == [None, '"v1"', '"v1"']
+    assert refreshed.status_code == 304 and refreshed.cached
+    assert refreshed.sha256 == first.sha256 == expired.sha256
+    assert download_module.read_sidecar(destination)["etag"] == '"v1"'
+
+
+def test_cached_sha256_reuses_sidecar_until_file_changes(tmp_path: Path) -> None:
+    path = tmp_path / "case_downloads.zip"
+    path.write_bytes(b"a" * (3 << 20))
+    expected = hashlib.sha256(path.read_bytes()).hexdigest()
+    assert download_module.sha256_file(path) == expected
+    assert download_module.cached_sha256(path) == expected
+
+    meta = download_module.read_sidecar(path)
+    assert meta["size"] == path.stat().st_size
+    download_module.write_sidecar(path, {**meta, "sha256": "from-sidecar"})
+    assert download_module.cached_sha256(path) == "from-sidecar"
+
+    path.write_bytes(b"b" * 10)
+    assert download_module.cached_sha256(path) == hashlib.sha256(b"b" * 10).hexdigest()
+
+
+def test_manifest_store_upserts_batches_and_exports(tmp_path: Path) -> None:
+    store = ManifestStore(tmp_path / "downloads.sqlite", batch_size=2)
+    base = {"url": "https://www.sec.gov/a.htm", "path": "/data/a.htm", "bytes": 10}
+    store.record("sec_filings", {**base, "timestamp": "t1", "status_code": 200, "etag": '"e"'})
+    store.record("sec_filings", {**base, "timestamp": "t2", "status_code": 200, "cached": True})
+    store.record("echo_downloads", {"url": "u", "path": "/data/case.zip", "timestamp": "t3"})
+
+    rows = store.lookup(["/data/a.htm", "/data/missing.htm"])
+    assert list(rows) == ["/data/a.htm"]
+    row = rows["/data/a.htm"]
+    assert (row["first_seen"], row["timestamp"], row["etag"]) == ("t1", "t2", '"e"')
+    assert row["status"] == "cached"
+    assert set(store.lookup(log="echo_downloads")) == {"/data/case.zip"}
+
+    exported = tmp_path / "sec_filings.jsonl"
+    assert store.export_jsonl(exported, log="sec_filings") == 1
+    line = json.loads(exported.read_text(encoding="utf-8"))
+    assert line["cached"] is True and line["path"] == "/data/a.htm"
+    store.close()
+
+
+def test_limiters_are_keyed_by_host_with_configured_rates() -> None:
+    sec = download_module.get_limiter("https://www.sec.gov/Archives/a.htm", 8.0)
+    echo = download_module.get_limiter("https://echo.epa.gov/files/case.zip", 8.0)
+    assert sec is not echo
+    assert download_module.get_limiter("https://www.sec.gov/b.htm", 8.0) is sec
+    with client_pool(1, host_limits={"echo.epa.gov": 2.0}):
+        assert download_module.get_limiter("https://echo.epa.gov/x.zip", 8.0).max_rps == 2.0
+        assert download_module.get_limiter("https://www.sec.gov/c.htm", 8.0).max_rps == 8.0
+        # A configured limit caps the caller's rate but never raises it.
+        assert download_module.get_limiter("https://echo.epa.gov/y.zip", 1.0).max_rps == 1.0
+
+
+def test_sec_hosts_share_one_bucket_at_the_configured_rate(monkeypatch) -> None:
+    monkeypatch.setattr(download_module, "_LIMITERS", {})
+    with client_pool(2, host_limits={"sec.gov": 20.0}):
+        www = download_module.get_limiter("https://www.sec.gov/Archives/a.htm", 100.0)
+        data = download_module.get_limiter("https://data.sec.gov/submissions/a.json", 100.0)
+        assert www is data and www.max_rps == 20.0
+
+        stamps: list[float] = []
+
+        def _worker(limiter: RateLimiter) -> None:
+            for _ in range(8):
+                limiter.acquire()
+                stamps.append(time.monotonic())
+
+        threads = [threading.Thread(target=_worker, args=(lim,)) for lim in (www, data)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    stamps.sort()
+    # 16 requests across both hosts at 20/s with a burst of one need 15 intervals.
+    assert stamps[-1] - stamps[0] >= 15 / 20 - 0.02
+
+
+def test_adaptive_limiter_backs_off_and_recovers() -> None:
+    limiter = download_module.AdaptiveRateLimiter(8.0, min_rps=1.0, increase=2.0)
+    limiter.on_throttle(retry_after=0.2)
+    assert limiter.max_rps == 4.0 and limiter.ceiling == 8.0
+    start = time.monotonic()
+    limiter.acquire()
+    assert time.monotonic() - start >= 0.15
+    for _ in range(2):
+        # Wait out the cooldown so each throttle counts as a new decrease.
+        time.sleep(1.0 / limiter.max_rps + 0.01)
+        limiter.on_throttle()
+    assert limiter.max_rps == 1.0
+    for _ in range(200):
+        limiter.on_success()
+    assert limiter.max_rps == 8.0
+
+
+def test_concurrent_throttles_lower_the_rate_once() -> None:
+    limiter = download_module.AdaptiveRateLimiter(8.0, min_rps=0.5)
+    barrier = threading.Barrier(6)
+
+    def _throttled() -> None:
+        barrier.wait()
+        limiter.on_throttle()
+
+    threads = [threading.Thread(target=_throttled) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    # Six in-flight requests hit the same 429 burst: one halving, not 2**6.
+    assert limiter.max_rps == 4.0
+    time.sleep(1.0 / 4.0 + 0.01)
+    limiter.on_throttle()
+    assert limiter.max_rps == 2.0
+
+
+@pytest.mark.skipif(not SHARED_LIMITS_SUPPORTED, reason="flock is not available")
+def test_shared_limiter_lowers_the_rate_once_per_burst(tmp_path: Path) -> None:
+    limiter = SharedRateLimiter(tmp_path / "host.bucket", 8.0)
+    for _ in range(5):
+        limiter.on_throttle()
+    assert limiter.max_rps == 4.0
+
+
+def test_throttled_download_lowers_host_rate(tmp_path: Path, http_server, monkeypatch) -> None:
+    monkeypatch.setattr(download_module._stream_to_file.retry, "sleep", lambda _: None)
+    _Handler.throttle_once = True
+    url = f"http://127.0.0.1:{http_server.server_address[1]}/throttled.zip"
+    with client_pool(1, host_limits={"127.0.0.1": 50.0}):
+        result = download_file(url, tmp_path / "throttled.zip", max_rps=50.0)
+        limiter = download_module.get_limiter(url, 50.0)
+    assert result.bytes_written == len(_Handler.payload)
+    assert limiter.ceiling == 50.0
+    assert 25.0 <= limiter.max_rps < 50.0
+
+
+def _acquire_shared(path: str, count: int, stamps) -> None:
+    limiter = SharedRateLimiter(Path(path), 20.0)
+    for _ in range(count):
+        limiter.acquire()
+        stamps.put(time.time())
+
+
+@pytest.mark.skipif(not SHARED_LIMITS_SUPPORTED, reason="flock is not available")
+def test_shared_limiter_enforces_rate_across_processes(tmp_path: Path) -> None:
+    ctx = multiprocessing.get_context("spawn")
+    stamps = ctx.Queue()
+    bucket = str(tmp_path / "www.sec.gov.bucket")
+    processes = [ctx.Process(target=_acquire_shared, args=(bucket, 5, stamps)) for _ in range(3)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join(timeout=30)
+        assert process.exitcode == 0
+    times = sorted(stamps.get(timeout=5) for _ in range(15))
+    # 15 tokens at 20/s with a burst of one need at least 14 intervals.
+    assert times[-1] - times[0] >= 14 / 20 - 0.05
+
+
+@pytest.mark.skipif(not SHARED_LIMITS_SUPPORTED, reason="flock is not available")
+def test_shared_limiter_shares_throttling(tmp_path: Path) -> None:
+    first = SharedRateLimiter(tmp_path / "data.sec.gov.bucket", 8.0)
+    second = SharedRateLimiter(tmp_path / "data.sec.gov.bucket", 8.0)
+    first.on_throttle(retry_after=0.3)
+    assert second.max_rps == 4.0
+    start = time.monotonic()
+    second.acquire()
+    assert time.monotonic() - start >= 0.25
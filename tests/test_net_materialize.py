@@ -0,0 +1,70 @@
+import errno
+import hashlib
+import os
+from pathlib import Path
+
+import pytest
+
+from semantic_inflation.net import materialize as materialize_module
+from semantic_inflation.net.download import cached_sha256
+from semantic_inflation.net.materialize import materialize_file
+
+_PAYLOAD = b"<html>" + b"Scope 2 emissions fell. " * 50_000 + b"</html>"
+
+
+@pytest.fixture
+def source(tmp_path: Path) -> Path:
+    path = tmp_path / "mirror" / "filing.htm"
+    path.parent.mkdir()
+    path.write_bytes(_PAYLOAD)
+    return path
+
+
+@pytest.fixture
+def no_reflink(monkeypatch) -> None:
+    def _unsupported(source: Path, tmp_path: Path) -> None:
+        raise OSError(errno.EOPNOTSUPP, "no reflinks here")
+
+    monkeypatch.setattr(materialize_module, "_reflink", _unsupported)
+
+
+def test_hardlink_shares_the_mirror_file(tmp_path: Path, source: Path) -> None:
+    result = materialize_file(source, tmp_path / "out" / "filing.htm")
+    assert result.method == "hardlink"
+    assert os.path.samefile(source, result.path)
+    assert result.sha256 == hashlib.sha256(_PAYLOAD).hexdigest()
+    assert result.bytes_written == len(_PAYLOAD)
+    assert not result.path.with_name("filing.htm.tmp").exists()
+
+
+def test_unknown_hash_streams_once_and_known_hash_uses_kernel_copy(
+    tmp_path: Path, source: Path, no_reflink: None, monkeypatch
+) -> None:
+    expected = hashlib.sha256(_PAYLOAD).hexdigest()
+    streamed = materialize_file(source, tmp_path / "a.htm", hardlink=False)
+    assert streamed.method == "stream" and streamed.sha256 == expected
+
+    # A sidecar hash from the mirror (still matching size and mtime) is trusted.
+    assert cached_sha256(source) == expected
+    monkeypatch.setattr(
+        materialize_module, "sha256_file", lambda path: pytest.fail("copy was re-hashed")
+    )
+    copied = materialize_file(source, tmp_path / "b.htm", hardlink=False)
+    assert copied.method in {"copy_file_range", "stream"}
+    assert copied.sha256 == expected
+    assert copied.path.read_bytes() == _PAYLOAD
+    assert not os.path.samefile(source, copied.path)
+
+
+def test_cross_device_link_falls_back(
+    tmp_path: Path, source: Path, no_reflink: None, monkeypatch
+) -> None:
+    def _exdev(src: Path, dst: Path) -> None:
+        raise OSError(errno.EXDEV, "cross-device link")
+
+    monkeypatch.setattr(materialize_module, "_hardlink", _exdev)
+    expected = hashlib.sha256(_PAYLOAD).hexdigest()
+    result = materialize_file(source, tmp_path / "c.htm", sha256=expected)
+    assert result.method in {"copy_file_range", "stream"}
+    assert result.sha256 == expected
+    assert result.path.read_bytes() == _PAYLOAD
@@ -0,0 +1,226 @@
+import hashlib
+import json
+from pathlib import Path
+from typing import Iterator
+
+import httpx
+import pandas as pd
+import pytest
+
+from semantic_inflation.config import load_settings
+from semantic_inflation.net import download as download_module
+from semantic_inflation.net.download import check_url, client_pool, download_file, get_client
+from semantic_inflation.net.rate_limit import SHARED_LIMITS_SUPPORTED, SharedRateLimiter
+from semantic_inflation.net.standin import StandinOptions, StandinServer, cassette_path
+from semantic_inflation.pipeline import PipelineContext
+from semantic_inflation.pipeline.parent_to_cik import build_parent_to_cik
+
+_SUBMISSIONS_URL = "https://data.sec.gov/submissions/CIK0000320193.json"
+_FILING_URL = "https://www.sec.gov/Archives/edgar/data/320193/000032019323000106/aapl-20230930.htm"
+
+
+@pytest.fixture(autouse=True)
+def _fresh_limiters(monkeypatch) -> None:
+    # Injected throttling adapts the per-host limiters; keep it out of other tests.
+    monkeypatch.setattr(download_module, "_LIMITERS", {})
+
+
+@pytest.fixture
+def cassette(tmp_path: Path) -> Path:
+    root = tmp_path / "cassette"
+    submissions = root / "data.sec.gov" / "submissions" / "CIK0000320193.json"
+    submissions.parent.mkdir(parents=True)
+    submissions.write_text(json.dumps({"cik": "320193", "filings": {}}), encoding="utf-8")
+    filing = root / "www.sec.gov" / _FILING_URL.split("://www.sec.gov/", 1)[1]
+    filing.parent.mkdir(parents=True)
+    filing.write_bytes(b"<html><body>" + b"Scope 1 emissions. " * 4000 + b"</body></html>")
+    return root
+
+
+@pytest.fixture
+def standin(cassette: Path) -> Iterator[StandinServer]:
+    with StandinServer(cassette) as server:
+        yield server
+
+
+def test_standin_replays_cassette_through_pooled_clients(
+    tmp_path: Path, cassette: Path, standin: StandinServer
+) -> None:
+    log_path = tmp_path / "manifests" / "sec.jsonl"
+    with client_pool(2, standin_url=standin.url):
+        result = download_file(
+            _SUBMISSIONS_URL, tmp_path / "sub.json", headers={}, max_rps=50, manifest_path=log_path
+        )
+        assert result.status_code == 200
+        assert json.loads((tmp_path / "sub.json").read_text())["cik"] == "320193"
+        assert result.content_type == "application/json"
+
+        refreshed = download_file(
+            _SUBMISSIONS_URL,
+            tmp_path / "sub.json",
+            headers={},
+            max_rps=50,
+            manifest_path=log_path,
+            revalidate=True,
+        )
+        assert refreshed.status_code == 304
+
+        missing = get_client(_FILING_URL).get(_FILING_URL.replace("aapl", "msft"))
+        assert missing.status_code == 404
+    assert standin.stats.statuses == {200: 1, 304: 1, 404: 1}
+
+
+def test_standin_injected_faults_are_retried(
+    tmp_path: Path, cassette: Path, monkeypatch
+) -> None:
+    monkeypatch.setattr(download_module._stream_to_file.retry, "sleep", lambda _: None)
+    options = StandinOptions(
+        retry_after_seconds=0, failure_rate=0.3, truncate_rate=0.3, seed=3
+    )
+    expected = (cassette / "www.sec.gov" / _FILING_URL.split("://www.sec.gov/", 1)[1]).read_bytes()
+    with StandinServer(cassette, options) as server, client_pool(2, standin_url=server.url):
+        for attempt in range(4):
+            dest = tmp_path / f"filing-{attempt}.htm"
+            download_file(_FILING_URL, dest, headers={}, max_rps=100, manifest_path=None)
+            assert dest.read_bytes() == expected
+        stats = server.stats
+    assert stats.statuses.get(503, 0) + stats.truncated > 0
+    # A truncated body resumes with a Range request instead of starting over.
+    assert stats.truncated == 0 or stats.statuses.get(206, 0) > 0
+
+
+def test_standin_throttles_above_configured_rate(cassette: Path) -> None:
+    options = StandinOptions(max_requests_per_second=1.0, retry_after_seconds=2)
+    with StandinServer(cassette, options) as server, client_pool(1, standin_url=server.url):
+        client = get_client(_SUBMISSIONS_URL)
+        first = client.get(_SUBMISSIONS_URL)
+        second = client.get(_SUBMISSIONS_URL)
+    assert first.status_code == 200
+    assert second.status_code == 429
+    assert second.headers["Retry-After"] == "2"
+
+
+def test_standin_keys_post_pages_by_body(tmp_path: Path) -> None:
+    url = "https://api.usaspending.gov/api/v2/search/spending_by_award/"
+    body = json.dumps({"page": 2}).encode("utf-8")
+    path = cassette_path(
+        tmp_path, "POST", "api.usaspending.gov", "/api/v2/search/spending_by_award/", body=body
+    )
+    path.parent.mkdir(parents=True)
+    path.write_text(json.dumps({"results": [{"id": 2}]}), encoding="utf-8")
+    assert path.name == f"index__post{hashlib.sha256(body).hexdigest()[:16]}"
+
+    with StandinServer(tmp_path) as server, client_pool(1, standin_url=server.url):
+        client = get_client(url)
+        hit = client.post(url, content=body, headers={"Content-Type": "application/json"})
+        miss = client.post(url, content=b'{"page": 3}')
+    assert hit.json() == {"results": [{"id": 2}]}
+    assert miss.status_code == 404
+
+
+def test_check_url_uses_head_and_falls_back_to_ranged_get(cassette: Path) -> None:
+    with StandinServer(cassette) as server, client_pool(2, standin_url=server.url):
+        checked = check_url(_FILING_URL, max_rps=50)
+        missing = check_url(_FILING_URL.replace("aapl", "msft"), max_rps=50)
+        head_stats = server.stats.to_dict()
+    assert checked["method"] == "HEAD" and checked["status_code"] == 200
+    assert checked["content_type"] == "text/html"
+    assert missing["status_code"] == 404
+    assert head_stats["bytes_sent"] == 0
+
+    options = StandinOptions(allow_head=False)
+    with StandinServer(cassette, options) as server, client_pool(2, standin_url=server.url):
+        fallback = check_url(_FILING_URL, max_rps=50)
+        stats = server.stats
+    assert fallback["method"] == "GET" and fallback["status_code"] == 206
+    assert stats.statuses == {405: 1, 206: 1}
+    assert stats.bytes_sent == 1024
+
+
+def test_record_mode_saves_a_get_body_for_a_head_miss(tmp_path: Path) -> None:
+    body = b"<html>" + b"Recorded filing. " * 100 + b"</html>"
+    upstream_methods: list[str] = []
+
+    def _upstream(request: httpx.Request) -> httpx.Response:
+        upstream_methods.append(request.method)
+        content = b"" if request.method == "HEAD" else body
+        return httpx.Response(200, content=content, headers={"Content-Type": "text/html"})
+
+    server = StandinServer(tmp_path, StandinOptions(record=True))
+    server._server._upstream = httpx.Client(transport=httpx.MockTransport(_upstream))
+    with server, client_pool(1, standin_url=server.url):
+        client = get_client(_FILING_URL)
+        head = client.head(_FILING_URL)
+        get = client.get(_FILING_URL)
+    assert head.status_code == 200 and head.headers["Content-Length"] == str(len(body))
+    assert get.content == body
+    assert upstream_methods == ["GET"]
+    recorded = tmp_path / "www.sec.gov" / _FILING_URL.split("://www.sec.gov/", 1)[1]
+    assert recorded.read_bytes() == body
+    assert not list(recorded.parent.glob("*.tmp"))
+
+
+def test_shifted_range_reply_restarts_the_download(
+    tmp_path: Path, cassette: Path, monkeypatch
+) -> None:
+    monkeypatch.setattr(download_module._stream_to_file.retry, "sleep", lambda _: None)
+    expected = (cassette / "www.sec.gov" / _FILING_URL.split("://www.sec.gov/", 1)[1]).read_bytes()
+    dest = tmp_path / "filing.htm"
+    dest.with_name("filing.htm.part").write_bytes(expected[:1000])
+    options = StandinOptions(range_shift=10)
+    with StandinServer(cassette, options) as server, client_pool(1, standin_url=server.url):
+        download_file(_FILING_URL, dest, headers={}, max_rps=100, manifest_path=None)
+        statuses = dict(server.stats.statuses)
+    assert dest.read_bytes() == expected
+    assert statuses == {206: 1, 200: 1}
+    assert not dest.with_name("filing.htm.part").exists()
+
+
+@pytest.mark.skipif(not SHARED_LIMITS_SUPPORTED, reason="shared buckets need fcntl")
+def test_parent_to_cik_uses_the_standin_and_shared_sec_bucket(
+    tmp_path: Path, cassette: Path, standin: StandinServer, monkeypatch
+) -> None:
+    tickers = cassette / "www.sec.gov" / "files" / "company_tickers.json"
+    tickers.parent.mkdir(parents=True)
+    tickers.write_text(
+        json.dumps({"0": {"cik_str": 320193, "ticker": "AAPL", "title": "Apple Inc."}}),
+        encoding="utf-8",
+    )
+    shared_dir = tmp_path / "buckets"
+    config_path = tmp_path / "pipeline.toml"
+    config_path.write_text(
+        f"""
+[sec]
+user_agent = "Test Researcher (test@example.com)"
+
+[paths]
+data_dir = "{tmp_path / 'data'}"
+outputs_dir = "{tmp_path / 'outputs'}"
+
+[runtime]
+shared_rate_limit_dir = "{shared_dir}"
+http_standin_url = "{standin.url}"
+""",
+        encoding="utf-8",
+    )
+    settings = load_settings(config_path)
+    settings.paths.processed_dir.mkdir(parents=True)
+    pd.DataFrame(
+        {"ghgrp_facility_id": ["1"], "parent_company_name_raw": ["Apple Inc"]}
+    ).to_parquet(settings.paths.processed_dir / "ghgrp_parent_companies.parquet")
+
+    limiters: list[object] = []
+    get_limiter = download_module.get_limiter
+
+    def _spy(url: str, max_rps: float):
+        limiter = get_limiter(url, max_rps)
+        limiters.append(limiter)
+        return limiter
+
+    monkeypatch.setattr(download_module, "get_limiter", _spy)
+    result = build_parent_to_cik(PipelineContext(settings), force=True)
+    assert result.status == "completed"
+    assert standin.stats.statuses == {200: 1}
+    assert limiters and all(isinstance(limiter, SharedRateLimiter) for limiter in limiters)
+    assert (shared_dir / "sec.gov.bucket").exists()
+    assert not download_module._CLIENTS
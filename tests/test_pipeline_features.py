@@ -0,0 +1,239 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+import csv
+from pathlib import Path
+import time
+
+import pandas as pd
+
+from semantic_inflation.config import load_settings
+from semantic_inflation.pipeline import PipelineContext
+from semantic_inflation.pipeline.features import compute_sec_features
+from semantic_inflation.pipeline.guarded import LIMIT_STATUSES, GuardedPool, run_guarded
+from semantic_inflation.pipeline.scheduling import SizedJob, order_jobs, run_scheduled
+from semantic_inflation.pipeline.sec import download_sec_filings
+from semantic_inflation.pipeline.sec_stream import stream_sec_filings
+
+
+def _write_index(tmp_path: Path, repo_root: Path, copies: int) -> Path:
+    fixture = repo_root / "data" / "fixtures" / "sample_filing.html"
+    filings_dir = tmp_path / "filings"
+    filings_dir.mkdir(parents=True, exist_ok=True)
+    index_path = tmp_path / "filings_index.csv"
+    with index_path.open("w", newline="", encoding="utf-8") as handle:
+        writer = csv.DictWriter(handle, fieldnames=["cik", "filing_year", "file_path"])
+        writer.writeheader()
+        for idx in range(copies):
+            # Vary sizes so the scheduler has something to order.
+            path = filings_dir / f"filing_{idx}.html"
+            path.write_text(fixture.read_text(encoding="utf-8") * (idx + 1), encoding="utf-8")
+            writer.writerow(
+                {"cik": f"{idx:010d}", "filing_year": 2010 + idx, "file_path": str(path)}
+            )
+    return index_path
+
+
+def _write_config(tmp_path: Path, index_path: Path, workers: int) -> Path:
+    config_path = tmp_path / "pipeline.toml"
+    config_path.parent.mkdir(parents=True, exist_ok=True)
+    config_path.write_text(
+        """
+[sec]
+user_agent = "Test Researcher (test@example.com)"
+
+[paths]
+data_dir = "{data_dir}"
+outputs_dir = "{outputs_dir}"
+
+[pipeline.sec]
+filings_index_path = "{filings_index}"
+
+[pipeline.features]
+max_workers = {workers}
+
+[runtime]
+offline = true
+""".format(
+            data_dir=tmp_path / "data",
+            outputs_dir=tmp_path / "outputs",
+            filings_index=index_path,
+            workers=workers,
+        ),
+        encoding="utf-8",
+    )
+    return config_path
+
+
+def test_order_jobs_longest_first() -> None:
+    jobs = [SizedJob(key=i, size=size, payload=i) for i, size in enumerate([5, 50, 1, 50])]
+    assert [job.key for job in order_jobs(jobs, "lpt")] == [1, 3, 0, 2]
+    assert [job.key for job in order_jobs(jobs, "index")] == [0, 1, 2, 3]
+
+
+def test_run_scheduled_returns_key_order() -> None:
+    jobs = [SizedJob(key=i, size=i, payload=i) for i in range(10)]
+    started: list[int] = []
+    results, report = run_scheduled(
+        jobs,
+        lambda value: started.append(value) or value * 2,
+        workers=2,
+        executor_factory=lambda n: ThreadPoolExecutor(max_workers=n),
+    )
+    assert results == [i * 2 for i in range(10)]
+    assert set(started[:2]) == {9, 8}
+    assert report.jobs == 10
+    assert report.workers == 2
+    assert 0.0 <= report.utilization <= 1.0
+
+
+def test_sec_features_parallel_matches_serial(tmp_path: Path) -> None:
+    repo_root = Path(__file__).resolve().parents[1]
+    index_path = _write_index(tmp_path, repo_root, copies=4)
+
+    serial = load_settings(_write_config(tmp_path / "serial", index_path, workers=1))
+    parallel = load_settings(_write_config(tmp_path / "parallel", index_path, workers=2))
+    serial_result = compute_sec_features(PipelineContext(serial), force=True)
+    parallel_result = compute_sec_features(PipelineContext(parallel), force=True)
+
+    serial_df = pd.read_parquet(serial.paths.processed_dir / "sec_features.parquet")
+    parallel_df = pd.read_parquet(parallel.paths.processed_dir / "sec_features.parquet")
+    pd.testing.assert_frame_equal(serial_df, parallel_df)
+    assert list(parallel_df["cik"]) == [f"{idx:010d}" for idx in range(4)]
+    assert parallel_result.stats["schedule"]["workers"] == 2
+    assert serial_result.stats["schedule"]["jobs"] == 4
+
+
+def test_sec_download_restores_deleted_output(tmp_path: Path) -> None:
+    repo_root = Path(__file__).resolve().parents[1]
+    index_path = _write_index(tmp_path, repo_root, copies=3)
+    settings = load_settings(_write_config(tmp_path, index_path, workers=2))
+    first = download_sec_filings(PipelineContext(settings), force=True)
+    missing = Path(first.outputs[1])
+    missing.unlink()
+
+    # The manifest still lists the file; the stage must not trust it blindly.
+    second = download_sec_filings(PipelineContext(settings))
+    assert second.status == "completed"
+    assert missing.exists()
+    assert compute_sec_features(PipelineContext(settings), force=True).status == "completed"
+
+
+def test_transport_settings_do_not_invalidate_stages(tmp_path: Path) -> None:
+    repo_root = Path(__file__).resolve().parents[1]
+    index_path = _write_index(tmp_path, repo_root, copies=2)
+    settings = load_settings(_write_config(tmp_path, index_path, workers=1))
+    assert compute_sec_features(PipelineContext(settings), force=True).status == "completed"
+
+    changes = [
+        (settings.runtime, "refresh", True),
+        (settings.runtime, "http_standin_url", "http://127.0.0.1:8765"),
+        (settings.runtime, "shared_rate_limit_dir", tmp_path / "buckets"),
+        (settings.runtime, "host_max_requests_per_second", {"sec.gov": 2.0}),
+        (settings.pipeline.sec, "stream_features", True),
+        (settings.pipeline.sec, "stream_queue_size", 8),
+        (settings.pipeline.sec, "submissions_max_age_hours", 24.0),
+        (settings.pipeline.sec, "incremental", True),
+        (settings.pipeline.sec, "url_sample_size", None),
+        (settings.pipeline.sec, "hardlink_local_filings", False),
+        (settings.pipeline.features, "max_workers", 2),
+        (settings.pipeline.features, "scheduler", "index"),
+        (settings.pipeline.features, "telemetry", True),
+        (settings.pipeline.ghgrp, "max_age_hours", 24.0),
+        (settings.pipeline.echo, "max_age_hours", 24.0),
+    ]
+    for section, name, value in changes:
+        setattr(section, name, value)
+        status = compute_sec_features(PipelineContext(settings)).status
+        assert status == "skipped", name
+
+    settings.text.min_sentence_chars += 1
+    assert compute_sec_features(PipelineContext(settings)).status == "completed"
+
+
+def _limited_job(payload: str, options: dict) -> dict:
+    if options["html_extractor"] == "bs4" and payload != "plain":
+        if payload == "slow":
+            time.sleep(30)
+        if payload == "huge":
+            blob = bytearray(4 * 1024 * 1024 * 1024)
+            return {"bytes": len(blob)}
+    return {"payload": payload, "html_extractor": options["html_extractor"]}
+
+
+def test_guarded_retries_with_fallback_extractor() -> None:
+    with GuardedPool(1, memory_limit_mb=2048) as pool:
+        for payload in ["slow", "huge", "plain"]:
+            outcome = run_guarded(
+                _limited_job,
+                payload,
+                {"html_extractor": "bs4"},
+                fallback_options={"html_extractor": "htmlparser"},
+                pool=pool,
+                timeout_seconds=2.0,
+            )
+            if payload == "plain":
+                assert outcome.result == {"payload": "plain", "html_extractor": "bs4"}
+                assert not outcome.attempts
+                continue
+            assert outcome.result == {"payload": payload, "html_extractor": "htmlparser"}
+            assert outcome.attempts[0]["status"] in LIMIT_STATUSES
+
+
+def test_guarded_reports_unrecovered_failure() -> None:
+    with GuardedPool(1, memory_limit_mb=None) as pool:
+        outcome = run_guarded(
+            _limited_job,
+            "slow",
+            {"html_extractor": "bs4"},
+            fallback_options=None,
+            pool=pool,
+            timeout_seconds=0.5,
+        )
+    assert outcome.failed
+    assert [attempt["status"] for attempt in outcome.attempts] == ["timeout"]
+
+
+def test_sec_features_telemetry_side_table(tmp_path: Path) -> None:
+    repo_root = Path(__file__).resolve().parents[1]
+    index_path = _write_index(tmp_path, repo_root, copies=3)
+    config_path = _write_config(tmp_path, index_path, workers=1)
+    config_path.write_text(
+        config_path.read_text(encoding="utf-8").replace(
+            "[pipeline.features]", "[pipeline.features]\ntelemetry = true"
+        ),
+        encoding="utf-8",
+    )
+    settings = load_settings(config_path)
+    result = compute_sec_features(PipelineContext(settings), force=True)
+
+    features = pd.read_parquet(settings.paths.processed_dir / "sec_features.parquet")
+    timings = pd.read_parquet(settings.paths.processed_dir / "sec_features_timings.parquet")
+    assert "_telemetry" not in features.columns
+    assert len(timings) == 3
+    for column in ["read_seconds", "extract_seconds", "split_seconds", "classify_seconds"]:
+        assert (timings[column] >= 0).all()
+    assert list(timings["sentences"]) == list(features["sentences_total"])
+    summary = result.stats["telemetry"]
+    assert summary["docs"] == 3
+    assert set(summary["extract_seconds"]) == {"p50", "p95", "p99", "max"}
+    assert summary["docs_per_second"] > 0
+
+
+def test_sec_stream_writes_both_stage_manifests(tmp_path: Path) -> None:
+    repo_root = Path(__file__).resolve().parents[1]
+    index_path = _write_index(tmp_path, repo_root, copies=3)
+    batch = load_settings(_write_config(tmp_path / "batch", index_path, workers=2))
+    streamed = load_settings(_write_config(tmp_path / "streamed", index_path, workers=2))
+    download_sec_filings(PipelineContext(batch), force=True)
+    compute_sec_features(PipelineContext(batch), force=True)
+
+    download, features = stream_sec_filings(PipelineContext(streamed), force=True)
+    assert download.status == "completed"
+    assert features.status == "completed"
+    pd.testing.assert_frame_equal(
+        pd.read_parquet(batch.paths.processed_dir / "sec_features.parquet"),
+        pd.read_parquet(streamed.paths.processed_dir / "sec_features.parquet"),
+    )
+    assert download_sec_filings(PipelineContext(streamed)).status == "skipped"
+    assert compute_sec_features(PipelineContext(streamed)).status == "skipped"
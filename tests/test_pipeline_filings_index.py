@@ -0,0 +1,71 @@
+import os
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from semantic_inflation.pipeline.filings_index import (
+    INDEX_COLUMNS,
+    parquet_path,
+    read_filings_index,
+    write_filings_index,
+)
+
+
+def _row(cik: str, year: int, **values: str) -> dict[str, object]:
+    row: dict[str, object] = {column: "" for column in INDEX_COLUMNS}
+    row.update(cik=cik, filing_year=year, **values)
+    return row
+
+
+def test_csv_only_index_is_typed_in_input_order(tmp_path: Path) -> None:
+    index_path = tmp_path / "filings_index.csv"
+    index_path.write_text(
+        "cik,filing_year,file_path\n"
+        "2,2011,b.html\n"
+        ",2010,ignored.html\n"
+        "0000000001,2012,\n"
+        "0000000001,2010, a.html \n",
+        encoding="utf-8",
+    )
+    index = read_filings_index(index_path)
+    # Hand-written indexes keep their row order; CIKs are padded like the builder's.
+    assert index.records(["cik", "filing_year", "file_path", "source_url"]) == [
+        {"cik": "0000000002", "filing_year": 2011, "file_path": "b.html", "source_url": None},
+        {"cik": "0000000001", "filing_year": 2012, "file_path": None, "source_url": None},
+        {"cik": "0000000001", "filing_year": 2010, "file_path": "a.html", "source_url": None},
+    ]
+    assert index.lookup("2", 2011)["file_path"] == "b.html"
+    assert index.lookup("0000000002", 2012) is None
+    assert read_filings_index(index_path) is index
+    assert not parquet_path(index_path).exists()
+
+
+def test_non_numeric_filing_year_is_rejected(tmp_path: Path) -> None:
+    index_path = tmp_path / "filings_index.csv"
+    index_path.write_text("cik,filing_year\n1,2010\n2,FY2011\n", encoding="utf-8")
+    with pytest.raises(ValueError, match="'FY2011' in filings index row 2"):
+        read_filings_index(index_path)
+
+
+def test_written_index_prefers_parquet_unless_csv_is_newer(tmp_path: Path) -> None:
+    index_path = tmp_path / "filings_index.csv"
+    rows = [
+        _row("0000000003", 2021, source_url="https://www.sec.gov/c.htm"),
+        _row("0000000001", 2020, source_url="https://www.sec.gov/a.htm", form="10-K"),
+    ]
+    table = write_filings_index(rows, index_path)
+    frame = pd.read_parquet(table)
+    assert list(frame["cik"]) == ["0000000001", "0000000003"]
+    assert frame["filing_year"].dtype == "int64"
+    assert pd.read_csv(index_path, dtype=str)["cik"].tolist() == ["0000000001", "0000000003"]
+
+    index = read_filings_index(index_path)
+    assert index.lookup("1", 2020)["form"] == "10-K"
+    assert index.project(["cik", "source_url"]).columns.tolist() == ["cik", "source_url"]
+
+    # A hand-edited export takes over from the stale table.
+    index_path.write_text("cik,filing_year\n0000000009,2019\n", encoding="utf-8")
+    stat = table.stat()
+    os.utime(index_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert [row["cik"] for row in read_filings_index(index_path).records()] == ["0000000009"]
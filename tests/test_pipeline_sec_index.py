@@ -0,0 +1,440 @@
+import csv
+import json
+from pathlib import Path
+import random
+import zipfile
+
+import pandas as pd
+import pytest
+
+from semantic_inflation.config import (
+    DictionarySettings,
+    LinkageSettings,
+    PathsSettings,
+    PipelineSecSettings,
+    PipelineSettings,
+    ProjectSettings,
+    RuntimeSettings,
+    SecSettings,
+    Settings,
+)
+from semantic_inflation.net import download as download_module
+from semantic_inflation.net.standin import StandinOptions, StandinServer
+from semantic_inflation.pipeline.context import PipelineContext
+from semantic_inflation.pipeline.filings_index import parquet_path
+from semantic_inflation.pipeline.sec_index import (
+    FilingCandidate,
+    _candidate_frame,
+    _extract_filings,
+    _page_in_range,
+    _provisional_candidates,
+    _select_filings,
+    build_sec_filings_index,
+)
+
+_CIKS = [f"{cik:010d}" for cik in range(1001, 1007)]
+
+
+def _recent(cik: str, years: list[int]) -> dict[str, list[str]]:
+    recent: dict[str, list[str]] = {
+        "accessionNumber": [],
+        "form": [],
+        "filingDate": [],
+        "reportDate": [],
+        "primaryDocument": [],
+    }
+    for offset, year in enumerate(years):
+        recent["accessionNumber"].append(f"{cik}-{year % 100:02d}-{offset:06d}")
+        recent["form"].append("10-K")
+        recent["filingDate"].append(f"{year + 1}-02-15")
+        recent["reportDate"].append(f"{year}-12-31")
+        recent["primaryDocument"].append(f"doc{year}.htm")
+    return recent
+
+
+def _write_cassette(root: Path) -> None:
+    submissions = root / "data.sec.gov" / "submissions"
+    submissions.mkdir(parents=True)
+    for cik in _CIKS:
+        recent = _recent(cik, [2020, 2021])
+        payload: dict = {"cik": cik, "name": f"Company {cik}", "filings": {"recent": recent}}
+        if cik == _CIKS[0]:
+            # One page before the project years, one overlapping them.
+            payload["filings"]["files"] = [
+                {"name": f"CIK{cik}-submissions-001.json", "filingFrom": "2002-01-01",
+                 "filingTo": "2008-12-31"},
+                {"name": f"CIK{cik}-submissions-002.json", "filingFrom": "2009-01-01",
+                 "filingTo": "2012-12-31"},
+            ]
+            for name, years in [("001", [2003, 2004]), ("002", [2011])]:
+                page = _recent(cik, years)
+                (submissions / f"CIK{cik}-submissions-{name}.json").write_text(
+                    json.dumps(page), encoding="utf-8"
+                )
+                _write_documents(root, cik, page)
+        (submissions / f"CIK{cik}.json").write_text(json.dumps(payload), encoding="utf-8")
+        _write_documents(root, cik, recent)
+
+
+def _write_documents(root: Path, cik: str, recent: dict[str, list[str]]) -> None:
+    for accession, document in zip(recent["accessionNumber"], recent["primaryDocument"]):
+        path = (
+            root / "www.sec.gov" / "Archives" / "edgar" / "data" / str(int(cik))
+            / accession.replace("-", "") / document
+        )
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("<html><body>10-K</body></html>", encoding="utf-8")
+
+
+def _settings(
+    tmp_path: Path, standin_url: str, years: tuple[int, int] = (2010, 2023), **sec_options
+) -> Settings:
+    data_dir = tmp_path / "data"
+    paths = PathsSettings(
+        data_dir=data_dir,
+        raw_dir=data_dir / "raw",
+        processed_dir=data_dir / "processed",
+        outputs_dir=tmp_path / "outputs",
+        cache_dir=data_dir / "cache",
+    )
+    return Settings(
+        project=ProjectSettings(start_year=years[0], end_year=years[1], filing_forms=["10-K"]),
+        paths=paths,
+        sec=SecSettings(user_agent="Test Runner test@example.com", max_requests_per_second=100),
+        runtime=RuntimeSettings(offline=False, http_standin_url=standin_url),
+        pipeline=PipelineSettings(
+            sec=PipelineSecSettings(
+                filings_index_path=data_dir / "raw" / "sec" / "filings_index.csv",
+                build_index=True,
+                **sec_options,
+            ),
+        ),
+        linkage=LinkageSettings(),
+        dictionaries=DictionarySettings(),
+    )
+
+
+@pytest.fixture(autouse=True)
+def _fresh_limiters(monkeypatch) -> None:
+    monkeypatch.setattr(download_module, "_LIMITERS", {})
+
+
+@pytest.fixture
+def cassette(tmp_path: Path) -> Path:
+    root = tmp_path / "cassette"
+    _write_cassette(root)
+    return root
+
+
+def _write_universe(settings: Settings) -> None:
+    universe_path = settings.paths.processed_dir / "cik_universe_ghgrp.csv"
+    universe_path.parent.mkdir(parents=True, exist_ok=True)
+    lines = ["cik,match_tier,parent_company_name_norm"]
+    lines += [f"{cik},high,COMPANY {cik}" for cik in _CIKS]
+    universe_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+def test_sec_index_fetches_submissions_concurrently(tmp_path: Path, cassette: Path) -> None:
+    # Latency above the 10 req/s spacing, so only concurrent requests overlap.
+    with StandinServer(cassette, StandinOptions(latency_seconds=0.2)) as server:
+        settings = _settings(tmp_path, server.url)
+        _write_universe(settings)
+        result = build_sec_filings_index(PipelineContext(settings), force=True)
+        stats = server.stats
+
+    assert result.status == "completed"
+    assert stats.max_in_flight > 1
+    # Submissions are downloaded; index URLs are only checked with HEAD.
+    assert stats.methods == {"GET": 7, "HEAD": result.stats["rows"]}
+    assert result.stats["url_checks"] == {"checked": 13, "reachable": 13}
+    submissions = settings.paths.raw_dir / "sec" / "submissions"
+    cached = [path.name for path in submissions.glob("CIK*.json") if ".meta" not in path.suffixes]
+    assert sorted(cached) == sorted(
+        [f"CIK{cik}.json" for cik in _CIKS] + [f"CIK{_CIKS[0]}-submissions-002.json"]
+    )
+    _assert_index(settings, result)
+
+
+def _assert_index(settings: Settings, result) -> None:
+    with settings.pipeline.sec.filings_index_path.open(encoding="utf-8") as handle:
+        rows = list(csv.DictReader(handle))
+    expected = [(_CIKS[0], "2011"), (_CIKS[0], "2020"), (_CIKS[0], "2021")]
+    expected += [(cik, str(year)) for cik in _CIKS[1:] for year in (2020, 2021)]
+    assert [(row["cik"], row["filing_year"]) for row in rows] == expected
+    assert rows[0]["company_name_sec"] == f"Company {_CIKS[0]}"
+    table = pd.read_parquet(parquet_path(settings.pipeline.sec.filings_index_path))
+    assert table["filing_year"].dtype == "int64"
+    assert list(zip(table["cik"], table["filing_year"].astype(str))) == expected
+    assert [page["name"] for page in result.stats["skipped_submission_pages"]] == [
+        f"CIK{_CIKS[0]}-submissions-001.json"
+    ]
+    assert not result.warnings
+
+
+def test_sec_index_reads_bulk_submissions_zip(tmp_path: Path, cassette: Path) -> None:
+    zip_path = tmp_path / "submissions.zip"
+    with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_DEFLATED) as archive:
+        for path in sorted((cassette / "data.sec.gov" / "submissions").iterdir()):
+            archive.write(path, path.name)
+        archive.writestr("CIK0000009999.json", json.dumps({"cik": "9999", "filings": {}}))
+
+    with StandinServer(cassette) as server:
+        settings = _settings(
+            tmp_path, server.url, index_source="bulk", submissions_zip_path=zip_path
+        )
+        _write_universe(settings)
+        result = build_sec_filings_index(PipelineContext(settings), force=True)
+        stats = server.stats
+
+    assert result.stats["index_source"] == "bulk"
+    assert result.stats["missing_submissions"] == []
+    # Only the QC sample reaches the network; no submissions requests are made.
+    assert stats.requests == result.stats["rows"]
+    assert not (settings.paths.raw_dir / "sec" / "submissions").exists()
+    _assert_index(settings, result)
+
+
+@pytest.mark.parametrize(
+    ("filing_from", "filing_to", "expected"),
+    [
+        ("2002-01-01", "2009-12-31", False),
+        ("2002-01-01", "2010-02-01", True),
+        ("2024-01-01", "2024-06-30", True),
+        ("2025-01-01", "2025-06-30", False),
+        (None, None, True),
+    ],
+)
+def test_submission_pages_are_pruned_by_year(filing_from, filing_to, expected) -> None:
+    extra = {"name": "page.json", "filingFrom": filing_from, "filingTo": filing_to}
+    assert _page_in_range(extra, 2010, 2023) is expected
+
+
+_MASTER_HEADER = """Description:           Master Index of EDGAR Dissemination Feed
+Last Data Received:    March 31, 2021
+Comments:              webmaster@sec.gov
+
+CIK|Company Name|Form Type|Date Filed|Filename
+--------------------------------------------------------------------------------
+"""
+
+
+def _index_page(cik: str, accession: str, form: str, document: str, period: str) -> str:
+    base = f"/Archives/edgar/data/{int(cik)}/{accession.replace('-', '')}"
+    return f"""<html><body>
+<div class="formGrouping"><div class="infoHead">Period of Report</div>
+<div class="info">{period}</div></div>
+<table class="tableFile" summary="Document Format Files">
+<tr><th>Seq</th><th>Description</th><th>Document</th><th>Type</th><th>Size</th></tr>
+<tr><td>1</td><td>ANNUAL REPORT</td><td><a href="/ix?doc={base}/{document}">{document}</a>
+ iXBRL</td><td>{form}</td><td>123</td></tr>
+<tr><td>2</td><td>SUBSIDIARIES</td><td><a href="{base}/ex21.htm">ex21.htm</a></td>
+<td>EX-21</td><td>12</td></tr>
+</table></body></html>"""
+
+
+def _write_full_index_cassette(root: Path) -> None:
+    archives = root / "www.sec.gov" / "Archives" / "edgar"
+    rows: dict[tuple[int, int], list[str]] = {}
+    for number, cik in enumerate(_CIKS, start=1):
+        filings = [
+            ("10-K", "2021-02-15", 2021, 1, "2020-12-31"),
+            ("10-K", "2022-02-15", 2022, 1, "2021-12-31"),
+        ]
+        if cik == _CIKS[0]:
+            filings.append(("10-K/A", "2022-05-02", 2022, 2, "2021-12-31"))
+        for seq, (form, filed, year, quarter, period) in enumerate(filings):
+            accession = f"{number:010d}-{year % 100:02d}-{seq:06d}"
+            filename = f"edgar/data/{int(cik)}/{accession}.txt"
+            rows.setdefault((year, quarter), []).append(
+                f"{int(cik)}|Company {cik}|{form}|{filed}|{filename}"
+            )
+            page = archives / "data" / str(int(cik)) / accession.replace("-", "")
+            page.mkdir(parents=True, exist_ok=True)
+            (page / f"{accession}-index.htm").write_text(
+                _index_page(cik, accession, form, f"form{period[:4]}.htm", period),
+                encoding="utf-8",
+            )
+            (page / f"form{period[:4]}.htm").write_text("<html>10-K</html>", encoding="utf-8")
+    rows.setdefault((2021, 1), []).extend(
+        [
+            f"{int(_CIKS[1])}|Company {_CIKS[1]}|8-K|2021-03-01|edgar/data/1002/x.txt",
+            "77777|Other Co|10-K|2021-03-01|edgar/data/77777/0000077777-21-000001.txt",
+        ]
+    )
+    for year in (2020, 2021, 2022):
+        for quarter in range(1, 5):
+            path = archives / "full-index" / str(year) / f"QTR{quarter}" / "master.idx"
+            path.parent.mkdir(parents=True, exist_ok=True)
+            lines = "".join(row + "\n" for row in rows.get((year, quarter), []))
+            path.write_text(_MASTER_HEADER + lines, encoding="latin-1")
+
+
+def test_sec_index_builds_from_quarterly_full_index(tmp_path: Path) -> None:
+    cassette = tmp_path / "cassette"
+    _write_full_index_cassette(cassette)
+    with StandinServer(cassette) as server:
+        settings = _settings(tmp_path, server.url, years=(2020, 2021), index_source="full-index")
+        _write_universe(settings)
+        result = build_sec_filings_index(PipelineContext(settings), force=True)
+        stats = server.stats
+
+    assert result.status == "completed"
+    assert not result.warnings
+    # 12 quarterly index files, 12 filing index pages (the amendment filed the
+    # same year as an original is not resolved), then the URL sample.
+    assert stats.requests == 12 + 12 + result.stats["rows"]
+    with settings.pipeline.sec.filings_index_path.open(encoding="utf-8") as handle:
+        rows = list(csv.DictReader(handle))
+    assert [(row["cik"], row["filing_year"], row["form"]) for row in rows] == [
+        (cik, str(year), "10-K") for cik in _CIKS for year in (2020, 2021)
+    ]
+    first = rows[0]
+    assert first["primary_document"] == "form2020.htm"
+    assert first["report_date"] == "2020-12-31"
+    assert first["source_url"] == (
+        "https://www.sec.gov/Archives/edgar/data/1001/000000000121000000/form2020.htm"
+    )
+
+
+def test_provisional_candidates_skip_amendments_of_resolved_years() -> None:
+    def _filing(cik: str, form: str, filed: str, seq: int) -> FilingCandidate:
+        return FilingCandidate(
+            cik=cik,
+            form=form,
+            filing_date=filed,
+            report_date=None,
+            accession_number=f"{cik}-{filed[2:4]}-{seq:06d}",
+            primary_document=None,
+            company_name=None,
+        )
+
+    filings = [
+        _filing(_CIKS[0], "10-K", "2021-02-15", 1),
+        _filing(_CIKS[0], "10-K/A", "2021-05-02", 2),
+        _filing(_CIKS[0], "10-K/A", "2022-05-02", 3),
+        # A changed fiscal year end: both originals are needed to place them.
+        _filing(_CIKS[1], "10-K", "2021-01-10", 4),
+        _filing(_CIKS[1], "10-K", "2021-12-20", 5),
+    ]
+    assert _provisional_candidates(filings) == [filings[i] for i in (0, 2, 3, 4)]
+    assert _provisional_candidates([]) == []
+
+
+def _reference_select(
+    candidates: list[FilingCandidate], start_year: int, end_year: int, forms: list[str]
+) -> list[FilingCandidate]:
+    # The per-object selection the vectorized version replaced.
+    allowed = {form.upper() for form in forms} | {"10-K", "10-K/A", "10-K405"}
+    grouped: dict[tuple[str, int], list[FilingCandidate]] = {}
+    for cand in candidates:
+        year = cand.filing_year()
+        if not cand.form or cand.form.upper() not in allowed or year is None:
+            continue
+        if start_year <= year <= end_year:
+            grouped.setdefault((cand.cik, year), []).append(cand)
+    selected = []
+    for group in grouped.values():
+        pool = [c for c in group if not c.is_amendment()] or group
+        selected.append(max(pool, key=lambda c: (c.filing_date or "", c.accession_number or "")))
+    return selected
+
+
+def test_vectorized_selection_matches_reference() -> None:
+    rng = random.Random(11)
+    forms = ["10-K", "10-K/A", "10-K405", "10-k", "10-Q", "8-K", "10-KT", None]
+    dates = [None, "", "n/a", "2009-12-31", "2010-03-01", "2015-06-30", "2023-12-31", "2024-02-01"]
+    for _ in range(20):
+        candidates = [
+            FilingCandidate(
+                cik=f"{rng.randint(1, 6):010d}",
+                form=rng.choice(forms),
+                filing_date=rng.choice(dates),
+                report_date=rng.choice(dates),
+                accession_number=rng.choice([None, f"0000000001-{rng.randint(0, 9):02d}-000001"]),
+                primary_document=rng.choice([None, "doc.htm"]),
+                company_name="Company",
+            )
+            for _ in range(rng.randint(0, 300))
+        ]
+        expected = _reference_select(candidates, 2010, 2023, ["10-KT"])
+        assert _select_filings(_candidate_frame(candidates), 2010, 2023, ["10-KT"]) == expected
+
+
+def test_extract_filings_reads_recent_and_page_arrays() -> None:
+    recent = _recent("0000001001", [2020, 2021])
+    main = _extract_filings({"name": "Acme", "filings": {"recent": recent}}, "0000001001")
+    page = _extract_filings(recent, "0000001001", "Acme")
+    assert main == page
+    assert main["report_date"] == ["2020-12-31", "2021-12-31"]
+    assert main["company_name"] == ["Acme", "Acme"]
+    assert not any(_extract_filings({"filings": {}}, "0000001001").values())
+
+
+def _add_filing(cassette: Path, cik: str, year: int, filed: str, seq: int) -> None:
+    path = cassette / "data.sec.gov" / "submissions" / f"CIK{cik}.json"
+    payload = json.loads(path.read_text(encoding="utf-8"))
+    recent = payload["filings"]["recent"]
+    accession = f"{cik}-{year % 100:02d}-{seq:06d}"
+    for key, value in [
+        ("accessionNumber", accession),
+        ("form", "10-K"),
+        ("filingDate", filed),
+        ("reportDate", f"{year}-12-31"),
+        ("primaryDocument", f"doc{year}-{seq}.htm"),
+    ]:
+        recent[key].insert(0, value)
+    path.write_text(json.dumps(payload), encoding="utf-8")
+    _write_documents(
+        cassette, cik, {"accessionNumber": [accession], "primaryDocument": [f"doc{year}-{seq}.htm"]}
+    )
+
+
+def test_sec_index_incremental_refresh_merges_new_filings(
+    tmp_path: Path, cassette: Path
+) -> None:
+    with StandinServer(cassette) as server:
+        settings = _settings(tmp_path, server.url, incremental=True)
+        _write_universe(settings)
+        build_sec_filings_index(PipelineContext(settings), force=True)
+        index_path = settings.pipeline.sec.filings_index_path
+        before = index_path.read_text(encoding="utf-8")
+        state = json.loads(index_path.with_name("filings_index.state.json").read_text())
+        assert state["ciks"][_CIKS[1]]["filing_date"] == "2022-02-15"
+
+        _add_filing(cassette, _CIKS[1], 2022, "2023-02-15", 7)
+        _add_filing(cassette, _CIKS[2], 2021, "2022-06-01", 8)
+        server.stats.statuses.clear()
+        result = build_sec_filings_index(PipelineContext(settings))
+        statuses = dict(server.stats.statuses)
+
+    incremental = result.stats["incremental"]
+    assert result.status == "completed"
+    assert incremental["enabled"] and incremental["refreshed_ciks"] == 2
+    assert incremental["added"] == [
+        {"cik": _CIKS[1], "filing_year": 2022, "accession_number": f"{_CIKS[1]}-22-000007"}
+    ]
+    assert [(row["cik"], row["filing_year"]) for row in incremental["changed"]] == [
+        (_CIKS[2], 2021)
+    ]
+    # Unchanged submissions (four main files and one extra page) came back as 304s.
+    assert statuses[304] == 5
+    with index_path.open(encoding="utf-8") as handle:
+        rows = list(csv.DictReader(handle))
+    old_lines = before.splitlines()
+    new_lines = index_path.read_text(encoding="utf-8").splitlines()
+    assert len(new_lines) == len(old_lines) + 1
+    # The export stays sorted by (cik, filing_year), so the new row lands after its CIK's 2021.
+    added = [line for line in new_lines if line.startswith(f"{_CIKS[1]},2022,")]
+    assert new_lines.index(added[0]) == new_lines.index(
+        next(line for line in new_lines if line.startswith(f"{_CIKS[1]},2021,"))
+    ) + 1
+    assert [line for line in new_lines if line not in old_lines] == [
+        line for line in new_lines if f"{_CIKS[2]}-21-000008" in line or line in added
+    ]
+    assert len(rows) == len(old_lines)
+
+    # incremental is a run mode: a plain run afterwards keeps the merged index.
+    settings.pipeline.sec.incremental = False
+    merged = index_path.read_text(encoding="utf-8")
+    assert build_sec_filings_index(PipelineContext(settings)).status == "skipped"
+    assert index_path.read_text(encoding="utf-8") == merged